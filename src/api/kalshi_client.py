@@ -5,44 +5,58 @@ This module provides a comprehensive interface to the Kalshi API with
 advanced features like rate limiting, caching, error handling, and retry logic.
 """
 
+import asyncio
+import hashlib
 import logging
+import random
 import time
-import json
-from typing import Dict, List, Optional, Any, Union
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Any, Tuple, Union
 from datetime import datetime, timezone, timedelta
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import aiohttp
+import ciso8601
+from cachetools import TTLCache
+import ijson
+import msgpack
+import orjson
+import redis.asyncio as aioredis
 
-from ..core.config import get_api_config
-from ..core.database import db_manager
+from ..core.config import get_api_config, get_data_config, get_redis_config
+from ..core.database import get_db_manager
 
 logger = logging.getLogger(__name__)
 
 class RateLimiter:
-    """Rate limiter for API requests"""
+    """Token-bucket rate limiter shared by all API coroutines"""
     
     def __init__(self, max_requests: int, time_window: int):
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
-        
-    def wait_if_needed(self):
-        """Wait if rate limit would be exceeded"""
-        now = time.time()
-        
-        # Remove old requests outside the time window
-        self.requests = [req_time for req_time in self.requests if now - req_time < self.time_window]
-        
-        # Check if we need to wait
-        if len(self.requests) >= self.max_requests:
-            sleep_time = self.time_window - (now - self.requests[0])
-            if sleep_time > 0:
-                logger.info(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
-                time.sleep(sleep_time)
-                
-        # Record this request
-        self.requests.append(now)
+        self.rate = max_requests / time_window
+        self.tokens = float(max_requests)
+        self.last_refill = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        
+    async def acquire(self):
+        """Take a token, waiting for one to accrue if the bucket is empty"""
+        # Created lazily so the lock belongs to the loop that uses it
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            
+        async with self._lock:
+            now = time.monotonic()
+            
+            # Refill tokens accrued since the last request
+            self.tokens = min(float(self.max_requests), self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            
+            # Reserve a token; a negative balance queues later callers behind this one
+            self.tokens -= 1
+            sleep_time = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            
+        if sleep_time > 0:
+            logger.info(f"Rate limit reached, sleeping for {sleep_time:.2f} seconds")
+            await asyncio.sleep(sleep_time)
 
 class KalshiAPIClient:
     """
@@ -53,23 +67,9 @@ class KalshiAPIClient:
         self.config = get_api_config()
         self.logger = logging.getLogger(__name__)
         
-        # Initialize session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
-        
-        # Set default headers
-        self.session.headers.update({
-            'Authorization': f'Bearer {self.config.kalshi_api_key}',
-            'Content-Type': 'application/json',
-            'User-Agent': 'KalshiTradingBot/2.0'
-        })
+        # Shared HTTP session, opened lazily on the caller's event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.max_retries = 3
         
         # Rate limiter
         self.rate_limiter = RateLimiter(
@@ -77,87 +77,304 @@ class KalshiAPIClient:
             time_window=60
         )
         
-        # Cache for market data
-        self.market_cache = {}
-        self.cache_ttl = 300  # 5 minutes
+        # Cache for market data, backed by Redis so it is shared across workers
+        data_config = get_data_config()
+        self.cache_ttl = data_config.cache_ttl_seconds
+        self._ttl_map = dict(data_config.endpoint_cache_ttl_seconds)
+        self.stale_max_seconds = 30
+        
+        # Bounded LRU; entries outlive the longest TTL by the stale window so SWR can serve them
+        max_ttl = max([self.cache_ttl, *self._ttl_map.values()])
+        self.market_cache = TTLCache(maxsize=4096, ttl=max_ttl + self.stale_max_seconds)
+        self._refreshing = set()
+        self._background_tasks = set()
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        
+        # Markets written per bulk database round trip during sync
+        self.sync_batch_size = 250
+        self.redis_config = get_redis_config()
+        self.redis: Optional[aioredis.Redis] = None
+        self._redis_retry_at = 0.0
         
         # Authentication status
         self.authenticated = False
-        self.auth_expires = None
+        self.auth_expires = None  # Wall-clock expiry, kept for status reporting
+        self._auth_deadline = 0.0
+        
+    async def connect(self):
+        """Open the shared HTTP session used for all API requests"""
+        if self._session is not None and not self._session.closed:
+            return
+            
+        self._session = aiohttp.ClientSession(
+            headers={
+                'Authorization': f'Bearer {self.config.kalshi_api_key}',
+                'Content-Type': 'application/json',
+                'Connection': 'keep-alive',
+                'User-Agent': 'KalshiTradingBot/2.0'
+            },
+            timeout=aiohttp.ClientTimeout(total=self.config.timeout_seconds),
+            connector=aiohttp.TCPConnector(
+                limit=self.config.connection_pool_size,
+                limit_per_host=self.config.connection_pool_per_host,
+                keepalive_timeout=self.config.keepalive_timeout_seconds,
+                ttl_dns_cache=300
+            )
+        )
+        
+    async def close(self):
+        """Close the shared HTTP session and Redis connection"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+        if self.redis is not None:
+            await self.redis.close()
+        self.redis = None
+        
+    @staticmethod
+    def _cache_key(endpoint: str, params: Optional[Dict]) -> bytes:
+        """Build a compact content-hash cache key for a request"""
+        digest = hashlib.blake2b(endpoint.encode(), digest_size=16)
+        if params:
+            for key in sorted(params):
+                digest.update(b'\x00' + key.encode() + b'=' + repr(params[key]).encode())
+        return b'kalshi:' + digest.digest()
+        
+    @staticmethod
+    def _retry_delay(retry_after: Optional[str], attempt: int) -> float:
+        """Seconds to wait from a Retry-After header, which may be delay-seconds or an HTTP-date"""
+        if retry_after:
+            try:
+                return max(float(retry_after), 0.0)
+            except ValueError:
+                pass
+            try:
+                return max((parsedate_to_datetime(retry_after) - datetime.now(timezone.utc)).total_seconds(), 0.0)
+            except (TypeError, ValueError):
+                pass
+        return float(2 ** attempt)
+        
+    def _ttl_for(self, endpoint: str) -> int:
+        """Resolve the cache TTL for an endpoint class; 0 disables caching"""
+        path = endpoint.rstrip('/')
+        if path.startswith('/portfolio'):
+            endpoint_class = 'portfolio'
+        elif path.endswith('/orderbook'):
+            endpoint_class = 'orderbook'
+        elif path.endswith('/history'):
+            endpoint_class = 'history'
+        elif path == '/markets':
+            endpoint_class = 'markets'
+        elif path.startswith('/markets/'):
+            endpoint_class = 'market'
+        else:
+            return self.cache_ttl
+            
+        return self._ttl_map.get(endpoint_class, self.cache_ttl)
+        
+    def _get_redis(self) -> Optional[aioredis.Redis]:
+        """Return the Redis client, or None while Redis is unavailable"""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+            
+        if self.redis is None:
+            self.redis = aioredis.Redis(
+                host=self.redis_config.host,
+                port=self.redis_config.port,
+                db=self.redis_config.db,
+                password=self.redis_config.password,
+                socket_timeout=self.redis_config.socket_timeout
+            )
+        return self.redis
+        
+    def _redis_failed(self, e: Exception):
+        """Back off from Redis for a minute after a connection error"""
+        self.logger.warning(f"Redis cache unavailable, using local cache only: {e}")
+        self._redis_retry_at = time.monotonic() + 60
+        
+    async def _cache_get(self, cache_key: bytes, ttl: int) -> Optional[Tuple[Dict, float]]:
+        """Look up a cached response and its age, locally then in Redis"""
+        entry = self.market_cache.get(cache_key)
+        if entry is not None and time.time() - entry[1] < ttl:
+            return entry[0], time.time() - entry[1]
+            
+        client = self._get_redis()
+        if client is not None:
+            try:
+                packed = await client.get(cache_key)
+            except aioredis.RedisError as e:
+                self._redis_failed(e)
+                packed = None
+                
+            if packed is not None:
+                result, timestamp = msgpack.unpackb(packed)
+                if entry is None or timestamp > entry[1]:
+                    entry = (result, timestamp)
+                    self.market_cache[cache_key] = entry
+                    
+        if entry is None:
+            return None
+            
+        return entry[0], time.time() - entry[1]
         
-    def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
-                     data: Optional[Dict] = None, use_cache: bool = True) -> Optional[Dict]:
+    async def _cache_set(self, cache_key: bytes, result: Dict, ttl: int):
+        """Store a response locally and in Redis, keeping it through the stale window"""
+        timestamp = time.time()
+        self.market_cache[cache_key] = (result, timestamp)
+        
+        client = self._get_redis()
+        if client is None:
+            return
+            
+        try:
+            await client.set(cache_key, msgpack.packb([result, timestamp]), ex=ttl + self._stale_window(ttl))
+        except aioredis.RedisError as e:
+            self._redis_failed(e)
+            
+    def _stale_window(self, ttl: int) -> int:
+        """How long past its TTL an entry may still be served while refreshing"""
+        return min(ttl, self.stale_max_seconds)
+        
+    def _schedule_refresh(self, cache_key: bytes, endpoint: str, params: Optional[Dict], ttl: int):
+        """Refresh a stale cache entry in the background, once per key"""
+        if cache_key in self._refreshing:
+            return
+            
+        self._refreshing.add(cache_key)
+        task = asyncio.create_task(self._refresh(cache_key, endpoint, params, ttl))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        
+    async def _refresh(self, cache_key: bytes, endpoint: str, params: Optional[Dict], ttl: int):
+        """Refetch a cached GET response and store it"""
+        try:
+            result = await self._fetch_shared(cache_key, endpoint, params)
+            if result is not None:
+                await self._cache_set(cache_key, result, ttl)
+        finally:
+            self._refreshing.discard(cache_key)
+            
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict] = None, 
+                            data: Optional[Dict] = None, use_cache: bool = True,
+                            authenticate: bool = True) -> Optional[Dict]:
         """
-        Make authenticated API request with rate limiting and error handling.
+        Make authenticated API request with caching, rate limiting and error handling.
+        
+        Cached GET responses past their TTL are served stale for a short window
+        while a background task revalidates them.
         """
-        # Check cache first for GET requests
-        if method.upper() == 'GET' and use_cache:
-            cache_key = f"{endpoint}_{json.dumps(params or {}, sort_keys=True)}"
-            if cache_key in self.market_cache:
-                cached_data, timestamp = self.market_cache[cache_key]
-                if time.time() - timestamp < self.cache_ttl:
+        # Writes skip key hashing and TTL resolution entirely
+        if method.upper() != 'GET':
+            return await self._fetch(method, endpoint, params, data, authenticate)
+            
+        # Key computed once and reused for lookup, single-flight, refresh and store
+        cache_key = self._cache_key(endpoint, params)
+        ttl = self._ttl_for(endpoint) if use_cache else 0
+        use_cache = ttl > 0
+        
+        # Check cache first
+        if use_cache:
+            cached = await self._cache_get(cache_key, ttl)
+            if cached is not None:
+                cached_data, age = cached
+                if age < ttl:
+                    return cached_data
+                if age < ttl + self._stale_window(ttl):
+                    self._schedule_refresh(cache_key, endpoint, params, ttl)
                     return cached_data
                     
+        result = await self._fetch_shared(cache_key, endpoint, params, authenticate)
+        
+        # Cache GET requests
+        if use_cache and result is not None:
+            await self._cache_set(cache_key, result, ttl)
+            
+        return result
+        
+    async def _fetch_shared(self, cache_key: bytes, endpoint: str, params: Optional[Dict] = None,
+                            authenticate: bool = True) -> Optional[Dict]:
+        """Fetch a GET response, sharing a single in-flight request per key"""
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+            
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        result = None
+        try:
+            result = await self._fetch('GET', endpoint, params, authenticate=authenticate)
+            return result
+        finally:
+            del self._inflight[cache_key]
+            if not future.done():
+                future.set_result(result)
+                
+    async def _fetch(self, method: str, endpoint: str, params: Optional[Dict] = None,
+                     data: Optional[Dict] = None, authenticate: bool = True) -> Optional[Dict]:
+        """Send a request to the API, bypassing the cache"""
         # Apply rate limiting
-        self.rate_limiter.wait_if_needed()
+        await self.rate_limiter.acquire()
         
         # Ensure authentication
-        if not self._ensure_authenticated():
+        if authenticate and not await self._ensure_authenticated():
             self.logger.error("Failed to authenticate with Kalshi API")
             return None
             
+        await self.connect()
         url = f"{self.config.kalshi_api_url.rstrip('/')}/{endpoint.lstrip('/')}"
         
+        # Server errors are only retried for idempotent methods so orders are never resent
+        retry_statuses = {429} if method.upper() == 'POST' else {429, 500, 502, 503, 504}
+        
         try:
-            response = self.session.request(
-                method=method,
-                url=url,
-                params=params,
-                json=data,
-                timeout=self.config.timeout_seconds
-            )
-            
-            # Handle rate limiting
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 60))
-                self.logger.warning(f"Rate limited, waiting {retry_after} seconds")
-                time.sleep(retry_after)
-                return self._make_request(method, endpoint, params, data, use_cache)
-                
-            response.raise_for_status()
-            result = response.json()
-            
-            # Cache GET requests
-            if method.upper() == 'GET' and use_cache:
-                cache_key = f"{endpoint}_{json.dumps(params or {}, sort_keys=True)}"
-                self.market_cache[cache_key] = (result, time.time())
-                
-            return result
-            
-        except requests.exceptions.RequestException as e:
+            for attempt in range(self.max_retries + 1):
+                async with self._session.request(
+                    method,
+                    url,
+                    params=params,
+                    json=data
+                ) as response:
+                    
+                    # Back off on rate limiting and transient server errors
+                    if response.status in retry_statuses and attempt < self.max_retries:
+                        # Jitter desynchronises coroutines that were throttled together
+                        delay = min(self._retry_delay(response.headers.get('Retry-After'), attempt), 30)
+                        delay = random.uniform(delay, delay * 1.5)
+                        self.logger.warning(
+                            f"Request {method} {url} returned {response.status}, retrying in {delay:.1f} seconds"
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                        
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+                    
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             self.logger.error(f"API request failed: {method} {url} - {e}")
             return None
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             self.logger.error(f"Failed to decode API response: {e}")
             return None
             
-    def _ensure_authenticated(self) -> bool:
+    async def _ensure_authenticated(self) -> bool:
         """Ensure API authentication is valid"""
-        if self.authenticated and self.auth_expires and datetime.now(timezone.utc) < self.auth_expires:
+        if self.authenticated and time.monotonic() < self._auth_deadline:
             return True
             
-        return self._authenticate()
+        return await self._authenticate()
         
-    def _authenticate(self) -> bool:
+    async def _authenticate(self) -> bool:
         """Authenticate with Kalshi API"""
         try:
             # For Kalshi API, authentication is typically done via API key in headers
             # Test authentication by making a simple request
-            response = self._make_request('GET', '/markets', use_cache=False)
+            response = await self._fetch('GET', '/markets', authenticate=False)
             
             if response is not None:
                 self.authenticated = True
-                self.auth_expires = datetime.now(timezone.utc) + timedelta(hours=1)
+                self._auth_deadline = time.monotonic() + 3600
+                self.auth_expires = datetime.now(timezone.utc) + timedelta(seconds=3600)
                 self.logger.info("Successfully authenticated with Kalshi API")
                 return True
             else:
@@ -168,7 +385,7 @@ class KalshiAPIClient:
             self.logger.error(f"Authentication error: {e}")
             return False
             
-    def get_markets(self, status: Optional[str] = None, category: Optional[str] = None,
+    async def get_markets(self, status: Optional[str] = None, category: Optional[str] = None,
                    limit: int = 100, cursor: Optional[str] = None) -> Optional[Dict]:
         """
         Get list of markets with optional filtering.
@@ -190,9 +407,9 @@ class KalshiAPIClient:
         if cursor:
             params['cursor'] = cursor
             
-        return self._make_request('GET', '/markets', params=params)
+        return await self._make_request('GET', '/markets', params=params)
         
-    def get_market(self, market_id: str) -> Optional[Dict]:
+    async def get_market(self, market_id: str) -> Optional[Dict]:
         """
         Get detailed information about a specific market.
         
@@ -202,9 +419,9 @@ class KalshiAPIClient:
         Returns:
             Dictionary containing market data
         """
-        return self._make_request('GET', f'/markets/{market_id}')
+        return await self._make_request('GET', f'/markets/{market_id}')
         
-    def get_market_orderbook(self, market_id: str, depth: int = 10) -> Optional[Dict]:
+    async def get_market_orderbook(self, market_id: str, depth: int = 10) -> Optional[Dict]:
         """
         Get market orderbook data.
         
@@ -216,9 +433,9 @@ class KalshiAPIClient:
             Dictionary containing orderbook data
         """
         params = {'depth': depth}
-        return self._make_request('GET', f'/markets/{market_id}/orderbook', params=params)
+        return await self._make_request('GET', f'/markets/{market_id}/orderbook', params=params)
         
-    def get_market_history(self, market_id: str, start_ts: Optional[int] = None,
+    async def get_market_history(self, market_id: str, start_ts: Optional[int] = None,
                           end_ts: Optional[int] = None, limit: int = 100) -> Optional[Dict]:
         """
         Get market price history.
@@ -238,18 +455,18 @@ class KalshiAPIClient:
         if end_ts:
             params['end_ts'] = end_ts
             
-        return self._make_request('GET', f'/markets/{market_id}/history', params=params)
+        return await self._make_request('GET', f'/markets/{market_id}/history', params=params)
         
-    def get_portfolio(self) -> Optional[Dict]:
+    async def get_portfolio(self) -> Optional[Dict]:
         """
         Get current portfolio information.
         
         Returns:
             Dictionary containing portfolio data
         """
-        return self._make_request('GET', '/portfolio')
+        return await self._make_request('GET', '/portfolio')
         
-    def get_positions(self, market_id: Optional[str] = None) -> Optional[Dict]:
+    async def get_positions(self, market_id: Optional[str] = None) -> Optional[Dict]:
         """
         Get current positions.
         
@@ -263,9 +480,9 @@ class KalshiAPIClient:
         if market_id:
             params['market_id'] = market_id
             
-        return self._make_request('GET', '/portfolio/positions', params=params)
+        return await self._make_request('GET', '/portfolio/positions', params=params)
         
-    def get_orders(self, market_id: Optional[str] = None, status: Optional[str] = None) -> Optional[Dict]:
+    async def get_orders(self, market_id: Optional[str] = None, status: Optional[str] = None) -> Optional[Dict]:
         """
         Get order history.
         
@@ -282,9 +499,9 @@ class KalshiAPIClient:
         if status:
             params['status'] = status
             
-        return self._make_request('GET', '/portfolio/orders', params=params)
+        return await self._make_request('GET', '/portfolio/orders', params=params)
         
-    def place_order(self, market_id: str, side: str, quantity: int, 
+    async def place_order(self, market_id: str, side: str, quantity: int, 
                    price: Optional[float] = None, order_type: str = 'market') -> Optional[Dict]:
         """
         Place a trading order.
@@ -309,9 +526,9 @@ class KalshiAPIClient:
         if order_type == 'limit' and price is not None:
             order_data['price'] = price
             
-        return self._make_request('POST', '/portfolio/orders', data=order_data, use_cache=False)
+        return await self._make_request('POST', '/portfolio/orders', data=order_data, use_cache=False)
         
-    def cancel_order(self, order_id: str) -> Optional[Dict]:
+    async def cancel_order(self, order_id: str) -> Optional[Dict]:
         """
         Cancel an existing order.
         
@@ -321,18 +538,18 @@ class KalshiAPIClient:
         Returns:
             Dictionary containing cancellation confirmation
         """
-        return self._make_request('DELETE', f'/portfolio/orders/{order_id}', use_cache=False)
+        return await self._make_request('DELETE', f'/portfolio/orders/{order_id}', use_cache=False)
         
-    def get_balance(self) -> Optional[Dict]:
+    async def get_balance(self) -> Optional[Dict]:
         """
         Get account balance information.
         
         Returns:
             Dictionary containing balance data
         """
-        return self._make_request('GET', '/portfolio/balance')
+        return await self._make_request('GET', '/portfolio/balance')
         
-    def get_fills(self, market_id: Optional[str] = None, limit: int = 100) -> Optional[Dict]:
+    async def get_fills(self, market_id: Optional[str] = None, limit: int = 100) -> Optional[Dict]:
         """
         Get trade fills (executed orders).
         
@@ -347,9 +564,9 @@ class KalshiAPIClient:
         if market_id:
             params['market_id'] = market_id
             
-        return self._make_request('GET', '/portfolio/fills', params=params)
+        return await self._make_request('GET', '/portfolio/fills', params=params)
         
-    def sync_market_data(self) -> bool:
+    async def sync_market_data(self) -> bool:
         """
         Synchronize market data with local database.
         
@@ -359,48 +576,23 @@ class KalshiAPIClient:
         try:
             self.logger.info("Starting market data synchronization")
             
-            # Get all active markets
-            markets_response = self.get_markets(status='active', limit=1000)
-            if not markets_response or 'markets' not in markets_response:
+            # Stream active markets to a batch writer so DB upserts overlap the download
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.sync_batch_size * 4)
+            writer = asyncio.create_task(self._write_market_batches(queue))
+            market_count = 0
+            try:
+                async for market_data in self._stream_markets({'status': 'active', 'limit': 1000}):
+                    await queue.put(market_data)
+                    market_count += 1
+            finally:
+                await queue.put(None)
+                await writer
+                
+            if market_count == 0:
                 self.logger.error("Failed to fetch markets data")
                 return False
                 
-            markets = markets_response['markets']
-            self.logger.info(f"Fetched {len(markets)} active markets")
-            
-            # Update database
-            for market_data in markets:
-                try:
-                    # Convert API response to database format
-                    db_market_data = {
-                        'id': market_data['id'],
-                        'title': market_data['title'],
-                        'subtitle': market_data.get('subtitle'),
-                        'category': market_data.get('category'),
-                        'status': market_data.get('status'),
-                        'yes_price': market_data.get('yes_price'),
-                        'no_price': market_data.get('no_price'),
-                        'volume': market_data.get('volume'),
-                        'open_interest': market_data.get('open_interest'),
-                        'close_date': datetime.fromisoformat(market_data['close_date'].replace('Z', '+00:00')) if market_data.get('close_date') else None
-                    }
-                    
-                    # Update market in database
-                    db_manager.update_market(db_market_data)
-                    
-                    # Record price history
-                    if db_market_data['yes_price'] is not None and db_market_data['no_price'] is not None:
-                        db_manager.record_price_history(
-                            market_data['id'],
-                            db_market_data['yes_price'],
-                            db_market_data['no_price'],
-                            db_market_data.get('volume')
-                        )
-                        
-                except Exception as e:
-                    self.logger.error(f"Error updating market {market_data.get('id', 'unknown')}: {e}")
-                    continue
-                    
+            self.logger.info(f"Fetched {market_count} active markets")
             self.logger.info("Market data synchronization completed successfully")
             return True
             
@@ -408,7 +600,76 @@ class KalshiAPIClient:
             self.logger.error(f"Market data synchronization failed: {e}")
             return False
             
-    def sync_portfolio_data(self) -> bool:
+    async def _stream_markets(self, params: Dict):
+        """Yield markets from a /markets listing as they are decoded off the wire"""
+        await self.rate_limiter.acquire()
+        
+        if not await self._ensure_authenticated():
+            raise aiohttp.ClientError("Failed to authenticate with Kalshi API")
+            
+        await self.connect()
+        url = f"{self.config.kalshi_api_url.rstrip('/')}/markets"
+        
+        async with self._session.get(url, params=params) as response:
+            response.raise_for_status()
+            async for market_data in ijson.items_async(response.content, 'markets.item', use_float=True):
+                yield market_data
+                
+    async def _write_market_batches(self, queue: asyncio.Queue):
+        """Consume streamed markets and persist them in bulk batches until a None sentinel"""
+        loop = asyncio.get_running_loop()
+        market_rows = []
+        price_rows = []
+        
+        while True:
+            market_data = await queue.get()
+            
+            if market_data is not None:
+                try:
+                    db_market_data = self._to_db_market(market_data)
+                except Exception as e:
+                    self.logger.error(f"Error converting market {market_data.get('id', 'unknown')}: {e}")
+                    continue
+                    
+                market_rows.append(db_market_data)
+                if db_market_data['yes_price'] is not None and db_market_data['no_price'] is not None:
+                    price_rows.append({
+                        'market_id': db_market_data['id'],
+                        'yes_price': db_market_data['yes_price'],
+                        'no_price': db_market_data['no_price'],
+                        'volume': db_market_data['volume']
+                    })
+                    
+            # Run the blocking bulk writes off the event loop; prices reference markets
+            if market_rows and (market_data is None or len(market_rows) >= self.sync_batch_size):
+                try:
+                    await loop.run_in_executor(None, get_db_manager().bulk_upsert_markets, market_rows)
+                    await loop.run_in_executor(None, get_db_manager().record_price_history_bulk, price_rows)
+                except Exception as e:
+                    self.logger.error(f"Error writing batch of {len(market_rows)} markets: {e}")
+                market_rows = []
+                price_rows = []
+                
+            if market_data is None:
+                return
+                
+    def _to_db_market(self, market_data: Dict) -> Dict[str, Any]:
+        """Convert an API market record to database format"""
+        close_date = market_data.get('close_date')
+        return {
+            'id': market_data['id'],
+            'title': market_data['title'],
+            'subtitle': market_data.get('subtitle'),
+            'category': market_data.get('category'),
+            'status': market_data.get('status'),
+            'yes_price': market_data.get('yes_price'),
+            'no_price': market_data.get('no_price'),
+            'volume': market_data.get('volume'),
+            'open_interest': market_data.get('open_interest'),
+            'close_date': ciso8601.parse_datetime(close_date) if close_date else None
+        }
+        
+    async def sync_portfolio_data(self) -> bool:
         """
         Synchronize portfolio data with local database.
         
@@ -419,11 +680,11 @@ class KalshiAPIClient:
             self.logger.info("Starting portfolio data synchronization")
             
             # Get current positions
-            positions_response = self.get_positions()
+            positions_response = await self.get_positions()
             if positions_response and 'positions' in positions_response:
                 for position_data in positions_response['positions']:
                     try:
-                        db_manager.update_position(
+                        get_db_manager().update_position(
                             position_data['market_id'],
                             position_data['quantity'],
                             position_data['average_price']
@@ -432,27 +693,30 @@ class KalshiAPIClient:
                         self.logger.error(f"Error updating position: {e}")
                         
             # Get recent fills and record as trades
-            fills_response = self.get_fills(limit=100)
+            fills_response = await self.get_fills(limit=100)
             if fills_response and 'fills' in fills_response:
+                trade_rows = []
                 for fill_data in fills_response['fills']:
                     try:
-                        trade_data = {
+                        trade_rows.append({
                             'market_id': fill_data['market_id'],
                             'strategy_name': 'Manual',  # Assume manual trades for API fills
                             'action': 'buy' if fill_data['side'] == 'yes' else 'sell',
                             'quantity': fill_data['quantity'],
                             'price': fill_data['price'],
                             'total_cost': fill_data['quantity'] * fill_data['price'],
-                            'executed_at': datetime.fromisoformat(fill_data['created_at'].replace('Z', '+00:00'))
-                        }
-                        
-                        # Check if trade already exists (simple duplicate prevention)
-                        # In a production system, you'd want more sophisticated duplicate detection
-                        db_manager.record_trade(trade_data)
-                        
+                            'executed_at': ciso8601.parse_datetime(fill_data['created_at'])
+                        })
                     except Exception as e:
                         self.logger.error(f"Error recording trade: {e}")
                         
+                # Check if trade already exists (simple duplicate prevention)
+                # In a production system, you'd want more sophisticated duplicate detection
+                try:
+                    await asyncio.get_running_loop().run_in_executor(None, get_db_manager().record_trades_bulk, trade_rows)
+                except Exception as e:
+                    self.logger.error(f"Error recording trades: {e}")
+                    
             self.logger.info("Portfolio data synchronization completed successfully")
             return True
             
@@ -476,7 +740,7 @@ class KalshiAPIClient:
             'authenticated': self.authenticated,
             'auth_expires': self.auth_expires.isoformat() if self.auth_expires else None,
             'cache_size': len(self.market_cache),
-            'rate_limit_requests': len(self.rate_limiter.requests),
+            'rate_limit_tokens': round(self.rate_limiter.tokens, 2),
             'api_url': self.config.kalshi_api_url
         }
 
@@ -484,21 +748,23 @@ class KalshiAPIClient:
 kalshi_client = KalshiAPIClient()
 
 # Convenience functions
-def get_markets(**kwargs) -> Optional[Dict]:
+async def get_markets(**kwargs) -> Optional[Dict]:
     """Get markets data"""
-    return kalshi_client.get_markets(**kwargs)
+    return await kalshi_client.get_markets(**kwargs)
 
-def get_market(market_id: str) -> Optional[Dict]:
+async def get_market(market_id: str) -> Optional[Dict]:
     """Get specific market data"""
-    return kalshi_client.get_market(market_id)
+    return await kalshi_client.get_market(market_id)
 
-def place_order(market_id: str, side: str, quantity: int, **kwargs) -> Optional[Dict]:
+async def place_order(market_id: str, side: str, quantity: int, **kwargs) -> Optional[Dict]:
     """Place trading order"""
-    return kalshi_client.place_order(market_id, side, quantity, **kwargs)
+    return await kalshi_client.place_order(market_id, side, quantity, **kwargs)
 
-def sync_data() -> bool:
+async def sync_data() -> bool:
     """Synchronize all data"""
-    market_sync = kalshi_client.sync_market_data()
-    portfolio_sync = kalshi_client.sync_portfolio_data()
+    market_sync, portfolio_sync = await asyncio.gather(
+        kalshi_client.sync_market_data(),
+        kalshi_client.sync_portfolio_data()
+    )
     return market_sync and portfolio_sync
 
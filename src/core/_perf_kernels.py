@@ -0,0 +1,91 @@
+"""
+Numba-compiled numeric kernels for Enhanced Kalshi Trading Bot
+
+Hot reductions that would otherwise walk Python lists several times are
+compiled to native code here. Kernels use cache=True so the compile cost is
+paid once and later processes load the artifact from disk.
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit
+
+@njit(cache=True, fastmath=True)
+def summarize(pnls: np.ndarray) -> Tuple[float, float, float, float, float, int]:
+    """Return (total, min, max, mean, population variance, positive count) in one pass"""
+    n = pnls.shape[0]
+    if n == 0:
+        return 0.0, 0.0, 0.0, 0.0, 0.0, 0
+        
+    total = 0.0
+    mn = pnls[0]
+    mx = pnls[0]
+    mean = 0.0
+    m2 = 0.0
+    pos_count = 0
+    
+    for i in range(n):
+        x = pnls[i]
+        total += x
+        if x < mn:
+            mn = x
+        if x > mx:
+            mx = x
+        if x > 0.0:
+            pos_count += 1
+            
+        # Welford update keeps the variance numerically stable in a single pass
+        delta = x - mean
+        mean += delta / (i + 1)
+        m2 += delta * (x - mean)
+        
+    return total, mn, mx, mean, m2 / n, pos_count
+
+@njit(cache=True)
+def risk_stats(pnls: np.ndarray, bankroll_inv: float, var_confidence: float) -> Tuple[float, float, float, float, float]:
+    """Return (VaR, expected shortfall, Sharpe ratio, P&L volatility, max drawdown) from newest-first daily P&L"""
+    n = pnls.shape[0]
+    
+    mean = 0.0
+    m2 = 0.0
+    cumulative = 0.0
+    peak = 0.0
+    max_drawdown = 0.0
+    
+    # Walk oldest to newest so the running peak follows the equity curve
+    for step in range(n):
+        x = pnls[n - 1 - step]
+        
+        # Welford update on bankroll-relative returns
+        r = x * bankroll_inv
+        delta = r - mean
+        mean += delta / (step + 1)
+        m2 += delta * (r - mean)
+        
+        cumulative += x
+        if step == 0 or cumulative > peak:
+            peak = cumulative
+        if peak - cumulative > max_drawdown:
+            max_drawdown = peak - cumulative
+            
+    std = np.sqrt(m2 / n) if n > 0 else 0.0
+    volatility = std if n >= 5 else 0.0
+    
+    # Annualized Sharpe ratio (risk-free rate = 0, 252 trading days)
+    sharpe_ratio = 0.0
+    if n >= 10 and std != 0.0:
+        sharpe_ratio = mean / std * np.sqrt(252.0)
+        
+    var = 0.0
+    expected_shortfall = 0.0
+    if n >= 10:
+        # VaR is the k-th order statistic; quickselect finds it without a full sort
+        k = int((1.0 - var_confidence) * n)
+        partitioned = np.partition(pnls, k)
+        var = partitioned[k]
+        
+        # Expected shortfall: average of the k + 1 worst days, which quickselect leaves in front
+        expected_shortfall = partitioned[:k + 1].mean()
+            
+    return abs(var), abs(expected_shortfall), sharpe_ratio, volatility, max_drawdown * bankroll_inv
@@ -0,0 +1,34 @@
+"""
+Numba kernel warmup for Enhanced Kalshi Trading Bot
+
+Compiles every registered kernel with tiny dummy inputs at startup so the
+first live trading cycle never pays JIT compile latency. Kernels are built
+with cache=True, so later runs load them from the on-disk cache instead.
+"""
+
+import logging
+import time
+
+import numpy as np
+
+from ._perf_kernels import risk_stats, summarize
+
+logger = logging.getLogger(__name__)
+
+# Compiled kernels paired with dummy arguments matching their live signatures
+KERNELS = [
+    (summarize, (np.zeros(4, dtype=np.float64),)),
+    (risk_stats, (np.zeros(4, dtype=np.float64), 1.0, 0.95)),
+]
+
+def warmup():
+    """Compile or load every registered kernel"""
+    start = time.perf_counter()
+    
+    for kernel, args in KERNELS:
+        try:
+            kernel(*args)
+        except Exception as e:
+            logger.error(f"Error warming up kernel {kernel.__name__}: {e}")
+            
+    logger.info(f"Warmed {len(KERNELS)} numba kernels in {time.perf_counter() - start:.2f}s")
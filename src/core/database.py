@@ -5,33 +5,58 @@ This module provides comprehensive database management with SQLAlchemy ORM,
 connection pooling, migrations, and data models.
 """
 
+import io
 import logging
-from datetime import datetime, timezone
-from typing import Optional, List, Dict, Any
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import contextmanager
+from cachetools import TTLCache
+import numpy as np
+import orjson
+import redis
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Float, DateTime, 
-    Boolean, Text, JSON, ForeignKey, Index, UniqueConstraint
+    create_engine, Column, Integer, String, Float, Numeric, DateTime, 
+    Boolean, Text, ForeignKey, Index, UniqueConstraint, DDL, bindparam, case, delete, event, func,
+    insert, literal_column, select, text, update
 )
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship, Session
-from sqlalchemy.pool import QueuePool
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import sessionmaker, relationship, selectinload, Session
+from sqlalchemy.pool import NullPool, QueuePool
+from sqlalchemy.dialects.postgresql import JSONB, UUID, insert as pg_insert
 import uuid
 
-from .config import get_database_config
+from .config import get_database_config, get_redis_config
 
 logger = logging.getLogger(__name__)
 
 # Database base class
 Base = declarative_base()
 
+# Kalshi tickers are ~20 characters; multivariate event tickers run longer
+MARKET_ID_LENGTH = 64
+
+# Exact fixed-point storage for money, still read back as Python floats
+Money = Numeric(14, 4, asdecimal=False)
+
+# Exact storage for 0-1 contract prices; cent and sub-cent ticks round-trip without float error
+Price = Numeric(6, 4, asdecimal=False)
+
+# Columnar performance history row, as returned by get_performance_history_np
+PERFORMANCE_HISTORY_DTYPE = np.dtype([('date', 'datetime64[s]'), ('daily_pnl', 'f8'), ('total_pnl', 'f8')])
+
+# Reference points for exact datetime <-> integer epoch-nanosecond conversion
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
 class Market(Base):
     """Market data model"""
     __tablename__ = 'markets'
     
-    id = Column(String, primary_key=True)
+    id = Column(String(MARKET_ID_LENGTH), primary_key=True)
     title = Column(String, nullable=False)
     subtitle = Column(String)
     category = Column(String)
@@ -41,8 +66,8 @@ class Market(Base):
     volume = Column(Float)
     open_interest = Column(Float)
     close_date = Column(DateTime(timezone=True))
-    created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())  # Maintained by trigger
     
     # Relationships
     trades = relationship("Trade", back_populates="market")
@@ -59,22 +84,25 @@ class Trade(Base):
     __tablename__ = 'trades'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    market_id = Column(String, ForeignKey('markets.id'), nullable=False)
+    market_id = Column(String(MARKET_ID_LENGTH), ForeignKey('markets.id'), nullable=False)
     strategy_name = Column(String, nullable=False)
     action = Column(String, nullable=False)  # 'buy' or 'sell'
     quantity = Column(Integer, nullable=False)
-    price = Column(Float, nullable=False)
-    total_cost = Column(Float, nullable=False)
+    price = Column(Money, nullable=False)
+    total_cost = Column(Money, nullable=False)
     confidence_score = Column(Float)
-    executed_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    executed_at = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     
     # Relationships
     market = relationship("Market", back_populates="trades")
     
+    # Range-partitioned by month; the partition key must be part of the primary key
     __table_args__ = (
         Index('idx_trade_market_id', 'market_id'),
         Index('idx_trade_strategy', 'strategy_name'),
-        Index('idx_trade_executed_at', 'executed_at'),
+        Index('brin_trade_executed_at', 'executed_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        {'postgresql_partition_by': 'RANGE (executed_at)'},
     )
 
 class Position(Base):
@@ -82,20 +110,19 @@ class Position(Base):
     __tablename__ = 'positions'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    market_id = Column(String, ForeignKey('markets.id'), nullable=False)
+    market_id = Column(String(MARKET_ID_LENGTH), ForeignKey('markets.id'), nullable=False)
     quantity = Column(Integer, nullable=False)
-    average_price = Column(Float, nullable=False)
-    current_value = Column(Float)
-    unrealized_pnl = Column(Float)
-    opened_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    average_price = Column(Money, nullable=False)
+    current_value = Column(Money)
+    unrealized_pnl = Column(Money)
+    opened_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())  # Maintained by trigger
     
     # Relationships
     market = relationship("Market")
     
     __table_args__ = (
         UniqueConstraint('market_id', name='uq_position_market'),
-        Index('idx_position_market_id', 'market_id'),
     )
 
 class PriceHistory(Base):
@@ -103,19 +130,57 @@ class PriceHistory(Base):
     __tablename__ = 'price_history'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    market_id = Column(String, ForeignKey('markets.id'), nullable=False)
-    yes_price = Column(Float, nullable=False)
-    no_price = Column(Float, nullable=False)
+    market_id = Column(String(MARKET_ID_LENGTH), ForeignKey('markets.id'), nullable=False)
+    yes_price = Column(Price, nullable=False)
+    no_price = Column(Price, nullable=False)
     volume = Column(Float)
-    timestamp = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    timestamp = Column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     
     # Relationships
     market = relationship("Market", back_populates="price_history")
     
+    # Range-partitioned by month; the partition key must be part of the primary key
     __table_args__ = (
-        Index('idx_price_history_market_timestamp', 'market_id', 'timestamp'),
+        Index('idx_price_history_market_timestamp', market_id, timestamp.desc()),
+        Index('brin_price_history_ts', 'timestamp', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
+        {'postgresql_partition_by': 'RANGE (timestamp)'},
+    )
+
+# Catch-all partitions so inserts never fail before monthly partitions exist
+for _partitioned_table in (Trade.__table__, PriceHistory.__table__):
+    event.listen(
+        _partitioned_table,
+        'after_create',
+        DDL(f"CREATE TABLE IF NOT EXISTS {_partitioned_table.name}_default "
+            f"PARTITION OF {_partitioned_table.name} DEFAULT")
+    )
+
+# Bump updated_at only when an UPDATE actually changes the row, so no-op writes stay cheap
+_bump_updated_at_function = DDL("""
+CREATE OR REPLACE FUNCTION bump_updated_at() RETURNS trigger AS $$
+BEGIN
+    IF ROW(NEW.*) IS DISTINCT FROM ROW(OLD.*) THEN
+        NEW.updated_at := NOW();
+    END IF;
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql
+""")
+
+for _tracked_table in (Market.__table__, Position.__table__):
+    event.listen(_tracked_table, 'after_create', _bump_updated_at_function)
+    event.listen(
+        _tracked_table,
+        'after_create',
+        DDL(f"CREATE TRIGGER {_tracked_table.name}_bump_updated_at BEFORE UPDATE ON {_tracked_table.name} "
+            f"FOR EACH ROW EXECUTE FUNCTION bump_updated_at()")
     )
 
+def _news_document(title, content):
+    """Full-text search document for an article; the index and queries must build the identical expression"""
+    return func.to_tsvector(literal_column("'english'::regconfig"), title + ' ' + func.coalesce(content, ''))
+
 class NewsArticle(Base):
     """News article model for sentiment analysis"""
     __tablename__ = 'news_articles'
@@ -127,14 +192,20 @@ class NewsArticle(Base):
     url = Column(String)
     published_at = Column(DateTime(timezone=True))
     sentiment_score = Column(Float)
+    sentiment_confidence = Column(Float)
+    analyzed_at = Column(DateTime(timezone=True))
     relevance_score = Column(Float)
-    keywords = Column(JSON)
-    processed_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    keywords = Column(JSONB)
+    processed_at = Column(DateTime(timezone=True), server_default=func.now())
     
     __table_args__ = (
-        Index('idx_news_published_at', 'published_at'),
+        Index('brin_news_published_at', 'published_at', postgresql_using='brin',
+              postgresql_with={'pages_per_range': 32}),
         Index('idx_news_source', 'source'),
         Index('idx_news_sentiment', 'sentiment_score'),
+        Index('idx_news_published_relevance', published_at.desc(), relevance_score),
+        Index('idx_news_keywords_gin', 'keywords', postgresql_using='gin'),
+        Index('idx_news_fts', _news_document(title, content), postgresql_using='gin'),
     )
 
 class TradingSignal(Base):
@@ -142,13 +213,13 @@ class TradingSignal(Base):
     __tablename__ = 'trading_signals'
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    market_id = Column(String, ForeignKey('markets.id'), nullable=False)
+    market_id = Column(String(MARKET_ID_LENGTH), ForeignKey('markets.id'), nullable=False)
     strategy_name = Column(String, nullable=False)
     signal_type = Column(String, nullable=False)  # 'buy', 'sell', 'hold'
     confidence_score = Column(Float, nullable=False)
     reasoning = Column(Text)
-    features = Column(JSON)
-    generated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    features = Column(JSONB)
+    generated_at = Column(DateTime(timezone=True), server_default=func.now())
     executed = Column(Boolean, default=False)
     
     # Relationships
@@ -157,7 +228,10 @@ class TradingSignal(Base):
     __table_args__ = (
         Index('idx_signal_market_strategy', 'market_id', 'strategy_name'),
         Index('idx_signal_generated_at', 'generated_at'),
-        Index('idx_signal_executed', 'executed'),
+        Index('idx_signal_pending_conf', confidence_score.desc(),
+              postgresql_where=text("executed = false")),
+        Index('idx_signal_pending_strategy_conf', strategy_name, confidence_score.desc(),
+              postgresql_where=text("executed = false")),
     )
 
 class PerformanceMetrics(Base):
@@ -176,7 +250,7 @@ class PerformanceMetrics(Base):
     successful_trades = Column(Integer)
     
     __table_args__ = (
-        Index('idx_performance_date', 'date'),
+        Index('idx_performance_date', date.desc()),
     )
 
 class MLModel(Base):
@@ -188,18 +262,23 @@ class MLModel(Base):
     version = Column(String, nullable=False)
     model_type = Column(String, nullable=False)
     file_path = Column(String)
-    parameters = Column(JSON)
-    performance_metrics = Column(JSON)
+    parameters = Column(JSONB)
+    performance_metrics = Column(JSONB)
     training_data_size = Column(Integer)
-    trained_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
+    trained_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=False)
     
     __table_args__ = (
         UniqueConstraint('name', 'version', name='uq_model_name_version'),
-        Index('idx_model_name', 'name'),
-        Index('idx_model_active', 'is_active'),
     )
 
+# Prebuilt statements for the hottest lookups, so each call reuses one compiled form
+_market_by_id_stmt = select(Market).where(Market.id == bindparam('market_id'))
+_active_model_stmt = (select(MLModel)
+                      .where(MLModel.name == bindparam('model_name'))
+                      .where(MLModel.is_active == True)
+                      .limit(1))
+
 class DatabaseManager:
     """
     Enhanced database manager with connection pooling, session management,
@@ -211,31 +290,157 @@ class DatabaseManager:
         self.engine = None
         self.SessionLocal = None
         self.logger = logging.getLogger(__name__)
+        self.copy_threshold = 500  # Batches this large are streamed with COPY
+        
+        # Short-lived read caches for hot lookups, shared across threads
+        self._cache_lock = threading.RLock()
+        self._market_cache = TTLCache(maxsize=4096, ttl=5)
+        self._model_cache = TTLCache(maxsize=64, ttl=300)
+        
+        # Shared Redis tier so separate bot processes reuse each other's lookups
+        self.redis_config = get_redis_config()
+        self._redis: Optional[redis.Redis] = None
+        self._redis_retry_at = 0.0
+        
         self._initialize_engine()
         
     def _initialize_engine(self):
         """Initialize database engine with connection pooling"""
+        if self.config.pool_class == "null":
+            # pgbouncer owns pooling; open a fresh connection per checkout
+            pool_options = {'poolclass': NullPool}
+        else:
+            # LIFO keeps a small warm working set and lets idle connections age out
+            pool_options = {
+                'poolclass': QueuePool,
+                'pool_size': self.config.pool_size,
+                'max_overflow': self.config.max_overflow,
+                'pool_timeout': self.config.pool_timeout,
+                'pool_recycle': self.config.pool_recycle,
+                'pool_use_lifo': True
+            }
+            
+        # psycopg3 prepares statements after prepare_threshold executions; pgbouncer in
+        # transaction mode cannot keep them, so disable it there. Other drivers reject the option
+        url = self._driver_url(self.config.url)
+        connect_args = {}
+        if make_url(url).get_driver_name() == "psycopg":
+            connect_args['prepare_threshold'] = None if self.config.pool_class == "null" else 5
+        
+        # OLTP lookups finish in milliseconds: JIT compilation only adds latency, and a
+        # runaway query or abandoned transaction must not hold a pooled connection
+        if self.config.pool_class != "null":
+            connect_args['options'] = (
+                f"-c jit=off"
+                f" -c statement_timeout={self.config.statement_timeout_ms}"
+                f" -c idle_in_transaction_session_timeout={self.config.idle_in_transaction_timeout_ms}"
+            )
+        
         self.engine = create_engine(
-            self.config.url,
-            poolclass=QueuePool,
-            pool_size=self.config.pool_size,
-            max_overflow=self.config.max_overflow,
-            pool_timeout=self.config.pool_timeout,
-            pool_recycle=self.config.pool_recycle,
-            echo=False  # Set to True for SQL debugging
+            url,
+            connect_args=connect_args,
+            query_cache_size=1024,
+            pool_pre_ping=True,
+            echo=False,  # Set to True for SQL debugging
+            **pool_options
         )
         
+        # Keep loaded attributes after commit so returned objects stay usable once the session closes
         self.SessionLocal = sessionmaker(
             autocommit=False,
             autoflush=False,
+            expire_on_commit=False,
             bind=self.engine
         )
         
+    @staticmethod
+    def _driver_url(url: str) -> str:
+        """Route driverless PostgreSQL URLs through psycopg3"""
+        for prefix in ("postgresql://", "postgres://"):
+            if url.startswith(prefix):
+                return "postgresql+psycopg://" + url[len(prefix):]
+        return url
+        
+    def dispose_after_fork(self):
+        """Drop pooled connections inherited from a parent process"""
+        self.engine.dispose(close=False)
+        
     def create_tables(self):
         """Create all database tables"""
         Base.metadata.create_all(bind=self.engine)
+        self.ensure_partitions()
         self.logger.info("Database tables created successfully")
         
+    # Monthly range-partitioned tables and their partition key columns
+    PARTITIONED_TABLES = {'trades': 'executed_at', 'price_history': 'timestamp'}
+    
+    @staticmethod
+    def _add_months(month_start: datetime, months: int) -> datetime:
+        """Shift the first day of a month by a number of months"""
+        month_index = month_start.month - 1 + months
+        return month_start.replace(year=month_start.year + month_index // 12, month=month_index % 12 + 1)
+        
+    def ensure_partitions(self, months_ahead: int = 2):
+        """Create monthly partitions from the current month through months_ahead"""
+        current_month = datetime.now(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        
+        for offset in range(months_ahead + 1):
+            lower = self._add_months(current_month, offset)
+            upper = self._add_months(current_month, offset + 1)
+            for table, key in self.PARTITIONED_TABLES.items():
+                self._create_partition(table, key, lower, upper)
+                
+    def _create_partition(self, table: str, key: str, lower: datetime, upper: datetime):
+        """Create one monthly partition, moving across any of its rows the default partition caught"""
+        partition = f"{table}_{lower:%Y_%m}"
+        
+        with self.engine.begin() as connection:
+            if connection.execute(text("SELECT to_regclass(:name)"), {'name': partition}).scalar() is not None:
+                return
+                
+            # A partition cannot be attached while the default partition holds rows in its range,
+            # so block inserts into the default, move those rows into the new table, then attach it
+            connection.execute(text(f"LOCK TABLE {table}_default IN ACCESS EXCLUSIVE MODE"))
+            connection.execute(text(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            moved = connection.execute(text(
+                f"WITH moved AS (DELETE FROM {table}_default WHERE {key} >= :lower AND {key} < :upper RETURNING *) "
+                f"INSERT INTO {partition} SELECT * FROM moved"
+            ), {'lower': lower, 'upper': upper}).rowcount
+            # Bounds carry their UTC offset, so they match the moved range whatever the session TimeZone
+            connection.execute(text(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            ))
+            
+        self.logger.info(f"Created partition {partition}" + (f", moved {moved} rows from {table}_default" if moved else ""))
+        
+    def drop_partitions_before(self, cutoff: datetime) -> List[str]:
+        """Drop monthly partitions whose whole range ends on or before cutoff"""
+        dropped = []
+        
+        with self.engine.begin() as connection:
+            for table in self.PARTITIONED_TABLES:
+                partitions = connection.execute(text(
+                    "SELECT child.relname FROM pg_inherits "
+                    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+                    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                    "WHERE parent.relname = :table"
+                ), {'table': table}).scalars().all()
+                
+                for partition in partitions:
+                    try:
+                        lower = datetime.strptime(partition[len(table) + 1:], '%Y_%m').replace(tzinfo=timezone.utc)
+                    except ValueError:
+                        continue  # Default partition
+                        
+                    if self._add_months(lower, 1) <= cutoff:
+                        connection.execute(text(f'DROP TABLE IF EXISTS "{partition}"'))
+                        dropped.append(partition)
+                        
+        if dropped:
+            self.logger.info(f"Dropped expired partitions: {', '.join(dropped)}")
+        return dropped
+        
     def drop_tables(self):
         """Drop all database tables"""
         Base.metadata.drop_all(bind=self.engine)
@@ -255,76 +460,306 @@ class DatabaseManager:
         finally:
             session.close()
             
+    @contextmanager
+    def session_scope(self, session: Optional[Session] = None):
+        """Join the caller's session when given, otherwise open one that commits on exit"""
+        if session is not None:
+            yield session
+            return
+            
+        with self.get_session() as own_session:
+            yield own_session
+            
+    def _get_redis(self) -> Optional[redis.Redis]:
+        """Return the Redis client, or None while Redis is unavailable"""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+            
+        if self._redis is None:
+            self._redis = redis.Redis(
+                host=self.redis_config.host,
+                port=self.redis_config.port,
+                db=self.redis_config.db,
+                password=self.redis_config.password,
+                socket_timeout=self.redis_config.socket_timeout
+            )
+        return self._redis
+        
+    def _redis_call(self, method: str, *args):
+        """Run a Redis command, backing off for a minute after a failure"""
+        client = self._get_redis()
+        if client is None:
+            return None
+            
+        try:
+            return getattr(client, method)(*args)
+        except redis.RedisError as e:
+            self.logger.warning(f"Redis cache unavailable, using database only: {e}")
+            self._redis_retry_at = time.monotonic() + 60
+            return None
+            
+    @staticmethod
+    def _to_cache(row: Base) -> bytes:
+        """Serialize a model row's column values for Redis"""
+        return orjson.dumps({column.name: getattr(row, column.key)
+                             for column in row.__mapper__.columns})
+        
+    @staticmethod
+    def _from_cache(model_class, payload: bytes):
+        """Rebuild a detached model row from its cached column values"""
+        values = orjson.loads(payload)
+        for column in model_class.__mapper__.columns:
+            value = values.get(column.name)
+            if value is None:
+                continue
+            if isinstance(column.type, DateTime):
+                values[column.name] = datetime.fromisoformat(value)
+            elif isinstance(column.type, UUID):
+                values[column.name] = uuid.UUID(value)
+        return model_class(**values)
+        
+    @contextmanager
+    def get_analytics_session(self):
+        """Get a session for long analytical queries, with JIT and no statement timeout"""
+        with self.get_session() as session:
+            session.execute(text("SET LOCAL jit = on"))
+            session.execute(text("SET LOCAL statement_timeout = 0"))
+            yield session
+            
     def get_market(self, market_id: str) -> Optional[Market]:
         """Get market by ID"""
-        with self.get_session() as session:
-            return session.query(Market).filter(Market.id == market_id).first()
+        with self._cache_lock:
+            market = self._market_cache.get(market_id)
+        if market is not None:
+            return market
             
+        cached = self._redis_call('get', f"market:{market_id}")
+        if cached is not None:
+            market = self._from_cache(Market, cached)
+        else:
+            with self.get_session() as session:
+                market = session.execute(_market_by_id_stmt, {'market_id': market_id}).scalar_one_or_none()
+            if market is not None:
+                self._redis_call('setex', f"market:{market_id}", 5, self._to_cache(market))
+                
+        if market is not None:
+            with self._cache_lock:
+                self._market_cache[market_id] = market
+        return market
+        
+    def get_markets_bulk(self, market_ids: List[str]) -> Dict[str, Market]:
+        """Get many markets by ID in one query, keyed by market ID; unknown IDs are omitted"""
+        markets: Dict[str, Market] = {}
+        with self._cache_lock:
+            for market_id in market_ids:
+                market = self._market_cache.get(market_id)
+                if market is not None:
+                    markets[market_id] = market
+                    
+        missing = list({market_id for market_id in market_ids if market_id not in markets})
+        if missing:
+            with self.get_session() as session:
+                fetched = session.execute(select(Market).where(Market.id.in_(missing))).scalars().all()
+            with self._cache_lock:
+                for market in fetched:
+                    self._market_cache[market.id] = market
+                    markets[market.id] = market
+                    
+        return markets
+        
+    def _invalidate_markets(self, market_ids: List[str]):
+        """Drop cached markets after they are written"""
+        with self._cache_lock:
+            for market_id in market_ids:
+                self._market_cache.pop(market_id, None)
+                
+        if market_ids:
+            self._redis_call('delete', *[f"market:{market_id}" for market_id in market_ids])
+                
+
     def update_market(self, market_data: Dict[str, Any]) -> Market:
-        """Update or create market"""
+        """Update or create market in a single upsert round trip"""
+        self._invalidate_markets([market_data['id']])
+        values = {key: value for key, value in market_data.items() if key in Market.__table__.columns}
+        
         with self.get_session() as session:
-            market = session.query(Market).filter(Market.id == market_data['id']).first()
-            
-            if market:
-                # Update existing market
-                for key, value in market_data.items():
-                    if hasattr(market, key):
-                        setattr(market, key, value)
-                market.updated_at = datetime.now(timezone.utc)
-            else:
-                # Create new market
-                market = Market(**market_data)
-                session.add(market)
-                
-            session.commit()
-            session.refresh(market)
-            return market
+            stmt = pg_insert(Market).values(**values)
+            update_columns = {key: value for key, value in values.items() if key != 'id'}
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['id'],
+                set_=update_columns
+            ).returning(Market)
             
-    def record_trade(self, trade_data: Dict[str, Any]) -> Trade:
-        """Record a new trade"""
-        with self.get_session() as session:
-            trade = Trade(**trade_data)
-            session.add(trade)
-            session.commit()
-            session.refresh(trade)
-            return trade
+            return session.scalars(
+                stmt, execution_options={'populate_existing': True}
+            ).one()
             
-    def update_position(self, market_id: str, quantity: int, average_price: float) -> Position:
-        """Update or create position"""
+    def bulk_upsert_markets(self, markets_data: List[Dict[str, Any]]) -> int:
+        """Insert or update many markets in one batched upsert"""
+        if not markets_data:
+            return 0
+            
+        self._invalidate_markets([market_data['id'] for market_data in markets_data])
         with self.get_session() as session:
-            position = session.query(Position).filter(Position.market_id == market_id).first()
-            
-            if position:
-                # Update existing position
-                total_quantity = position.quantity + quantity
-                if total_quantity == 0:
-                    # Close position
-                    session.delete(position)
-                    session.commit()
-                    return None
-                else:
-                    # Update position
-                    total_cost = (position.quantity * position.average_price) + (quantity * average_price)
-                    position.quantity = total_quantity
-                    position.average_price = total_cost / total_quantity
-                    position.updated_at = datetime.now(timezone.utc)
+            stmt = pg_insert(Market)
+            update_columns = {key: stmt.excluded[key] for key in markets_data[0] if key != 'id'}
+            session.execute(
+                stmt.on_conflict_do_update(index_elements=[Market.id], set_=update_columns),
+                markets_data
+            )
+            
+        return len(markets_data)
+        
+    def bulk_insert_price_history(self, records: List[Dict[str, Any]]) -> int:
+        """Append many price history rows with a single COPY"""
+        if not records:
+            return 0
+            
+        now = datetime.now(timezone.utc).isoformat()
+        buffer = io.StringIO()
+        for record in records:
+            volume = record.get('volume')
+            timestamp = record.get('timestamp')
+            buffer.write('\t'.join((
+                str(uuid.uuid4()),
+                record['market_id'],
+                repr(float(record['yes_price'])),
+                repr(float(record['no_price'])),
+                '\\N' if volume is None else repr(float(volume)),
+                timestamp.isoformat() if timestamp else now
+            )) + '\n')
+        buffer.seek(0)
+        
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            copy_sql = "COPY price_history (id, market_id, yes_price, no_price, volume, timestamp) FROM STDIN"
+            if hasattr(cursor, 'copy_expert'):
+                # psycopg2
+                cursor.copy_expert(copy_sql, buffer)
             else:
-                # Create new position
-                position = Position(
-                    market_id=market_id,
-                    quantity=quantity,
-                    average_price=average_price
-                )
-                session.add(position)
+                with cursor.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+            cursor.close()
+            connection.commit()
+        except Exception as e:
+            connection.rollback()
+            self.logger.error(f"Bulk price history insert failed: {e}")
+            raise
+        finally:
+            connection.close()
+            
+        return len(records)
+        
+    def record_trade(self, trade_data: Dict[str, Any], session: Optional[Session] = None) -> Trade:
+        """Record a new trade, deferring the commit to the caller's session if one is given"""
+        with self.session_scope(session) as s:
+            trade = Trade(id=trade_data.get('id') or uuid.uuid4(), **{k: v for k, v in trade_data.items() if k != 'id'})
+            s.add(trade)
+            if session is None:
+                s.commit()
+                s.refresh(trade)
+            return trade
+            
+    def record_trades_bulk(self, trades_data: List[Dict[str, Any]],
+                           session: Optional[Session] = None) -> int:
+        """Record a batch of trades in one batched insert, in the caller's session if one is given"""
+        if not trades_data:
+            return 0
+            
+        with self.session_scope(session) as s:
+            # Ids default client-side, so nothing needs to be fetched back
+            s.execute(insert(Trade), trades_data)
+            
+        return len(trades_data)
+        
+    def update_position(self, market_id: str, quantity: int, average_price: float,
+                        session: Optional[Session] = None) -> Position:
+        """Update or create position with a single atomic upsert"""
+        with self.session_scope(session) as session:
+            total_quantity = Position.quantity + quantity
+            stmt = pg_insert(Position).values(
+                market_id=market_id,
+                quantity=quantity,
+                average_price=average_price
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['market_id'],
+                set_={
+                    'quantity': total_quantity,
+                    'average_price': case(
+                        (total_quantity == 0, Position.average_price),
+                        else_=(Position.quantity * Position.average_price + quantity * average_price) / total_quantity
+                    )
+                }
+            ).returning(Position)
+            
+            position = session.scalars(
+                stmt, execution_options={'populate_existing': True}
+            ).one()
+            
+            if position.quantity == 0:
+                # Close position
+                session.execute(delete(Position).where(Position.id == position.id))
+                return None
                 
-            session.commit()
-            session.refresh(position)
             return position
             
+    def bulk_upsert_positions(self, deltas: List[Dict[str, Any]], session: Optional[Session] = None) -> int:
+        """Apply many position changes in one upsert; each delta has market_id, quantity and average_price"""
+        # Net deltas per market first, since one upsert cannot touch the same row twice
+        netted = {}
+        for delta in deltas:
+            quantity, cost = netted.get(delta['market_id'], (0, 0.0))
+            netted[delta['market_id']] = (quantity + delta['quantity'],
+                                          cost + delta['quantity'] * delta['average_price'])
+        if not netted:
+            return 0
+            
+        rows = [{
+            'id': uuid.uuid4(),
+            'market_id': market_id,
+            'quantity': quantity,
+            'average_price': cost / quantity if quantity else 0.0
+        } for market_id, (quantity, cost) in netted.items()]
+        
+        with self.session_scope(session) as s:
+            stmt = pg_insert(Position).values(rows)
+            total_quantity = Position.quantity + stmt.excluded.quantity
+            stmt = stmt.on_conflict_do_update(
+                index_elements=['market_id'],
+                set_={
+                    'quantity': total_quantity,
+                    'average_price': case(
+                        (total_quantity == 0, Position.average_price),
+                        else_=(Position.quantity * Position.average_price
+                               + stmt.excluded.quantity * stmt.excluded.average_price) / total_quantity
+                    )
+                }
+            )
+            s.execute(stmt)
+            
+            # Close positions that netted out to zero
+            s.execute(delete(Position).where(Position.market_id.in_(list(netted)), Position.quantity == 0))
+            
+        return len(rows)
+        
     def get_active_positions(self) -> List[Position]:
         """Get all active positions"""
         with self.get_session() as session:
-            return session.query(Position).filter(Position.quantity != 0).all()
+            return (session.query(Position)
+                   .options(selectinload(Position.market))
+                   .filter(Position.quantity != 0)
+                   .all())
+            
+    def get_active_unrealized_pnls_np(self) -> np.ndarray:
+        """Get unrealized P&L of valued active positions as a float64 array, NaN where unset"""
+        with self.get_session() as session:
+            values = session.scalars(
+                select(Position.unrealized_pnl)
+                .where(Position.quantity != 0, Position.current_value != 0)
+            )
+            return np.fromiter((np.nan if value is None else value for value in values), dtype=np.float64)
             
     def record_price_history(self, market_id: str, yes_price: float, no_price: float, volume: float = None):
         """Record price history"""
@@ -338,15 +773,102 @@ class DatabaseManager:
             session.add(price_record)
             session.commit()
             
+    def record_price_history_bulk(self, records: List[Dict[str, Any]]) -> int:
+        """Record many price history rows in one round trip, using COPY for large batches"""
+        if not records:
+            return 0
+            
+        if len(records) >= self.copy_threshold:
+            return self.bulk_insert_price_history(records)
+            
+        with self.get_session() as session:
+            session.bulk_insert_mappings(PriceHistory, records)
+            
+        return len(records)
+        
+    def record_tick(self, market_id: str, yes_price: float, no_price: float, volume: float = None):
+        """Record a price tick and update the market's latest prices in one transaction"""
+        self._invalidate_markets([market_id])
+        with self.get_session() as session:
+            session.execute(insert(PriceHistory).values(
+                id=uuid.uuid4(),
+                market_id=market_id,
+                yes_price=yes_price,
+                no_price=no_price,
+                volume=volume
+            ))
+            session.execute(
+                update(Market)
+                .where(Market.id == market_id)
+                .values(yes_price=yes_price, no_price=no_price, volume=volume)
+            )
+            
     def get_price_history(self, market_id: str, limit: int = 100) -> List[PriceHistory]:
         """Get price history for a market"""
         with self.get_session() as session:
             return (session.query(PriceHistory)
+                   .options(selectinload(PriceHistory.market))
                    .filter(PriceHistory.market_id == market_id)
                    .order_by(PriceHistory.timestamp.desc())
                    .limit(limit)
                    .all())
                    
+    def get_price_history_arrays(self, market_id: str, limit: int = 100,
+                                 since_ns: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Get a market's latest (epoch-ns int64 timestamps, float32 yes prices) oldest-first, optionally only after since_ns"""
+        stmt = select(PriceHistory.timestamp, PriceHistory.yes_price).where(PriceHistory.market_id == market_id)
+        if since_ns is not None:
+            stmt = stmt.where(PriceHistory.timestamp > _EPOCH + (since_ns // 1000) * _MICROSECOND)
+        stmt = stmt.order_by(PriceHistory.timestamp.desc()).limit(limit)
+        
+        with self.get_session() as session:
+            rows = session.execute(stmt).all()
+            
+        rows.reverse()
+        timestamps = np.fromiter(((ts - _EPOCH) // _MICROSECOND * 1000 for ts, _ in rows), dtype=np.int64, count=len(rows))
+        prices = np.fromiter((price for _, price in rows), dtype=np.float32, count=len(rows))
+        return timestamps, prices
+        
+    def get_price_histories_bulk(self, market_ids: List[str],
+                                 limit: int = 50) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Get the latest prices for many markets in one query as newest-first (epoch seconds, yes price) arrays"""
+        if not market_ids:
+            return {}
+            
+        with self.get_session() as session:
+            # Rank each market's rows newest-first and keep the top `limit` per market
+            ranked = (
+                select(
+                    PriceHistory.market_id,
+                    PriceHistory.timestamp,
+                    PriceHistory.yes_price,
+                    func.row_number().over(
+                        partition_by=PriceHistory.market_id,
+                        order_by=PriceHistory.timestamp.desc()
+                    ).label('rank')
+                )
+                .where(PriceHistory.market_id.in_(market_ids))
+                .subquery()
+            )
+            rows = session.execute(
+                select(ranked.c.market_id, ranked.c.timestamp, ranked.c.yes_price)
+                .where(ranked.c.rank <= limit)
+                .order_by(ranked.c.market_id, ranked.c.rank)
+            ).all()
+            
+        series: Dict[str, Tuple[List[float], List[float]]] = {}
+        for market_id, timestamp, yes_price in rows:
+            if yes_price is not None:
+                timestamps, prices = series.setdefault(market_id, ([], []))
+                timestamps.append(timestamp.timestamp())
+                prices.append(yes_price)
+                
+        # Timestamps stay float64: epoch seconds need more precision than float32 carries
+        return {
+            market_id: (np.asarray(timestamps, dtype=np.float64), np.asarray(prices, dtype=np.float32))
+            for market_id, (timestamps, prices) in series.items()
+        }
+        
     def record_news_article(self, article_data: Dict[str, Any]) -> NewsArticle:
         """Record a news article"""
         with self.get_session() as session:
@@ -356,29 +878,67 @@ class DatabaseManager:
             session.refresh(article)
             return article
             
-    def get_recent_news(self, hours: int = 24, min_relevance: float = 0.5) -> List[NewsArticle]:
-        """Get recent relevant news articles"""
+    def record_article_sentiments(self, sentiments: List[Dict[str, Any]]) -> int:
+        """Persist analyzed sentiment for many articles in one executemany UPDATE keyed by article id"""
+        if not sentiments:
+            return 0
+        analyzed_at = datetime.now(timezone.utc)
         with self.get_session() as session:
-            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
-            return (session.query(NewsArticle)
-                   .filter(NewsArticle.published_at >= cutoff_time)
-                   .filter(NewsArticle.relevance_score >= min_relevance)
-                   .order_by(NewsArticle.published_at.desc())
-                   .all())
-                   
-    def record_trading_signal(self, signal_data: Dict[str, Any]) -> TradingSignal:
-        """Record a trading signal"""
+            session.execute(update(NewsArticle), [
+                {
+                    'id': row['id'],
+                    'sentiment_score': row['sentiment_score'],
+                    'sentiment_confidence': row['confidence'],
+                    'analyzed_at': analyzed_at
+                }
+                for row in sentiments
+            ])
+        return len(sentiments)
+        
+    def get_recent_news(self, hours: int = 24, min_relevance: float = 0.5,
+                        keywords: Optional[List[str]] = None) -> List[NewsArticle]:
+        """Get recent relevant news articles, optionally only those matching any of the keywords"""
         with self.get_session() as session:
-            signal = TradingSignal(**signal_data)
-            session.add(signal)
-            session.commit()
-            session.refresh(signal)
+            cutoff_time = datetime.now(timezone.utc) - timedelta(hours=hours)
+            query = (session.query(NewsArticle)
+                    .filter(NewsArticle.published_at >= cutoff_time)
+                    .filter(NewsArticle.relevance_score >= min_relevance))
+            if keywords:
+                # Matched against the idx_news_fts GIN index instead of scanning article text
+                keyword_query = func.websearch_to_tsquery(literal_column("'english'::regconfig"), ' or '.join(keywords))
+                query = query.filter(_news_document(NewsArticle.title, NewsArticle.content).op('@@')(keyword_query))
+            return query.order_by(NewsArticle.published_at.desc()).all()
+            
+    def record_trading_signal(self, signal_data: Dict[str, Any],
+                              session: Optional[Session] = None) -> TradingSignal:
+        """Record a trading signal, deferring the commit to the caller's session if one is given"""
+        with self.session_scope(session) as s:
+            signal = TradingSignal(id=signal_data.get('id') or uuid.uuid4(),
+                                   **{k: v for k, v in signal_data.items() if k != 'id'})
+            s.add(signal)
+            if session is None:
+                s.commit()
+                s.refresh(signal)
             return signal
             
+    def record_trading_signals_bulk(self, signals_data: List[Dict[str, Any]],
+                                    session: Optional[Session] = None) -> int:
+        """Record a batch of trading signals in one batched insert, in the caller's session if one is given"""
+        if not signals_data:
+            return 0
+            
+        with self.session_scope(session) as s:
+            # Ids default client-side, so nothing needs to be fetched back
+            s.execute(insert(TradingSignal), signals_data)
+            
+        return len(signals_data)
+        
     def get_pending_signals(self, strategy_name: str = None) -> List[TradingSignal]:
         """Get pending trading signals"""
         with self.get_session() as session:
-            query = session.query(TradingSignal).filter(TradingSignal.executed == False)
+            query = (session.query(TradingSignal)
+                    .options(selectinload(TradingSignal.market))
+                    .filter(TradingSignal.executed == False))
             if strategy_name:
                 query = query.filter(TradingSignal.strategy_name == strategy_name)
             return query.order_by(TradingSignal.confidence_score.desc()).all()
@@ -401,8 +961,29 @@ class DatabaseManager:
                    .order_by(PerformanceMetrics.date.desc())
                    .all())
                    
+    def get_performance_history_np(self, days: int = 30) -> np.ndarray:
+        """Get performance history newest-first as a structured array, skipping ORM hydration"""
+        with self.get_session() as session:
+            cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
+            rows = session.execute(
+                select(PerformanceMetrics.date, PerformanceMetrics.daily_pnl, PerformanceMetrics.total_pnl)
+                .where(PerformanceMetrics.date >= cutoff_date)
+                .order_by(PerformanceMetrics.date.desc())
+            ).all()
+            
+        return np.array([
+            (np.datetime64(int(date.timestamp()), 's'),
+             np.nan if daily_pnl is None else daily_pnl,
+             np.nan if total_pnl is None else total_pnl)
+            for date, daily_pnl, total_pnl in rows
+        ], dtype=PERFORMANCE_HISTORY_DTYPE)
+        
     def save_ml_model(self, model_data: Dict[str, Any]) -> MLModel:
         """Save ML model metadata"""
+        with self._cache_lock:
+            self._model_cache.pop(model_data['name'], None)
+        self._redis_call('delete', f"mlmodel:active:{model_data['name']}")
+        
         with self.get_session() as session:
             # Deactivate previous versions
             session.query(MLModel).filter(
@@ -415,27 +996,57 @@ class DatabaseManager:
             session.add(model)
             session.commit()
             session.refresh(model)
-            return model
+            
+        # Write through once committed so other processes pick up the new version
+        if model.is_active:
+            self._redis_call('setex', f"mlmodel:active:{model.name}", 300, self._to_cache(model))
+        return model
             
     def get_active_model(self, model_name: str) -> Optional[MLModel]:
         """Get active ML model by name"""
-        with self.get_session() as session:
-            return (session.query(MLModel)
-                   .filter(MLModel.name == model_name)
-                   .filter(MLModel.is_active == True)
-                   .first())
+        with self._cache_lock:
+            model = self._model_cache.get(model_name)
+        if model is not None:
+            return model
+            
+        cached = self._redis_call('get', f"mlmodel:active:{model_name}")
+        if cached is not None:
+            model = self._from_cache(MLModel, cached)
+        else:
+            with self.get_session() as session:
+                model = session.execute(_active_model_stmt, {'model_name': model_name}).scalar_one_or_none()
+            if model is not None:
+                self._redis_call('setex', f"mlmodel:active:{model_name}", 300, self._to_cache(model))
+                
+        if model is not None:
+            with self._cache_lock:
+                self._model_cache[model_name] = model
+        return model
 
-# Global database manager instance
-db_manager = DatabaseManager()
+# Global database manager instance, created on first use
+_db_manager: Optional[DatabaseManager] = None
+_db_manager_lock = threading.Lock()
+
+def get_db_manager() -> DatabaseManager:
+    """Get the shared database manager, creating it on first use"""
+    global _db_manager
+    if _db_manager is None:
+        with _db_manager_lock:
+            if _db_manager is None:
+                _db_manager = DatabaseManager()
+    return _db_manager
+
+def __getattr__(name: str):
+    # Keeps `from .database import db_manager` working without connecting at import
+    if name == 'db_manager':
+        return get_db_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Convenience functions
 def get_db_session():
     """Get database session"""
-    return db_manager.get_session()
+    return get_db_manager().get_session()
 
 def init_database():
     """Initialize database tables"""
-    db_manager.create_tables()
-
-from datetime import timedelta
-
+    get_db_manager().create_tables()
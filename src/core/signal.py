@@ -0,0 +1,57 @@
+"""
+Trading Signal for Enhanced Kalshi Trading Bot
+
+Strategies emit signals as dictionaries; the trading engine converts them to
+Signal instances at the boundary so filtering and execution work on slotted
+attributes instead of dict lookups.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Any
+
+@dataclass
+class Signal:
+    """Trading signal passed from strategy output through filtering to execution"""
+    __slots__ = ('market_id', 'strategy_name', 'signal_type', 'confidence_score', 'strategy_weight',
+                 'position_size_percentage', 'reasoning', 'features', 'generated_at', 'score')
+
+    market_id: str
+    strategy_name: str
+    signal_type: str
+    confidence_score: float
+    strategy_weight: float
+    position_size_percentage: float
+    reasoning: str
+    features: Dict[str, Any]
+    generated_at: Optional[datetime]
+    score: float
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], strategy_weight: float = 1.0) -> 'Signal':
+        """Build a signal from a strategy's dict output, precomputing its ranking score"""
+        confidence_score = float(data.get('confidence_score') or 0.0)
+        return cls(
+            market_id=data['market_id'],
+            strategy_name=data.get('strategy_name', ''),
+            signal_type=data['signal_type'],
+            confidence_score=confidence_score,
+            strategy_weight=strategy_weight,
+            position_size_percentage=data.get('position_size_percentage', 0.05),
+            reasoning=data.get('reasoning', ''),
+            features=data.get('features', {}),
+            generated_at=data.get('generated_at'),
+            score=confidence_score * strategy_weight
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the column values recorded for a trading signal"""
+        return {
+            'market_id': self.market_id,
+            'strategy_name': self.strategy_name,
+            'signal_type': self.signal_type,
+            'confidence_score': self.confidence_score,
+            'reasoning': self.reasoning,
+            'features': self.features,
+            'generated_at': self.generated_at
+        }
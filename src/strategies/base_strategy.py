@@ -12,6 +12,10 @@ from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+# Fields every signal must carry, and the signal types execution understands
+_REQUIRED_FIELDS = frozenset({'market_id', 'strategy_name', 'signal_type', 'confidence_score', 'target_price'})
+_VALID_SIGNAL_TYPES = frozenset({'buy', 'sell', 'hold'})
+
 class BaseStrategy(ABC):
     """
     Abstract base class for all trading strategies.
@@ -63,19 +67,14 @@ class BaseStrategy(ABC):
         """
         try:
             # Basic validation
-            required_fields = [
-                'market_id', 'strategy_name', 'signal_type', 
-                'confidence_score', 'target_price'
-            ]
-            
-            for field in required_fields:
-                if field not in signal:
-                    self.logger.warning(f"Signal missing required field: {field}")
-                    return False
-                    
+            if not _REQUIRED_FIELDS.issubset(signal):
+                self.logger.warning(f"Signal missing required fields: {sorted(_REQUIRED_FIELDS.difference(signal))}")
+                return False
+                
             # Validate signal type
-            if signal['signal_type'] not in ['buy', 'sell', 'hold']:
-                self.logger.warning(f"Invalid signal type: {signal['signal_type']}")
+            signal_type = signal['signal_type']
+            if signal_type not in _VALID_SIGNAL_TYPES:
+                self.logger.warning(f"Invalid signal type: {signal_type}")
                 return False
                 
             # Validate confidence score
@@ -119,11 +118,14 @@ class BaseStrategy(ABC):
         Returns:
             Processed signals
         """
-        # Default implementation - add strategy name and timestamp
+        # Default implementation - fill in strategy name and timestamp where the strategy left them out
+        now = None
         for signal in signals:
-            signal['strategy_name'] = self.name
+            signal.setdefault('strategy_name', self.name)
             if 'generated_at' not in signal:
-                signal['generated_at'] = datetime.now(timezone.utc)
+                if now is None:
+                    now = datetime.now(timezone.utc)
+                signal['generated_at'] = now
                 
         return signals
         
@@ -143,6 +145,7 @@ class BaseStrategy(ABC):
             
         try:
             self.logger.debug(f"Executing strategy {self.name}")
+            execution_ts = datetime.now(timezone.utc)
             
             # Preprocess data
             processed_data = self.preprocess_market_data(market_data)
@@ -154,15 +157,13 @@ class BaseStrategy(ABC):
             signals = self.postprocess_signals(signals)
             
             # Validate signals
-            valid_signals = []
-            for signal in signals:
-                if self.validate_signal(signal, processed_data):
-                    valid_signals.append(signal)
-                else:
-                    self.logger.warning(f"Invalid signal generated: {signal}")
-                    
+            validate = self.validate_signal
+            valid_signals = [signal for signal in signals if validate(signal, processed_data)]
+            if len(valid_signals) < len(signals):
+                self.logger.warning(f"Dropped {len(signals) - len(valid_signals)} invalid signals")
+                
             # Update execution statistics
-            self.last_execution = datetime.now(timezone.utc)
+            self.last_execution = execution_ts
             self.execution_count += 1
             
             self.logger.info(f"Strategy {self.name} generated {len(valid_signals)} valid signals")
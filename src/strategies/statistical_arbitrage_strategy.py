@@ -6,20 +6,74 @@ using statistical analysis and correlation modeling.
 """
 
 import logging
+import os
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timezone, timedelta
 import numpy as np
-import pandas as pd
+from cachetools import LRUCache
 from scipy import stats
-from sklearn.linear_model import LinearRegression
-from sklearn.metrics import r2_score
+from statsmodels.tsa.stattools import adfuller
 
 from ..core.config import get_trading_config
-from ..core.database import db_manager
+from ..core.database import get_db_manager
 from .base_strategy import BaseStrategy
 
 logger = logging.getLogger(__name__)
 
+# Price points per market kept for correlation and spread statistics
+PRICE_HISTORY_LIMIT = 100
+
+# How long a price is carried forward when aligning series onto a shared timeline
+ALIGNMENT_TOLERANCE_NS = 3600 * 1_000_000_000
+
+# Title words that mark election-style markets, whose outcomes exclude each other
+_EXCLUSIVE_TITLE_WORDS = frozenset({'election', 'elections', 'winner', 'winners', 'president', 'presidential'})
+_WORD_RE = re.compile(r'\w+')
+
+@lru_cache(maxsize=4096)
+def _title_tokens(title: str) -> frozenset:
+    """Lowercased words of a market title, memoized since titles repeat every tick"""
+    return frozenset(_WORD_RE.findall(title.lower()))
+
+# Incremental correlation updates allowed between full recomputes, bounding floating-point drift
+FULL_RECOMPUTE_INTERVAL = 50
+
+# Snapshot of the correlation state, so a restart resumes incremental updates instead of recomputing
+CORRELATION_STATE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cache', 'enhanced-kalshi-bot', 'correlation_state.npz'
+)
+_SUM_NAMES = ('n', 'sx', 'sxx', 'sxy')
+
+def _correlation_sums(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Pairwise (count, sum, sum of squares, cross-product) matrices over the rows where both columns are present"""
+    valid = ~np.isnan(values)
+    w = valid.astype(np.float32)
+    
+    # Pearson sums are shift-invariant; centring on the middle of the 0-1 price range limits
+    # cancellation, and a fixed shift keeps sums from different ticks compatible
+    x = np.where(valid, values - np.float32(0.5), np.float32(0.0))
+    
+    # Every pairwise sum as one single-precision matrix product: sx[i, j] sums column i over the
+    # rows where j is present. Results are widened so running totals accumulate in float64
+    return tuple(product.astype(np.float64) for product in (w.T @ w, x.T @ w, (x * x).T @ w, x.T @ x))
+
+def _correlation_from_sums(n: np.ndarray, sx: np.ndarray, sxx: np.ndarray, sxy: np.ndarray) -> np.ndarray:
+    """Pearson correlation matrix from pairwise sums"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (n * sxy - sx * sx.T) / np.sqrt((n * sxx - sx * sx) * (n * sxx.T - sx.T * sx.T))
+
+@dataclass
+class _CorrelationState:
+    """Aligned price matrix and its pairwise sums from the previous analysis"""
+    market_ids: Tuple[str, ...]
+    grid: np.ndarray
+    values: np.ndarray
+    sums: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    updates: int = 0
+
 class StatisticalArbitrageStrategy(BaseStrategy):
     """
     Statistical arbitrage strategy that identifies mispricings between correlated markets.
@@ -48,6 +102,30 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         self.correlation_cache = {}
         self.last_analysis_time = None
         
+        # Per-market (epoch-ns timestamps, yes prices) arrays, oldest-first
+        self._hist_cache = LRUCache(maxsize=4096)
+        self._correlation_state = self._load_correlation_state()
+        
+        # Grid points where each market of the last aligned matrix actually ticked, not carried forward
+        self._observed: Optional[np.ndarray] = None
+        
+    def _get_hist_arrays(self, market_id: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Latest price history as parallel timestamp/price arrays, fetching only rows newer than the cached ones"""
+        cached = self._hist_cache.get(market_id)
+        if cached is None or len(cached[0]) == 0:
+            timestamps, prices = get_db_manager().get_price_history_arrays(market_id, PRICE_HISTORY_LIMIT)
+        else:
+            timestamps, prices = cached
+            new_timestamps, new_prices = get_db_manager().get_price_history_arrays(
+                market_id, PRICE_HISTORY_LIMIT, since_ns=int(timestamps[-1])
+            )
+            if len(new_timestamps):
+                timestamps = np.concatenate((timestamps, new_timestamps))[-PRICE_HISTORY_LIMIT:]
+                prices = np.concatenate((prices, new_prices))[-PRICE_HISTORY_LIMIT:]
+                
+        self._hist_cache[market_id] = (timestamps, prices)
+        return timestamps, prices
+        
     def find_correlated_markets(self, markets: List[Dict[str, Any]]) -> List[Tuple[str, str, float]]:
         """Find pairs of markets with significant correlation"""
         correlated_pairs = []
@@ -56,58 +134,112 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         market_prices = {}
         for market in markets:
             market_id = market['id']
-            price_history = db_manager.get_price_history(market_id, limit=100)
+            timestamps, prices = self._get_hist_arrays(market_id)
+            if len(prices) >= self.min_data_points:
+                market_prices[market_id] = (timestamps, prices)
+                
+        if len(market_prices) < 2:
+            return correlated_pairs
             
-            if len(price_history) >= self.min_data_points:
-                prices = [(ph.timestamp, ph.yes_price) for ph in price_history if ph.yes_price is not None]
-                if len(prices) >= self.min_data_points:
-                    market_prices[market_id] = prices
-                    
-        # Calculate correlations between all pairs
+        # Align every series onto the union of all timestamps, carrying each price forward for
+        # up to an hour, so one matrix replaces a separate as-of merge per pair
         market_ids = list(market_prices.keys())
-        for i, market_a in enumerate(market_ids):
-            for market_b in market_ids[i+1:]:
-                try:
-                    correlation = self._calculate_correlation(
-                        market_prices[market_a], 
-                        market_prices[market_b]
-                    )
-                    
-                    if abs(correlation) >= self.min_correlation:
-                        correlated_pairs.append((market_a, market_b, correlation))
-                        
-                except Exception as e:
-                    self.logger.debug(f"Error calculating correlation for {market_a}-{market_b}: {e}")
-                    continue
-                    
+        grid = np.unique(np.concatenate([market_prices[market_id][0] for market_id in market_ids]))
+        
+        # Prices are 0-1 probabilities, so float32 loses nothing and halves the bytes the products stream
+        values = np.full((len(grid), len(market_ids)), np.nan, dtype=np.float32)
+        observed = np.zeros(values.shape, dtype=bool)
+        for column, market_id in enumerate(market_ids):
+            timestamps, prices = market_prices[market_id]
+            # Latest observation at or before each grid point, if it is recent enough
+            index = np.searchsorted(timestamps, grid, side='right') - 1
+            safe_index = index.clip(0)
+            in_tolerance = (index >= 0) & (grid - timestamps[safe_index] <= ALIGNMENT_TOLERANCE_NS)
+            values[in_tolerance, column] = prices[safe_index[in_tolerance]]
+            observed[:, column] = (index >= 0) & (timestamps[safe_index] == grid)
+        self._observed = observed
+        
+        # Calculate correlations between all pairs at once
+        correlations, overlap = self._update_correlations(tuple(market_ids), grid, values)
+        with np.errstate(invalid='ignore'):
+            qualifying = (np.abs(correlations) >= self.min_correlation) & (overlap >= self.min_data_points)
+        first, second = np.nonzero(np.triu(qualifying, k=1))
+        pair_correlations = correlations[first, second]
+        
         # Sort by correlation strength
-        correlated_pairs.sort(key=lambda x: abs(x[2]), reverse=True)
+        order = np.argsort(-np.abs(pair_correlations), kind='stable')
+        for i, j, correlation in zip(first[order].tolist(), second[order].tolist(), pair_correlations[order].tolist()):
+            correlated_pairs.append((market_ids[i], market_ids[j], correlation))
         
         self.logger.info(f"Found {len(correlated_pairs)} correlated market pairs")
         return correlated_pairs
         
-    def _calculate_correlation(self, prices_a: List[Tuple], prices_b: List[Tuple]) -> float:
-        """Calculate correlation between two price series"""
-        # Convert to aligned time series
-        df_a = pd.DataFrame(prices_a, columns=['timestamp', 'price_a'])
-        df_b = pd.DataFrame(prices_b, columns=['timestamp', 'price_b'])
-        
-        # Merge on timestamp with tolerance
-        df_a['timestamp'] = pd.to_datetime(df_a['timestamp'])
-        df_b['timestamp'] = pd.to_datetime(df_b['timestamp'])
-        
-        # Use nearest timestamp matching
-        merged = pd.merge_asof(
-            df_a.sort_values('timestamp'),
-            df_b.sort_values('timestamp'),
-            on='timestamp',
-            tolerance=pd.Timedelta('1 hour')
-        ).dropna()
+    def _update_correlations(self, market_ids: Tuple[str, ...], grid: np.ndarray,
+                             values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pairwise correlations and overlap counts, updating the last analysis's sums with only the rows that changed"""
+        state = self._correlation_state
+        if state is not None and state.market_ids == market_ids and state.updates < FULL_RECOMPUTE_INTERVAL:
+            # Rows present in both analyses with identical prices contribute identically to both sums
+            _, old_index, new_index = np.intersect1d(state.grid, grid, assume_unique=True, return_indices=True)
+            old_rows = state.values[old_index]
+            new_rows = values[new_index]
+            same = np.all((old_rows == new_rows) | (np.isnan(old_rows) & np.isnan(new_rows)), axis=1)
+            
+            removed = np.ones(len(state.grid), dtype=bool)
+            removed[old_index[same]] = False
+            added = np.ones(len(grid), dtype=bool)
+            added[new_index[same]] = False
+            
+            # Only worth it while the changed rows are a minority of the window
+            if removed.sum() + added.sum() < len(grid):
+                sums = tuple(
+                    total + plus - minus
+                    for total, plus, minus in zip(state.sums, _correlation_sums(values[added]),
+                                                  _correlation_sums(state.values[removed]))
+                )
+                self._correlation_state = _CorrelationState(market_ids, grid, values, sums, state.updates + 1)
+                return _correlation_from_sums(*sums), sums[0]
+                
+        sums = _correlation_sums(values)
+        self._correlation_state = _CorrelationState(market_ids, grid, values, sums)
+        self._save_correlation_state()
+        return _correlation_from_sums(*sums), sums[0]
         
-        if len(merged) < self.min_data_points:
-            return 0.0
+    def _load_correlation_state(self, path: str = CORRELATION_STATE_PATH) -> Optional[_CorrelationState]:
+        """Restore the correlation state saved by an earlier process, if any"""
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path) as data:
+                return _CorrelationState(
+                    market_ids=tuple(data['market_ids'].tolist()),
+                    grid=data['grid'],
+                    values=data['values'],
+                    sums=tuple(data[name] for name in _SUM_NAMES),
+                    updates=int(data['updates'])
+                )
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable correlation state {path}: {e}")
+            return None
             
-        return merged['price_a'].corr(merged['price_b'])
+    def _save_correlation_state(self, path: str = CORRELATION_STATE_PATH):
+        """Snapshot the correlation state, writing to a temporary file first so readers never see a partial one"""
+        state = self._correlation_state
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    market_ids=np.array(state.market_ids),
+                    grid=state.grid,
+                    values=state.values,
+                    updates=np.int64(state.updates),
+                    **dict(zip(_SUM_NAMES, state.sums))
+                )
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.logger.error(f"Error saving correlation state: {e}")
         
     def test_cointegration(self, prices_a: List[float], prices_b: List[float]) -> Tuple[bool, float]:
         """Test for cointegration between two price series"""
@@ -116,19 +248,30 @@ class StatisticalArbitrageStrategy(BaseStrategy):
             
         try:
             # Perform Engle-Granger cointegration test
-            # Step 1: Run regression
-            X = np.array(prices_a).reshape(-1, 1)
-            y = np.array(prices_b)
+            # Step 1: Run regression, closed-form for a single regressor
+            x = np.asarray(prices_a, dtype=np.float64)
+            y = np.asarray(prices_b, dtype=np.float64)
             
-            model = LinearRegression()
-            model.fit(X, y)
+            x_centered = x - x.mean()
+            y_mean = y.mean()
+            sxx = x_centered @ x_centered
+            slope = (x_centered @ (y - y_mean)) / sxx if sxx > 0 else 0.0
             
             # Step 2: Test residuals for stationarity
-            residuals = y - model.predict(X)
-            
-            # Augmented Dickey-Fuller test on residuals
-            from statsmodels.tsa.stattools import adfuller
-            adf_result = adfuller(residuals)
+            residuals = (y - y_mean) - slope * x_centered
+            
+            # Degenerate fits say nothing about cointegration, so skip the expensive ADF test:
+            # residuals with no dispersion, or an R^2 near 1 that only a spurious fit produces
+            if residuals.std() < 1e-6:
+                return False, 1.0
+            y_centered = y - y_mean
+            r2 = 1.0 - (residuals @ residuals) / (y_centered @ y_centered)
+            if r2 > 0.999:
+                return False, 1.0
+                
+            # Augmented Dickey-Fuller test on residuals; a fixed single lag skips the
+            # autolag search, which refits the regression once per candidate lag
+            adf_result = adfuller(residuals, maxlag=1, regression='c', autolag=None)
             
             # Check if residuals are stationary (p-value < 0.05)
             is_cointegrated = adf_result[1] < self.min_cointegration_score
@@ -140,122 +283,91 @@ class StatisticalArbitrageStrategy(BaseStrategy):
             self.logger.debug(f"Cointegration test error: {e}")
             return False, 1.0
             
-    def calculate_spread_zscore(self, market_a_id: str, market_b_id: str, 
-                               current_price_a: float, current_price_b: float) -> Optional[float]:
-        """Calculate z-score of current spread relative to historical spread"""
-        try:
-            # Get historical prices
-            history_a = db_manager.get_price_history(market_a_id, limit=100)
-            history_b = db_manager.get_price_history(market_b_id, limit=100)
-            
-            if len(history_a) < self.min_data_points or len(history_b) < self.min_data_points:
-                return None
-                
-            # Align price series
-            prices_a = []
-            prices_b = []
-            
-            # Create timestamp-aligned series
-            history_a_dict = {ph.timestamp: ph.yes_price for ph in history_a if ph.yes_price is not None}
-            history_b_dict = {ph.timestamp: ph.yes_price for ph in history_b if ph.yes_price is not None}
-            
-            common_timestamps = set(history_a_dict.keys()) & set(history_b_dict.keys())
-            
-            for ts in sorted(common_timestamps):
-                prices_a.append(history_a_dict[ts])
-                prices_b.append(history_b_dict[ts])
-                
-            if len(prices_a) < self.min_data_points:
-                return None
-                
-            # Calculate historical spreads
-            spreads = np.array(prices_a) - np.array(prices_b)
-            
-            # Calculate current spread
-            current_spread = current_price_a - current_price_b
-            
-            # Calculate z-score
-            spread_mean = np.mean(spreads)
-            spread_std = np.std(spreads)
-            
-            if spread_std == 0:
-                return None
-                
-            zscore = (current_spread - spread_mean) / spread_std
-            
-            return zscore
-            
-        except Exception as e:
-            self.logger.error(f"Error calculating spread z-score: {e}")
-            return None
-            
+    def _pair_spread_zscores(self, correlated_pairs: List[Tuple[str, str, float]],
+                             markets_by_id: Dict[str, Dict[str, Any]]) -> np.ndarray:
+        """Z-score of each pair's current spread against its historical spreads, NaN where undefined"""
+        state = self._correlation_state
+        column = {market_id: i for i, market_id in enumerate(state.market_ids)}
+        count = len(correlated_pairs)
+        first = np.fromiter((column[a] for a, _, _ in correlated_pairs), dtype=np.intp, count=count)
+        second = np.fromiter((column[b] for _, b, _ in correlated_pairs), dtype=np.intp, count=count)
+        current = np.fromiter(
+            (
+                np.nan if markets_by_id[a].get('yes_price') is None or markets_by_id[b].get('yes_price') is None
+                else markets_by_id[a]['yes_price'] - markets_by_id[b]['yes_price']
+                for a, b, _ in correlated_pairs
+            ),
+            dtype=np.float64, count=count
+        )
+        
+        # (T, P) historical spreads, counted only where both markets really ticked: carried-forward
+        # copies would pad the observation count and shrink the spread's deviation
+        spreads = state.values[:, first].astype(np.float64) - state.values[:, second]
+        valid = self._observed[:, first] & self._observed[:, second]
+        observations = valid.sum(axis=0)
+        mean = np.where(valid, spreads, 0.0).sum(axis=0) / np.maximum(observations, 1)
+        deviations = np.where(valid, spreads - mean, 0.0)
+        std = np.sqrt((deviations * deviations).sum(axis=0) / np.maximum(observations, 1))
+        
+        # Divide only where the spread is defined and varies; everything else stays NaN
+        usable = (observations >= self.min_data_points) & (std > 0)
+        zscores = np.full(count, np.nan)
+        zscores[usable] = (current[usable] - mean[usable]) / std[usable]
+        return zscores
+        
     def identify_arbitrage_opportunities(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Identify statistical arbitrage opportunities"""
         opportunities = []
         
         # Find correlated market pairs
         correlated_pairs = self.find_correlated_markets(markets)
+        if not correlated_pairs:
+            return opportunities
+        markets_by_id = {m['id']: m for m in markets}
         
-        for market_a_id, market_b_id, correlation in correlated_pairs:
-            try:
-                # Get current market data
-                market_a = next((m for m in markets if m['id'] == market_a_id), None)
-                market_b = next((m for m in markets if m['id'] == market_b_id), None)
-                
-                if not market_a or not market_b:
-                    continue
-                    
-                price_a = market_a.get('yes_price')
-                price_b = market_b.get('yes_price')
-                
-                if price_a is None or price_b is None:
-                    continue
-                    
-                # Calculate spread z-score
-                zscore = self.calculate_spread_zscore(market_a_id, market_b_id, price_a, price_b)
-                
-                if zscore is None:
-                    continue
-                    
-                # Check for arbitrage opportunity
-                if abs(zscore) >= self.zscore_entry_threshold:
-                    
-                    # Determine trade direction
-                    if zscore > 0:
-                        # Spread is too high: sell A, buy B
-                        primary_action = 'sell'
-                        primary_market = market_a_id
-                        secondary_action = 'buy'
-                        secondary_market = market_b_id
-                    else:
-                        # Spread is too low: buy A, sell B
-                        primary_action = 'buy'
-                        primary_market = market_a_id
-                        secondary_action = 'sell'
-                        secondary_market = market_b_id
-                        
-                    # Calculate confidence based on z-score magnitude and correlation
-                    confidence = min(abs(zscore) / 4.0, 1.0) * abs(correlation)
-                    
-                    opportunity = {
-                        'type': 'pairs_trade',
-                        'primary_market': primary_market,
-                        'primary_action': primary_action,
-                        'secondary_market': secondary_market,
-                        'secondary_action': secondary_action,
-                        'zscore': zscore,
-                        'correlation': correlation,
-                        'confidence': confidence,
-                        'spread': price_a - price_b,
-                        'expected_reversion': True
-                    }
-                    
-                    opportunities.append(opportunity)
-                    
-            except Exception as e:
-                self.logger.error(f"Error analyzing pair {market_a_id}-{market_b_id}: {e}")
-                continue
+        # Spread z-scores for every pair at once, from the matrix the correlation pass aligned
+        zscores = self._pair_spread_zscores(correlated_pairs, markets_by_id)
+        
+        # Pairs past the entry threshold; undefined z-scores are NaN and never compare true
+        with np.errstate(invalid='ignore'):
+            entries = np.flatnonzero(np.abs(zscores) >= self.zscore_entry_threshold)
+            
+        for index in entries.tolist():
+            market_a_id, market_b_id, correlation = correlated_pairs[index]
+            zscore = float(zscores[index])
+            
+            # Determine trade direction
+            if zscore > 0:
+                # Spread is too high: sell A, buy B
+                primary_action = 'sell'
+                primary_market = market_a_id
+                secondary_action = 'buy'
+                secondary_market = market_b_id
+            else:
+                # Spread is too low: buy A, sell B
+                primary_action = 'buy'
+                primary_market = market_a_id
+                secondary_action = 'sell'
+                secondary_market = market_b_id
                 
+            # Calculate confidence based on z-score magnitude and correlation
+            confidence = min(abs(zscore) / 4.0, 1.0) * abs(correlation)
+            
+            opportunity = {
+                'type': 'pairs_trade',
+                'primary_market': primary_market,
+                'primary_action': primary_action,
+                'secondary_market': secondary_market,
+                'secondary_action': secondary_action,
+                'zscore': zscore,
+                'correlation': correlation,
+                'confidence': confidence,
+                'spread': markets_by_id[market_a_id]['yes_price'] - markets_by_id[market_b_id]['yes_price'],
+                'expected_reversion': True
+            }
+            
+            opportunities.append(opportunity)
+            
         return opportunities
         
     def identify_cross_market_arbitrage(self, markets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -304,14 +416,14 @@ class StatisticalArbitrageStrategy(BaseStrategy):
     def _are_mutually_exclusive(self, markets: List[Dict[str, Any]]) -> bool:
         """Determine if markets represent mutually exclusive events"""
         # Simple heuristic: check if titles suggest mutual exclusivity
-        titles = [m.get('title', '').lower() for m in markets]
+        title_tokens = [_title_tokens(m.get('title', '')) for m in markets]
         
         # Look for election-style markets
-        if any('election' in title or 'winner' in title or 'president' in title for title in titles):
+        if any(not _EXCLUSIVE_TITLE_WORDS.isdisjoint(tokens) for tokens in title_tokens):
             return True
             
         # Look for categorical outcomes
-        if any('will' in title and ('yes' in title or 'no' in title) for title in titles):
+        if any('will' in tokens and ('yes' in tokens or 'no' in tokens) for tokens in title_tokens):
             return False  # These are typically independent
             
         return False  # Default to not mutually exclusive
@@ -457,7 +569,7 @@ class StatisticalArbitrageStrategy(BaseStrategy):
         
         # Add arbitrage-specific metrics
         try:
-            with db_manager.get_session() as session:
+            with get_db_manager().get_session() as session:
                 from ..core.database import Trade
                 recent_trades = session.query(Trade).filter(
                     Trade.strategy_name == self.name,